@@ -2,4 +2,10 @@ from django.contrib import admin
 from .models import Club, ClubCreationRequest
 
 admin.site.register(Club)
-admin.site.register(ClubCreationRequest)
+
+
+@admin.register(ClubCreationRequest)
+class ClubCreationRequestAdmin(admin.ModelAdmin):
+    # __str__ lit coordinator.username
+    list_select_related = ('coordinator',)
+    raw_id_fields = ('coordinator',)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from clubs.models import Club
+
+
+class Command(BaseCommand):
+    help = "Recompute every club's denormalized member and event counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--club', type=int, action='append', dest='clubs',
+                            help='Only reconcile this club id (repeatable).')
+
+    def handle(self, *args, **options):
+        clubs = Club.objects.all()
+        if options['clubs']:
+            clubs = clubs.filter(pk__in=options['clubs'])
+        updated = clubs.refresh_counters()
+        self.stdout.write(self.style.SUCCESS(f'Reconciled counters for {updated} club(s).'))
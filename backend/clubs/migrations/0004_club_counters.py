@@ -0,0 +1,28 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clubs", "0003_alter_club_options_alter_clubcreationrequest_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="club",
+            name="active_member_counter",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="club",
+            name="pending_member_counter",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="club",
+            name="upcoming_event_counter",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
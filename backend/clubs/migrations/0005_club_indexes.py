@@ -0,0 +1,37 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clubs", "0004_club_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="club",
+            index=models.Index(fields=["name", "id"], name="club_name_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="clubcreationrequest",
+            index=models.Index(
+                fields=["-submitted_at", "-id"], name="clubrequest_submitted_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="clubcreationrequest",
+            index=models.Index(
+                fields=["status", "-submitted_at"], name="clubrequest_status_sub_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="clubcreationrequest",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["-submitted_at"],
+                name="clubrequest_pending_idx",
+            ),
+        ),
+    ]
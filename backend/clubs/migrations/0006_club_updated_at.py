@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clubs", "0005_club_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="club",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
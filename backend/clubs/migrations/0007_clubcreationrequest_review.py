@@ -0,0 +1,32 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("clubs", "0006_club_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="clubcreationrequest",
+            name="reviewed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="clubcreationrequest",
+            name="reviewed_by",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="reviewed_club_requests",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
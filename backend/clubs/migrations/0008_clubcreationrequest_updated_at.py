@@ -0,0 +1,22 @@
+# Generated by Django 4.2.20 on 2026-10-18 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clubs", "0007_clubcreationrequest_review"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="clubcreationrequest",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="clubcreationrequest",
+            index=models.Index(fields=["updated_at"], name="clubrequest_updated_idx"),
+        ),
+    ]
@@ -1,11 +1,17 @@
+from django.apps import apps
+from django.conf import settings
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from users.models import CustomUser
-from shared.enums import ClubStatus, RequestStatus, Role
+from shared.enums import ClubStatus, EventStatus, MembershipStatus, RequestStatus, Role
 
 class ClubCreationRequest(models.Model):
     club_name = models.CharField(max_length=100)
     description = models.TextField()
     submitted_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(
         max_length=20,
         choices=RequestStatus.choices,
@@ -18,25 +24,101 @@ class ClubCreationRequest(models.Model):
         related_name='club_creation_requests'
     )
     student_life_officer_comment = models.TextField(blank=True, null=True)
+    reviewed_at = models.DateTimeField(null=True, blank=True)
+    reviewed_by = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='reviewed_club_requests'
+    )
 
     class Meta:
         verbose_name = 'Club Creation Request'
         verbose_name_plural = 'Club Creation Requests'
         ordering = ['-submitted_at']
+        indexes = [
+            # Ordre de la pagination keyset
+            models.Index(fields=['-submitted_at', '-id'], name='clubrequest_submitted_idx'),
+            models.Index(fields=['status', '-submitted_at'], name='clubrequest_status_sub_idx'),
+            # Demandes en attente de revue (index partiel si supporté)
+            models.Index(
+                fields=['-submitted_at'],
+                condition=models.Q(status=RequestStatus.PENDING),
+                name='clubrequest_pending_idx',
+            ),
+            # Lignes modifiées depuis le dernier rafraîchissement des statistiques
+            models.Index(fields=['updated_at'], name='clubrequest_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.club_name} request by {self.coordinator.username}"
 
     def approve(self, reviewer: CustomUser) -> None:
         self.status = RequestStatus.APPROVED
-        self.reviewed_at = models.DateTimeField(auto_now=True)
+        self.reviewed_at = timezone.now()
         self.reviewed_by = reviewer
         self.save()
 
+def _count_per_club(queryset):
+    # Sous-requête corrélée : COUNT(*) des lignes du club courant, 0 si aucune.
+    counts = (
+        queryset.filter(club=OuterRef('pk'))
+        .order_by()
+        .values('club')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def club_count_expressions():
+    Membership = apps.get_model('memberships', 'Membership')
+    Event = apps.get_model('events', 'Event')
+    return {
+        'active_member_count': _count_per_club(
+            Membership.objects.filter(status=MembershipStatus.ACTIVE)
+        ),
+        'pending_member_count': _count_per_club(
+            Membership.objects.filter(status=MembershipStatus.PENDING)
+        ),
+        'upcoming_event_count': _count_per_club(
+            Event.objects.filter(status=EventStatus.UPCOMING, start_time__gt=timezone.now())
+        ),
+    }
+
+
+class ClubQuerySet(models.QuerySet):
+    def with_counts(self):
+        """
+        Annotate active_member_count, pending_member_count and upcoming_event_count.
+
+        Computed by correlated subqueries in the same SELECT, or read from the
+        denormalized counters when CLUB_COUNTERS_DENORMALIZED is enabled.
+        """
+        if settings.CLUB_COUNTERS_DENORMALIZED:
+            return self.annotate(
+                active_member_count=F('active_member_counter'),
+                pending_member_count=F('pending_member_counter'),
+                upcoming_event_count=F('upcoming_event_counter'),
+            )
+        return self.annotate(**club_count_expressions())
+
+    def refresh_counters(self) -> int:
+        """Recompute the denormalized counters of these clubs in one UPDATE."""
+        counts = club_count_expressions()
+        return self.update(
+            active_member_counter=counts['active_member_count'],
+            pending_member_counter=counts['pending_member_count'],
+            upcoming_event_counter=counts['upcoming_event_count'],
+        )
+
+
 class Club(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(
         max_length=20,
         choices=ClubStatus.choices,
@@ -56,20 +138,32 @@ class Club(models.Model):
         null=True,
         blank=True
     )
+    # Denormalized counters, only maintained when CLUB_COUNTERS_DENORMALIZED is on.
+    active_member_counter = models.PositiveIntegerField(default=0, editable=False)
+    pending_member_counter = models.PositiveIntegerField(default=0, editable=False)
+    upcoming_event_counter = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = ClubQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Club'
         verbose_name_plural = 'Clubs'
         ordering = ['name']
+        indexes = [
+            # Ordre de la pagination keyset
+            models.Index(fields=['name', 'id'], name='club_name_id_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
     def member_count(self) -> int:
+        if settings.CLUB_COUNTERS_DENORMALIZED:
+            return self.active_member_counter
         return self.memberships.filter(status='active').count()
 
     def get_members(self):
-        return [m.user for m in self.memberships.all()]
+        return [m.user for m in self.memberships.select_related('user')]
 
     def get_events(self):
         return self.events.all()
\ No newline at end of file
@@ -0,0 +1,93 @@
+from django.db import transaction
+from django.utils import timezone
+
+from search.index import index_objects
+from shared.conditional import bump_versions
+from shared.enums import ClubStatus, RequestStatus
+from shared.permissions import forget_coordinator
+from users.models import CustomUser
+from .models import Club, ClubCreationRequest
+
+
+def locked_requests(ids):
+    """Requests `ids` (pk order), locked with SELECT ... FOR UPDATE."""
+    return (
+        ClubCreationRequest.objects.select_for_update(of=('self',))
+        .filter(pk__in=ids)
+        .order_by('pk')
+        .values_list('pk', 'status', 'coordinator_id', 'club_name', 'description')
+    )
+
+
+def locked_coordinators(coordinator_ids):
+    """Coordinators `coordinator_ids` (pk order), locked with SELECT ... FOR UPDATE."""
+    return (
+        CustomUser.objects.select_for_update(of=('self',))
+        .filter(pk__in=coordinator_ids)
+        .order_by('pk')
+        .values_list('pk')
+    )
+
+
+def review_requests(ids, status, reviewer, comment=None):
+    """
+    Approve or reject pending club creation requests in one transaction and
+    return {id: result}, result being approved, rejected, not_found,
+    not_pending or coordinator_has_club.
+
+    The requests are locked with SELECT ... FOR UPDATE, so a concurrent review
+    of the same ids waits, then finds them no longer pending: a request is
+    provisioned at most once. On approval their coordinators are locked too,
+    so two requests of one coordinator approved concurrently give one club
+    and one coordinator_has_club. Approved requests
+    get their Club through one bulk_create. The number of queries does not
+    depend on len(ids) (beyond the driver's bulk insert batching).
+    """
+    ids = list(dict.fromkeys(ids))
+    results = dict.fromkeys(ids, 'not_found')
+    reviewed, clubs = [], []
+    with transaction.atomic():
+        pending = []
+        for pk, current, coordinator_id, club_name, description in locked_requests(ids):
+            if current == RequestStatus.PENDING:
+                pending.append((pk, coordinator_id, club_name, description))
+            else:
+                results[pk] = 'not_pending'
+        taken = set()
+        if status == RequestStatus.APPROVED and pending:
+            coordinator_ids = {row[1] for row in pending}
+            # Toujours après les demandes, dans l'ordre des pk : pas d'interblocage entre revues.
+            list(locked_coordinators(coordinator_ids))
+            # Lu après le verrou : voit les clubs créés par une revue concurrente déjà validée.
+            taken = set(
+                Club.objects.filter(coordinator_id__in=coordinator_ids)
+                .values_list('coordinator_id', flat=True)
+            )
+        for pk, coordinator_id, club_name, description in pending:
+            if status == RequestStatus.APPROVED:
+                # Un coordinateur ne gère qu'un club (Club.coordinator est un OneToOne).
+                if coordinator_id in taken:
+                    results[pk] = 'coordinator_has_club'
+                    continue
+                taken.add(coordinator_id)
+                clubs.append(Club(
+                    name=club_name, description=description, status=ClubStatus.ACTIVE,
+                    coordinator_id=coordinator_id, creation_request_id=pk,
+                ))
+            results[pk] = status
+            reviewed.append(pk)
+
+        if reviewed:
+            now = timezone.now()
+            changes = {'status': status, 'reviewed_at': now, 'reviewed_by': reviewer, 'updated_at': now}
+            if comment is not None:
+                changes['student_life_officer_comment'] = comment
+            ClubCreationRequest.objects.filter(pk__in=reviewed).update(**changes)
+            Club.objects.bulk_create(clubs)
+            # update() et bulk_create() n'émettent pas de signaux : index, versions et cache à la main.
+            index_objects(clubs)
+            bump_versions('clubrequests', *(('clubs',) if clubs else ()))
+            for club in clubs:
+                if club.pk is not None:
+                    forget_coordinator(club.pk)
+    return results
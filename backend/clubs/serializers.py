@@ -1,14 +1,45 @@
 from rest_framework import serializers
 from .models import Club, ClubCreationRequest
+from shared.expansions import ExpandableFieldsMixin
+from shared.enums import RequestStatus
+from shared.fieldsets import SparseFieldsetMixin
+
+class ClubSerializer(SparseFieldsetMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
+    # Annotations posées par Club.objects.with_counts()
+    active_member_count = serializers.IntegerField(read_only=True)
+    pending_member_count = serializers.IntegerField(read_only=True)
+    upcoming_event_count = serializers.IntegerField(read_only=True)
 
-class ClubSerializer(serializers.ModelSerializer):
     class Meta:
         model = Club
-        fields = ['id', 'name', 'description', 'status', 'coordinator', 'created_at']
+        fields = [
+            'id', 'name', 'description', 'status', 'coordinator', 'created_at',
+            'active_member_count', 'pending_member_count', 'upcoming_event_count',
+        ]
         read_only_fields = ['id', 'status', 'created_at']
+        expandable_fields = {
+            'coordinator': 'users.serializers.UserSerializer',
+            'creation_request': 'clubs.serializers.ClubCreationRequestSerializer',
+        }
+        # Expanded clubs carry member and event counts.
+        expansion_versions = ('clubs', 'memberships', 'events')
+
+    @classmethod
+    def get_expansion_queryset(cls):
+        # The counts are annotations, so expanded clubs are loaded through with_counts().
+        return Club.objects.with_counts()
 
-class ClubCreationRequestSerializer(serializers.ModelSerializer):
+class ClubCreationRequestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ClubCreationRequest
         fields = ['id', 'club_name', 'description', 'status', 'coordinator', 'student_life_officer_comment', 'submitted_at', 'reviewed_at', 'reviewed_by']
-        read_only_fields = ['id', 'status', 'submitted_at', 'reviewed_at', 'reviewed_by']
\ No newline at end of file
+        read_only_fields = ['id', 'status', 'submitted_at', 'reviewed_at', 'reviewed_by']
+        expansion_versions = ('clubrequests',)
+
+
+class ClubRequestBulkReviewSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=10000
+    )
+    status = serializers.ChoiceField(choices=[RequestStatus.APPROVED, RequestStatus.REJECTED])
+    student_life_officer_comment = serializers.CharField(required=False, allow_blank=True)
@@ -0,0 +1,96 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from shared.enums import EventStatus, MembershipStatus
+from .models import Club
+
+# Champs dont dépend la contribution d'une ligne aux compteurs de son club.
+COUNTED_FIELDS = {
+    'memberships.Membership': ('club_id', 'status'),
+    'events.Event': ('club_id', 'status', 'start_time'),
+}
+MEMBER_COUNTERS = {
+    MembershipStatus.ACTIVE: 'active_member_counter',
+    MembershipStatus.PENDING: 'pending_member_counter',
+}
+# Ligne chargée avec des champs différés : contribution d'origine inconnue.
+UNKNOWN = object()
+
+
+def counted_state(instance):
+    names = COUNTED_FIELDS[instance._meta.label]
+    if any(name not in instance.__dict__ for name in names):
+        return UNKNOWN
+    return tuple(instance.__dict__[name] for name in names)
+
+
+def contribution(label, state):
+    """(club_id, counter) incremented by a row in `state`, or None."""
+    if label == 'memberships.Membership':
+        club_id, status = state
+        counter = MEMBER_COUNTERS.get(status)
+    else:
+        club_id, status, start_time = state
+        upcoming = status == EventStatus.UPCOMING and start_time is not None and start_time > timezone.now()
+        counter = 'upcoming_event_counter' if upcoming else None
+    return (club_id, counter) if club_id is not None and counter else None
+
+
+def apply_counter_change(instance, old, new):
+    """
+    Move the denormalized counters from the row's previous state to its new
+    one with F() increments: no query when nothing counted changes, one
+    UPDATE per affected club otherwise. If the previous state is unknown,
+    the clubs are recounted instead.
+
+    upcoming_event_counter counts events that were upcoming when last written;
+    events that have started since are only dropped by reconcile_club_counters.
+    """
+    if old is UNKNOWN or new is UNKNOWN:
+        club_ids = {instance.club_id, getattr(instance, '_loaded_club_id', None)} - {None}
+        Club.objects.filter(pk__in=club_ids).refresh_counters()
+        return
+    label = instance._meta.label
+    deltas = Counter()
+    for state, sign in ((old, -1), (new, 1)):
+        target = contribution(label, state) if state is not None else None
+        if target is not None:
+            deltas[target] += sign
+    for (club_id, counter), delta in deltas.items():
+        if delta:
+            # Plancher à 0 : des compteurs jamais réconciliés ne deviennent pas négatifs.
+            Club.objects.filter(pk=club_id).update(**{counter: Greatest(F(counter) + delta, 0)})
+
+
+@receiver(post_init, sender='memberships.Membership')
+@receiver(post_init, sender='events.Event')
+def remember_loaded_club(sender, instance, **kwargs):
+    # Permet de rafraîchir aussi l'ancien club quand une ligne change de club
+    # (compteurs, versions de collection).
+    # __dict__ : ne pas déclencher de requête si club_id est différé.
+    instance._loaded_club_id = instance.__dict__.get('club_id')
+    instance._counted_state = counted_state(instance)
+
+
+@receiver(post_save, sender='memberships.Membership')
+@receiver(post_save, sender='events.Event')
+def count_saved_row(sender, instance, created, **kwargs):
+    if not settings.CLUB_COUNTERS_DENORMALIZED:
+        return
+    new = counted_state(instance)
+    apply_counter_change(instance, None if created else instance._counted_state, new)
+    instance._counted_state = new
+
+
+@receiver(post_delete, sender='memberships.Membership')
+@receiver(post_delete, sender='events.Event')
+def uncount_deleted_row(sender, instance, **kwargs):
+    if not settings.CLUB_COUNTERS_DENORMALIZED:
+        return
+    apply_counter_change(instance, instance._counted_state, None)
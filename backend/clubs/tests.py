@@ -1,3 +1,269 @@
-from django.test import TestCase
+import math
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from events.models import Event
+from jobs.models import Job
+from search.models import SearchDocument
+from memberships.models import Membership
+from shared.authentication import token_cache
+from shared.conditional import bump_versions
+from shared.enums import ClubStatus, MembershipRole, MembershipStatus, RequestStatus, Role
+from shared.testing import QueryBudgetTestCase
+from users.models import CustomUser
+from .models import Club, ClubCreationRequest
+from .review import locked_coordinators, locked_requests
+
+
+class ClubQueryBudgetTests(QueryBudgetTestCase):
+    def test_club_endpoints_stay_within_query_budget(self):
+        club_id = self.club.pk
+        self.assertEndpointBudgets({
+            '/api/clubs/': 2,
+            f'/api/clubs/{club_id}/': 3,
+            f'/api/clubs/{club_id}/members/': 2,
+            f'/api/clubs/{club_id}/events/': 2,
+            f'/api/clubs/{club_id}/coordinator/': 4,
+        })
+
+
+class ClubCounterTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.grow_to(3)
+        # Le premier événement de grow_to commence « maintenant » : tous décalés d'un jour.
+        Event.objects.update(start_time=F('start_time') + timedelta(days=1), end_time=F('end_time') + timedelta(days=1))
+        self.joiner = CustomUser.objects.create_user(username='joiner', password='secret', role=Role.MEMBER)
+
+    def counts(self, club=None):
+        club = Club.objects.with_counts().get(pk=(club or self.club).pk)
+        return club.active_member_count, club.pending_member_count, club.upcoming_event_count
+
+    @staticmethod
+    def counter_updates(queries):
+        return sum(query['sql'].startswith('UPDATE "clubs_club"') for query in queries)
+
+    def recounted(self, club=None):
+        with override_settings(CLUB_COUNTERS_DENORMALIZED=False):
+            return self.counts(club)
+
+    def test_annotations_count_active_pending_and_upcoming(self):
+        Membership.objects.create(user=self.joiner, club=self.club)
+        Event.objects.filter(title='Event 0').update(start_time=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.counts(), (3, 1, 2))
+        self.assertEqual(self.client.get(f'/api/clubs/{self.club.pk}/').data['pending_member_count'], 1)
+
+    @override_settings(CLUB_COUNTERS_DENORMALIZED=True)
+    def test_denormalized_counters_follow_writes(self):
+        call_command('reconcile_club_counters', stdout=StringIO())
+        self.assertEqual(self.counts(), (3, 0, 3))
+        with CaptureQueriesContext(connection) as queries:
+            membership = Membership.objects.create(user=self.joiner, club=self.club)
+        self.assertEqual(self.counter_updates(queries), 1)
+        self.assertEqual(self.counts(), (3, 1, 3))
+        membership.status = MembershipStatus.ACTIVE
+        membership.save()
+        self.assertEqual(self.counts(), (4, 0, 3))
+        # Changement sans effet sur les compteurs : pas de requête sur clubs_club.
+        membership.role = MembershipRole.DESIGNER
+        with CaptureQueriesContext(connection) as queries:
+            membership.save()
+        self.assertEqual(self.counter_updates(queries), 0)
+
+        other = Club.objects.create(name='Other', description='')
+        event = Event.objects.first()
+        event.club = other
+        event.save()
+        self.assertEqual((self.counts(), self.counts(other)), ((4, 0, 2), (0, 0, 1)))
+        Membership.objects.get(pk=membership.pk).delete()
+        event.delete()
+        self.assertEqual((self.counts(), self.counts(other)), (self.recounted(), self.recounted(other)))
+
+    @override_settings(CLUB_COUNTERS_DENORMALIZED=True)
+    def test_reconcile_corrects_drifted_counters(self):
+        Club.objects.update(active_member_counter=99, upcoming_event_counter=0)
+        out = StringIO()
+        call_command('reconcile_club_counters', '--club', str(self.club.pk), stdout=out)
+        self.assertIn('1 club(s)', out.getvalue())
+        self.assertEqual(self.counts(), self.recounted())
+
+
+class ClubResponseCacheTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.grow_to(10)
+        self.url = f'/api/clubs/{self.club.pk}/members/'
+
+    def test_repeated_read_is_served_from_cache(self):
+        self.assertEqual(self.client.get(self.url)['X-Response-Cache'], 'miss')
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Response-Cache'], 'hit')
+
+    def test_membership_write_invalidates_members(self):
+        first = self.client.get(self.url).data['results']
+        Membership.objects.filter(club=self.club).first().delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Response-Cache'], 'miss')
+        self.assertEqual(len(response.data['results']), len(first) - 1)
+
+    def test_user_write_invalidates_members(self):
+        self.client.get(self.url)
+        member = Membership.objects.filter(
+            club=self.club, status=MembershipStatus.ACTIVE
+        ).select_related('user').first().user
+        member.first_name = 'Renamed'
+        member.save()
+        response = self.client.get(self.url)
+        self.assertIn('Renamed', [user['first_name'] for user in response.data['results']])
+
+
+class AsyncReadEndpointTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        token = Token.objects.create(user=self.coordinator)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.client.get('/async/auth/me/')
+
+    def test_async_endpoints_stay_within_query_budget(self):
+        club_id = self.club.pk
+        self.assertEndpointBudgets({
+            '/async/auth/me/': 0,
+            f'/async/api/clubs/{club_id}/': 3,
+            f'/async/api/clubs/{club_id}/members/': 2,
+            f'/async/api/clubs/{club_id}/events/': 2,
+            f'/async/api/events/by-club/{club_id}/': 2,
+        })
+
+    def test_async_bodies_match_sync_endpoints(self):
+        self.grow_to(60)
+        club_id = self.club.pk
+        for path in (
+            '/auth/me/',
+            f'/api/clubs/{club_id}/',
+            f'/api/clubs/{club_id}/members/',
+            f'/api/clubs/{club_id}/events/?page_size=10',
+            f'/api/events/by-club/{club_id}/?upcoming=true',
+        ):
+            with self.subTest(path=path):
+                sync = self.client.get(path, HTTP_ACCEPT='application/json')
+                response = self.client.get('/async' + path, HTTP_ACCEPT='application/json')
+                self.assertEqual(response.content, sync.content.replace(b'/api/', b'/async/api/'))
+
+    def test_unchanged_club_answers_304(self):
+        url = f'/async/api/clubs/{self.club.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_missing_credentials_are_rejected(self):
+        self.client.credentials()
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/async/auth/me/').status_code, 401)
+
+
+class ClubRequestReviewTests(QueryBudgetTestCase):
+    url = '/api/clubs/requests/bulk-review/'
+
+    def setUp(self):
+        super().setUp()
+        self.rva = CustomUser.objects.create_user(
+            username='rva', password='secret', role=Role.STUDENT_LIFE_OFFICER
+        )
+        self.client.force_authenticate(self.rva)
+
+    def submit(self, count):
+        applicants = CustomUser.objects.bulk_create(
+            CustomUser(username=f'applicant{i:05d}', password='!', role=Role.COORDINATOR)
+            for i in range(count)
+        )
+        return ClubCreationRequest.objects.bulk_create(
+            ClubCreationRequest(club_name=f'Club {i}', description='New club', coordinator=user)
+            for i, user in enumerate(applicants)
+        )
+
+    def test_approves_a_thousand_requests_in_constant_queries(self):
+        ids = [request.pk for request in self.submit(1000)]
+        bump_versions('clubs', 'clubrequests')
+        # Une seule insertion par table sur PostgreSQL ; SQLite découpe selon sa limite de paramètres.
+        inserts = sum(
+            math.ceil(1000 / connection.ops.bulk_batch_size(
+                [field for field in model._meta.concrete_fields if not field.primary_key], ids
+            ))
+            for model in (Club, SearchDocument)
+        )
+        with self.assertQueryBudget(11 + inserts):
+            response = self.client.post(self.url, {'ids': ids, 'status': RequestStatus.APPROVED}, format='json')
+        self.assertEqual(response.data['reviewed'], 1000)
+        clubs = Club.objects.filter(creation_request__in=ids)
+        self.assertEqual(clubs.count(), 1000)
+        self.assertEqual(SearchDocument.objects.filter(kind='club', object_id__in=clubs.values('pk')).count(), 1000)
+        self.assertFalse(clubs.exclude(status=ClubStatus.ACTIVE).exists())
+        self.assertFalse(ClubCreationRequest.objects.filter(pk__in=ids).exclude(reviewed_by=self.rva).exists())
+        self.assertEqual(Job.objects.filter(task='notifications.fanout.club_requests_reviewed').count(), 1)
+
+    def test_reports_per_id_results_and_never_provisions_twice(self):
+        pending, approved = self.submit(2)
+        approved.status = RequestStatus.APPROVED
+        approved.save()
+        # Le coordinateur du club de test en gère déjà un.
+        taken = ClubCreationRequest.objects.create(
+            club_name='Second club', description='', coordinator=self.coordinator
+        )
+        response = self.client.post(self.url, {
+            'ids': [pending.pk, approved.pk, taken.pk, 999999], 'status': RequestStatus.APPROVED,
+            'student_life_officer_comment': 'Welcome',
+        }, format='json')
+        self.assertEqual(response.data['results'], [
+            {'id': pending.pk, 'result': 'approved'},
+            {'id': approved.pk, 'result': 'not_pending'},
+            {'id': taken.pk, 'result': 'coordinator_has_club'},
+            {'id': 999999, 'result': 'not_found'},
+        ])
+        pending.refresh_from_db()
+        self.assertEqual(pending.student_life_officer_comment, 'Welcome')
+        self.assertIsNotNone(pending.reviewed_at)
+        self.assertEqual(pending.club.coordinator_id, pending.coordinator_id)
+
+        again = self.client.post(self.url, {'ids': [pending.pk], 'status': RequestStatus.APPROVED}, format='json')
+        self.assertEqual(again.data['results'], [{'id': pending.pk, 'result': 'not_pending'}])
+        self.assertEqual(Club.objects.filter(creation_request=pending).count(), 1)
+
+    def test_review_locks_compile_on_backends_with_for_update_of(self):
+        # SQLite ignore FOR UPDATE : on compile comme PostgreSQL (FOR UPDATE OF), qui refuse
+        # toute table que la requête ne joint pas.
+        features = connection.features
+        with mock.patch.multiple(features, has_select_for_update=True, has_select_for_update_of=True):
+            for queryset in (locked_requests([1, 2]), locked_coordinators([3])):
+                sql = str(queryset.query)
+                self.assertIn('FOR UPDATE OF', sql)
+
+    def test_single_review_actions(self):
+        approved, rejected = self.submit(2)
+        response = self.client.patch(f'/api/clubs/requests/{approved.pk}/approve/')
+        self.assertEqual(response.data, {'status': RequestStatus.APPROVED})
+        self.assertTrue(Club.objects.filter(creation_request=approved, name='Club 0').exists())
+        self.assertEqual(self.client.patch(f'/api/clubs/requests/{approved.pk}/reject/').status_code, 400)
+
+        self.client.force_authenticate(rejected.coordinator)
+        self.assertEqual(self.client.patch(f'/api/clubs/requests/{rejected.pk}/reject/').status_code, 403)
+        self.client.force_authenticate(self.rva)
+        self.assertEqual(self.client.patch(f'/api/clubs/requests/{rejected.pk}/reject/').status_code, 200)
+        rejected.refresh_from_db()
+        self.assertEqual((rejected.status, rejected.reviewed_by), (RequestStatus.REJECTED, self.rva))
+        self.assertFalse(Club.objects.filter(creation_request=rejected).exists())
+
+    def test_request_list_is_not_shadowed_by_club_detail(self):
+        self.submit(2)
+        response = self.client.get('/api/clubs/requests/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
@@ -2,53 +2,205 @@ from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Club, ClubCreationRequest
-from .serializers import ClubSerializer, ClubCreationRequestSerializer
+from .review import review_requests
+from .serializers import ClubSerializer, ClubCreationRequestSerializer, ClubRequestBulkReviewSerializer
 from shared.enums import RequestStatus
-from django.utils import timezone
 from memberships.models import Membership
+from memberships.views import MEMBER_EXPORT_FIELDS, MEMBER_EXPORT_HEADER
 from events.models import Event
 from users.serializers import UserSerializer
 from events.serializers import EventSerializer
+from shared.async_views import AsyncAPIView
+from shared.compiled import CompiledListMixin
+from shared.conditional import aconditional, conditional
+from shared.enums import Role
+from shared.exports import export_response
+from shared.expansions import ExpandableViewMixin, plan_expansions
+from shared.fieldsets import SparseFieldsetViewMixin, narrow_queryset
+from shared.permissions import IsRVA, get_club_coordinator_id
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from shared.response_cache import cached_response
+from notifications.fanout import club_requests_reviewed, dispatch
 
-class ClubViewSet(viewsets.ModelViewSet):
+
+def club_list_versions(request, **kwargs):
+    # Les compteurs annotés dépendent aussi des adhésions et des événements.
+    return ['clubs', 'memberships', 'events']
+
+
+def club_detail_versions(request, pk=None, **kwargs):
+    return [f'memberships:club:{pk}', f'events:club:{pk}']
+
+
+def club_members_versions(request, pk=None, **kwargs):
+    return [f'memberships:club:{pk}', f'users:club:{pk}']
+
+
+def club_events_versions(request, pk=None, **kwargs):
+    return [f'events:club:{pk}']
+
+
+def club_coordinator_versions(request, pk=None, **kwargs):
+    return [f'users:club:{pk}']
+
+
+class ClubViewSet(
+    SparseFieldsetViewMixin, ExpandableViewMixin, CompiledListMixin, viewsets.ModelViewSet
+):
     queryset = Club.objects.all()
     serializer_class = ClubSerializer
     permission_classes = [permissions.IsAuthenticated]
+    compiled_actions = ('list', 'club_events')
+
+    def get_queryset(self):
+        return Club.objects.with_counts()
+
+    def get_serializer_class(self):
+        # These actions render users or events rather than clubs.
+        if self.action in ('members', 'club_coordinator'):
+            return UserSerializer
+        if self.action == 'club_events':
+            return EventSerializer
+        return super().get_serializer_class()
+
+    @conditional(club_list_versions, time_sensitive=True)
+    @cached_response(club_list_versions, time_sensitive=True)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional(club_detail_versions, model=Club, time_sensitive=True)
+    @cached_response(club_detail_versions, model=Club, time_sensitive=True)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     @action(detail=True, methods=['get'], url_path='members')
+    @cached_response(club_members_versions)
     def members(self, request, pk=None):
-        users = [m.user for m in Membership.objects.filter(club_id=pk)]
-        return Response(UserSerializer(users, many=True).data)
+        memberships = Membership.objects.filter(club_id=pk).select_related('user')
+        memberships = self.paginate_queryset(
+            narrow_queryset(memberships, UserSerializer, request, through='user')
+        )
+        users = [m.user for m in memberships]
+        serializer = self.get_serializer(users, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'], url_path='members/export')
+    def export_members(self, request, pk=None):
+        """Stream the club roster as CSV or XLSX (?type=), for its coordinator or the RVA."""
+        if (request.user.role != Role.STUDENT_LIFE_OFFICER
+                and get_club_coordinator_id(request, pk) != request.user.id):
+            raise PermissionDenied('Only the club coordinator can export its members.')
+        rows = Membership.objects.filter(club_id=pk).order_by('pk').values_list(*MEMBER_EXPORT_FIELDS)
+        return export_response(
+            request, f'club-{pk}-members', MEMBER_EXPORT_HEADER, rows.iterator(chunk_size=2000)
+        )
 
     @action(detail=True, methods=['get'], url_path='events')
+    @cached_response(club_events_versions, time_sensitive=True)
     def club_events(self, request, pk=None):
-        events = Event.objects.filter(club_id=pk)
-        return Response(EventSerializer(events, many=True).data)
+        events = Event.objects.filter(club_id=pk).with_effective_status()
+        events = plan_expansions(events, EventSerializer, request)
+        events = self.paginate_queryset(narrow_queryset(events, EventSerializer, request))
+        serializer = self.get_serializer(events, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['get'], url_path='coordinator')
+    @cached_response(club_coordinator_versions, model=Club)
     def club_coordinator(self, request, pk=None):
         coord = self.get_object().coordinator
-        return Response(UserSerializer(coord).data)
+        return Response(self.get_serializer(coord).data)
 
-class ClubCreationRequestViewSet(viewsets.ModelViewSet):
+
+class AsyncClubDetailView(AsyncAPIView):
+    serializer_class = ClubSerializer
+
+    @aconditional(club_detail_versions, model=Club, time_sensitive=True)
+    async def get(self, request, pk):
+        try:
+            clubs = plan_expansions(Club.objects.with_counts(), ClubSerializer, request)
+            club = await narrow_queryset(clubs, ClubSerializer, request).aget(pk=pk)
+        except Club.DoesNotExist:
+            raise NotFound('No Club matches the given query.')
+        return self.render(ClubSerializer(club, context=self.serializer_context(request)).data)
+
+
+class AsyncClubMembersView(AsyncAPIView):
+    @aconditional(club_members_versions)
+    async def get(self, request, pk):
+        memberships = Membership.objects.filter(club_id=pk).select_related('user')
+        memberships, paginator = await self.paginate(
+            request, narrow_queryset(memberships, UserSerializer, request, through='user')
+        )
+        users = [m.user for m in memberships]
+        serializer = UserSerializer(users, many=True, context=self.serializer_context(request))
+        return self.paginated_response(paginator, serializer.data)
+
+
+class AsyncClubEventsView(AsyncAPIView):
+    serializer_class = EventSerializer
+
+    @aconditional(club_events_versions, time_sensitive=True)
+    async def get(self, request, pk):
+        events = Event.objects.filter(club_id=pk).with_effective_status()
+        events = plan_expansions(events, EventSerializer, request)
+        events = narrow_queryset(events, EventSerializer, request)
+        events, paginator = await self.paginate(request, events)
+        serializer = EventSerializer(events, many=True, context=self.serializer_context(request))
+        return self.paginated_response(paginator, serializer.data)
+
+
+class ClubCreationRequestViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = ClubCreationRequest.objects.all()
     serializer_class = ClubCreationRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    @action(detail=True, methods=['patch'], url_path='approve')
+    REVIEW_ERRORS = {
+        'not_pending': 'This request has already been reviewed.',
+        'coordinator_has_club': 'This coordinator already runs a club.',
+    }
+
+    def review(self, request, pk, status):
+        pk = int(pk) if str(pk).isdigit() else None
+        result = review_requests([pk], status, request.user)[pk] if pk else 'not_found'
+        if result == 'not_found':
+            raise NotFound('No ClubCreationRequest matches the given query.')
+        if result in self.REVIEW_ERRORS:
+            raise ValidationError({'status': self.REVIEW_ERRORS[result]})
+        dispatch(club_requests_reviewed, [pk])
+        return Response({'status': result})
+
+    @action(detail=True, methods=['patch'], url_path='approve', permission_classes=[IsRVA])
     def approve(self, request, pk=None):
-        req = self.get_object()
-        req.status = RequestStatus.APPROVED
-        req.reviewed_at = timezone.now()
-        req.reviewed_by = request.user
-        req.save()
-        return Response({'status': 'approved'})
-
-    @action(detail=True, methods=['patch'], url_path='reject')
+        """Approve a pending request and create its club."""
+        return self.review(request, pk, RequestStatus.APPROVED)
+
+    @action(detail=True, methods=['patch'], url_path='reject', permission_classes=[IsRVA])
     def reject(self, request, pk=None):
-        req = self.get_object()
-        req.status = RequestStatus.REJECTED
-        req.reviewed_at = timezone.now()
-        req.reviewed_by = request.user
-        req.save()
-        return Response({'status': 'rejected'})
\ No newline at end of file
+        """Reject a pending request."""
+        return self.review(request, pk, RequestStatus.REJECTED)
+
+    @action(detail=False, methods=['post'], url_path='bulk-review', permission_classes=[IsRVA])
+    def bulk_review(self, request):
+        """
+        Approve or reject many pending requests at once (RVA only).
+
+        Body: {"ids": [...], "status": "approved" | "rejected",
+        "student_life_officer_comment": optional}. The requests are locked,
+        reviewed by one UPDATE and, when approved, provisioned with their
+        clubs by one bulk_create, all in one transaction (see
+        clubs.review.review_requests). Each id gets a result: approved,
+        rejected, not_found, not_pending or coordinator_has_club.
+        """
+        serializer = ClubRequestBulkReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        results = review_requests(
+            data['ids'], data['status'], request.user, data.get('student_life_officer_comment')
+        )
+        reviewed = [pk for pk, result in results.items() if result == data['status']]
+        if reviewed:
+            dispatch(club_requests_reviewed, reviewed)
+        return Response({
+            'reviewed': len(reviewed),
+            'results': [{'id': pk, 'result': result} for pk, result in results.items()],
+        })
@@ -36,6 +36,10 @@ INSTALLED_APPS = [
     'events',
     'memberships',
     'shared',
+    'search',
+    'stats',
+    'notifications',
+    'jobs',
 ]
 
 # Custom user model
@@ -44,6 +48,7 @@ AUTH_USER_MODEL = 'users.CustomUser'
 # Middleware
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',        # Must be first for CORS
+    'shared.profiling.ProfilingMiddleware',         # Disabled unless REQUEST_PROFILING
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -98,6 +103,91 @@ USE_TZ = True
 # Static files
 STATIC_URL = '/static/'
 
+# Clubs: read member/event counts from denormalized columns instead of
+# aggregating at read time (see clubs/signals.py and reconcile_club_counters)
+CLUB_COUNTERS_DENORMALIZED = config('CLUB_COUNTERS_DENORMALIZED', default=False, cast=bool)
+
+# Caches: in-process by default; set SHARED_CACHE_LOCATION (redis://...) to
+# enable a 'shared' cache usable by RESPONSE_CACHE_ALIAS / TOKEN_AUTH_SHARED_CACHE
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+SHARED_CACHE_LOCATION = config('SHARED_CACHE_LOCATION', default='')
+if SHARED_CACHE_LOCATION:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': SHARED_CACHE_LOCATION,
+    }
+
+# Read-endpoint response cache (shared.response_cache.cached_response)
+RESPONSE_CACHE_ALIAS = config('RESPONSE_CACHE_ALIAS', default='default')
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+RESPONSE_CACHE_LOCK_WAIT = config('RESPONSE_CACHE_LOCK_WAIT', default=2.0, cast=float)
+
+# Token authentication cache (shared.authentication.CachedTokenAuthentication).
+# TOKEN_AUTH_SHARED_CACHE names an entry of CACHES shared by all workers; empty
+# means the in-process LRU only.
+TOKEN_AUTH_CACHE_SIZE = config('TOKEN_AUTH_CACHE_SIZE', default=10000, cast=int)
+TOKEN_AUTH_CACHE_TTL = config('TOKEN_AUTH_CACHE_TTL', default=30, cast=int)
+TOKEN_AUTH_SHARED_CACHE = config('TOKEN_AUTH_SHARED_CACHE', default='')
+TOKEN_AUTH_SHARED_CACHE_TTL = config('TOKEN_AUTH_SHARED_CACHE_TTL', default=300, cast=int)
+
+# Club -> coordinator lookups made by shared.permissions.IsClubCoordinator
+CLUB_COORDINATOR_CACHE_SIZE = config('CLUB_COORDINATOR_CACHE_SIZE', default=10000, cast=int)
+CLUB_COORDINATOR_CACHE_TTL = config('CLUB_COORDINATOR_CACHE_TTL', default=60, cast=int)
+
+# RVA dashboard (stats app): `manage.py refresh_stats` re-reads rows updated
+# since its previous run minus this many seconds (transactions committed late)
+STATS_REFRESH_OVERLAP = config('STATS_REFRESH_OVERLAP', default=300, cast=int)
+
+# Background jobs (jobs app, `manage.py runworker`): a claimed job is
+# requeued if its worker has not finished it within JOBS_LEASE seconds;
+# failures are retried up to JOBS_MAX_ATTEMPTS times, JOBS_RETRY_BACKOFF *
+# 2^(attempt - 1) seconds apart (at most JOBS_RETRY_BACKOFF_MAX); finished
+# jobs are deleted after JOBS_RETENTION_DAYS
+JOBS_LEASE = config('JOBS_LEASE', default=300, cast=int)
+JOBS_MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=5, cast=int)
+JOBS_RETRY_BACKOFF = config('JOBS_RETRY_BACKOFF', default=10, cast=float)
+JOBS_RETRY_BACKOFF_MAX = config('JOBS_RETRY_BACKOFF_MAX', default=3600, cast=float)
+JOBS_RETENTION_DAYS = config('JOBS_RETENTION_DAYS', default=7, cast=int)
+JOBS_POLL_INTERVAL = config('JOBS_POLL_INTERVAL', default=1.0, cast=float)
+
+# Notifications: fan-out is queued as a job on the 'notifications' queue
+# (run inline after commit when NOTIFICATIONS_ASYNC is off), writing one inbox
+# row per member in batches of NOTIFICATIONS_BATCH_SIZE; clubs with more
+# active members than NOTIFICATIONS_FANOUT_ON_READ_THRESHOLD get one
+# broadcast row that inboxes pick up at read time
+NOTIFICATIONS_ASYNC = config('NOTIFICATIONS_ASYNC', default=True, cast=bool)
+NOTIFICATIONS_BATCH_SIZE = config('NOTIFICATIONS_BATCH_SIZE', default=1000, cast=int)
+NOTIFICATIONS_FANOUT_ON_READ_THRESHOLD = config('NOTIFICATIONS_FANOUT_ON_READ_THRESHOLD', default=2000, cast=int)
+
+# Per-request profiling (shared.profiling.ProfilingMiddleware): Server-Timing
+# header on every response, and a JSON record on the 'shared.profiling' logger
+# for requests slower than REQUEST_PROFILING_SLOW_MS or running at least
+# REQUEST_PROFILING_SLOW_QUERIES queries
+REQUEST_PROFILING = config('REQUEST_PROFILING', default=False, cast=bool)
+REQUEST_PROFILING_SLOW_MS = config('REQUEST_PROFILING_SLOW_MS', default=500, cast=int)
+REQUEST_PROFILING_SLOW_QUERIES = config('REQUEST_PROFILING_SLOW_QUERIES', default=50, cast=int)
+REQUEST_PROFILING_TOP_QUERIES = config('REQUEST_PROFILING_TOP_QUERIES', default=5, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'slow_requests': {'class': 'logging.StreamHandler', 'formatter': 'message'},
+    },
+    'loggers': {
+        'shared.profiling': {'handlers': ['slow_requests'], 'level': 'WARNING', 'propagate': False},
+        'jobs': {'handlers': ['slow_requests'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -110,10 +200,12 @@ CORS_ALLOW_CREDENTIALS = True
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'shared.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'shared.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
 }
@@ -5,17 +5,26 @@ from django.contrib import admin
 
 from users.views import (
     MemberRegisterView, CoordinatorRegisterView, RVARegisterView,
-    LoginView, MeView, CoordinatorsListView, MembersListView, RVAsListView
+    LoginView, MeView, AsyncMeView, CoordinatorsListView, MembersListView, RVAsListView
+)
+from clubs.views import (
+    ClubViewSet, ClubCreationRequestViewSet,
+    AsyncClubDetailView, AsyncClubMembersView, AsyncClubEventsView
 )
-from clubs.views import ClubViewSet, ClubCreationRequestViewSet
 from memberships.views import MembershipViewSet
-from events.views import EventViewSet
+from events.views import EventViewSet, AsyncEventsByClubView
+from search.views import SearchView
+from stats.views import StatsViewSet
+from notifications.views import NotificationViewSet
 
 router = DefaultRouter()
-router.register(r'clubs', ClubViewSet)
+# Avant `clubs` : sinon clubs/requests/ est pris pour le détail d'un club « requests ».
 router.register(r'clubs/requests', ClubCreationRequestViewSet, basename='clubrequest')
+router.register(r'clubs', ClubViewSet)
 router.register(r'memberships', MembershipViewSet)
 router.register(r'events', EventViewSet)
+router.register(r'stats', StatsViewSet, basename='stats')
+router.register(r'notifications', NotificationViewSet, basename='notification')
 
 urlpatterns = [
     # Admin
@@ -35,4 +44,18 @@ urlpatterns = [
 
     # API router for clubs, memberships, events
     path('api/', include(router.urls)),
+
+    # Full-text search over clubs and events
+    path('api/search/', SearchView.as_view(), name='search'),
+
+    # Async (ASGI-native) versions of the hot read endpoints
+    path('async/auth/me/', AsyncMeView.as_view(), name='async-me'),
+    path('async/api/clubs/<int:pk>/', AsyncClubDetailView.as_view(), name='async-club-detail'),
+    path('async/api/clubs/<int:pk>/members/', AsyncClubMembersView.as_view(), name='async-club-members'),
+    path('async/api/clubs/<int:pk>/events/', AsyncClubEventsView.as_view(), name='async-club-events'),
+    path(
+        'async/api/events/by-club/<int:club_id>/',
+        AsyncEventsByClubView.as_view(),
+        name='async-events-by-club',
+    ),
 ]
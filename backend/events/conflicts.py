@@ -0,0 +1,160 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.db import connection
+
+from shared.enums import EventStatus
+from .models import Event, location_key
+
+BOOKING_FIELDS = ('id', 'location_key', 'location', 'title', 'club_id', 'start_time', 'end_time')
+
+
+class Booking(NamedTuple):
+    id: int
+    location_key: str
+    location: str
+    title: str
+    club_id: int
+    start_time: object
+    end_time: object
+
+
+def conflict_message(booking, by=None):
+    return (
+        f'{booking.location} is already booked from {booking.start_time.isoformat()} '
+        f'to {booking.end_time.isoformat()} by {by or f"event {booking.id}"} ("{booking.title}").'
+    )
+
+
+def lock_locations(keys):
+    """
+    Serialize the bookings of location `keys` until the current transaction
+    ends, so that a conflict check and the write that follows it cannot
+    interleave with another booking of the same room. PostgreSQL: one
+    transaction-scoped advisory lock per key, taken in sorted order (no
+    deadlock between batches). SQLite already serializes writing
+    transactions. On other backends, only the conflicts report catches races.
+    """
+    keys = sorted(set(keys) - {''})
+    if not keys or connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        # unnest() garde l'ordre du tableau, déjà trié.
+        cursor.execute('SELECT pg_advisory_xact_lock(hashtext(room)) FROM unnest(%s::text[]) AS room', [keys])
+
+
+def find_conflict(location, start, end, exclude=None):
+    """First booking overlapping [start, end) at `location`, or None (one indexed query)."""
+    key = location_key(location)
+    if not key or start is None or end is None:
+        return None
+    bookings = Event.objects.booked(key, start, end)
+    if exclude is not None:
+        bookings = bookings.exclude(pk=exclude)
+    row = bookings.order_by('start_time', 'id').values_list(*BOOKING_FIELDS).first()
+    return Booking(*row) if row is not None else None
+
+
+class BookingIndex:
+    """
+    In-memory bookings per location, sorted by start time, to check a whole
+    import batch against the database with a single query. Keeping the
+    longest duration per location bounds the backward scan of find().
+    """
+
+    def __init__(self):
+        self.starts = defaultdict(list)
+        self.bookings = defaultdict(dict)
+        self.longest = defaultdict(timedelta)
+
+    @classmethod
+    def load(cls, candidates):
+        """Existing bookings that may overlap any of `candidates` [(location, start, end)]."""
+        index = cls()
+        keys = {location_key(location) for location, _, _ in candidates} - {''}
+        if not keys:
+            return index
+        start = min(start for _, start, _ in candidates)
+        end = max(end for _, _, end in candidates)
+        rows = (
+            Event.objects.exclude(status=EventStatus.CANCELLED)
+            .filter(location_key__in=keys, start_time__lt=end, end_time__gt=start)
+            .values_list(*BOOKING_FIELDS)
+        )
+        for row in rows:
+            index.add(Booking(*row))
+        return index
+
+    def add(self, booking):
+        key = booking.location_key
+        position = (booking.start_time, booking.id)
+        insort(self.starts[key], position)
+        self.bookings[key][booking.id] = booking
+        self.longest[key] = max(self.longest[key], booking.end_time - booking.start_time)
+
+    def find(self, key, start, end):
+        starts = self.starts.get(key)
+        if not key or not starts:
+            return None
+        # Candidats : start_time < end, et start_time > start - durée la plus longue.
+        earliest = start - self.longest[key]
+        for position in range(bisect_left(starts, (end,)) - 1, -1, -1):
+            booking_start, booking_id = starts[position]
+            if booking_start <= earliest:
+                break
+            booking = self.bookings[key][booking_id]
+            if booking.end_time > start:
+                return booking
+        return None
+
+
+def conflict_groups(bookings):
+    """
+    Sweep over bookings sorted by (location_key, start_time): yields each
+    group of two or more bookings whose intervals overlap, directly or through
+    a chain (A overlaps B, B overlaps C). One pass, O(n) after sorting, instead
+    of comparing every pair.
+    """
+    group, group_end, key = [], None, None
+    for booking in bookings:
+        if booking.location_key != key or booking.start_time >= group_end:
+            if len(group) > 1:
+                yield group
+            group, group_end, key = [booking], booking.end_time, booking.location_key
+        else:
+            group.append(booking)
+            group_end = max(group_end, booking.end_time)
+    if len(group) > 1:
+        yield group
+
+
+def conflict_report(queryset):
+    """Conflict groups of a (filtered) Event queryset, as response data."""
+    rows = (
+        queryset.exclude(status=EventStatus.CANCELLED)
+        .exclude(location_key='')
+        .order_by('location_key', 'start_time', 'id')
+        .values_list(*BOOKING_FIELDS)
+    )
+    bookings = (Booking(*row) for row in rows.iterator(chunk_size=2000))
+    return [
+        {
+            'location': group[0].location,
+            'start_time': group[0].start_time,
+            'end_time': max(booking.end_time for booking in group),
+            'events': [
+                {
+                    'id': booking.id,
+                    'title': booking.title,
+                    'club': booking.club_id,
+                    'location': booking.location,
+                    'start_time': booking.start_time,
+                    'end_time': booking.end_time,
+                }
+                for booking in group
+            ],
+        }
+        for group in conflict_groups(bookings)
+    ]
@@ -0,0 +1,75 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from shared.enums import EventStatus
+
+TRUE_VALUES = {'1', 'true', 'yes'}
+FALSE_VALUES = {'0', 'false', 'no'}
+
+
+def parse_moment(name, value):
+    """Accept an ISO 8601 datetime or a plain date (midnight, current timezone)."""
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is not None:
+                moment = datetime.combine(day, time.min)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ValidationError({name: 'Expected an ISO 8601 date or datetime.'})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def parse_month(value):
+    """'YYYY-MM' -> [first day of the month, first day of the next month)."""
+    try:
+        year, month = (int(part) for part in value.split('-'))
+        start = datetime(year, month, 1)
+        # 9999-12 : le mois suivant n'est pas représentable.
+        end = datetime(year + month // 12, month % 12 + 1, 1)
+        return timezone.make_aware(start), timezone.make_aware(end)
+    except (ValueError, OverflowError):
+        raise ValidationError({'month': 'Expected YYYY-MM.'})
+
+
+def filter_events(queryset, params):
+    """
+    Apply the ?club=, ?status=, ?upcoming= and ?from=/?to= filters to an Event queryset.
+
+    from/to select events overlapping the window (end_time > from and
+    start_time < to), which the start_time and end_time indexes serve as range
+    scans.
+    """
+    club = params.get('club')
+    if club:
+        if not club.isdigit():
+            raise ValidationError({'club': 'Expected a club id.'})
+        queryset = queryset.filter(club_id=int(club))
+
+    status = params.get('status')
+    if status:
+        if status not in EventStatus.values:
+            raise ValidationError({'status': f'Expected one of {", ".join(EventStatus.values)}.'})
+        # Statut effectif : les événements terminés pas encore passés à COMPLETED comptent comme tels.
+        queryset = queryset.with_status(status)
+
+    upcoming = params.get('upcoming', '').lower()
+    if upcoming in TRUE_VALUES:
+        queryset = queryset.upcoming()
+    elif upcoming in FALSE_VALUES:
+        queryset = queryset.filter(start_time__lte=timezone.now())
+    elif upcoming:
+        raise ValidationError({'upcoming': 'Expected true or false.'})
+
+    start = parse_moment('from', params['from']) if params.get('from') else None
+    end = parse_moment('to', params['to']) if params.get('to') else None
+    if start and end and start >= end:
+        raise ValidationError({'to': 'Must be later than from.'})
+    return queryset.overlapping(start, end)
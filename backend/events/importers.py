@@ -0,0 +1,247 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
+from clubs.models import Club
+from notifications.fanout import dispatch, events_created
+from search.index import index_objects
+from shared.conditional import bump_versions
+from shared.enums import EventStatus, Role
+from .conflicts import Booking, BookingIndex, conflict_message, lock_locations
+from .models import Event, location_key
+from .serializers import EventSerializer
+
+FORMATS = ('csv', 'jsonl')
+
+
+def detect_format(filename, requested=None):
+    if requested:
+        return requested if requested in FORMATS else None
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return None
+
+
+class UnreadableFile(ValueError):
+    """The file is not UTF-8 text in the expected format."""
+
+
+def iter_rows(stream, file_format):
+    """
+    Return an iterator of (line_number, row) pairs read from a binary stream,
+    one line at a time. A row that cannot be parsed is yielded as a ValueError;
+    a line that cannot be decoded is yielded as an UnreadableFile and ends the
+    iteration. Raises UnreadableFile if the CSV header cannot be read.
+    """
+    text = codecs.iterdecode(stream, 'utf-8-sig')
+    if file_format == 'csv':
+        reader = csv.DictReader(text)
+        try:
+            reader.fieldnames
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise UnreadableFile(f'Cannot read the CSV header: {exc}')
+        return _csv_rows(reader)
+    return _jsonl_rows(text)
+
+
+def _csv_rows(reader):
+    try:
+        for row in reader:
+            yield reader.line_num, row
+    except UnicodeDecodeError as exc:
+        # La ligne fautive n'a pas été comptée par le lecteur.
+        yield reader.line_num + 1, UnreadableFile(f'Not UTF-8 text: {exc}')
+    except csv.Error as exc:
+        yield reader.line_num, UnreadableFile(f'Malformed CSV: {exc}')
+
+
+def _jsonl_rows(text):
+    line_number = 0
+    try:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_number, ValueError(f'Invalid JSON: {exc}')
+                continue
+            if not isinstance(row, dict):
+                row = ValueError('Expected a JSON object.')
+            yield line_number, row
+    except UnicodeDecodeError as exc:
+        yield line_number + 1, UnreadableFile(f'Not UTF-8 text: {exc}')
+
+
+class BatchPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Resolve the pk from the objects preloaded for the current batch."""
+
+    def to_internal_value(self, data):
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        obj = self.context['related'][self.field_name].get(pk)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+
+def related_queryset(field_name):
+    """Targets allowed for an Event foreign key, with the model's limit_choices_to."""
+    field = Event._meta.get_field(field_name)
+    return field.remote_field.model._default_manager.complex_filter(field.get_limit_choices_to())
+
+
+class EventImportSerializer(EventSerializer):
+    club = BatchPrimaryKeyRelatedField(queryset=related_queryset('club'))
+    created_by = BatchPrimaryKeyRelatedField(queryset=related_queryset('created_by'))
+    # Double bookings are checked per batch by EventImporter.reject_conflicts().
+    check_conflicts = False
+
+
+class EventImporter:
+    """
+    Validate and insert events batch by batch.
+
+    Each batch resolves its clubs and users with one in_bulk() query each,
+    validates rows with EventSerializer's rules, rejects rows that double-book
+    a location (against the database and earlier rows of the file, with one
+    query per batch), and bulk_creates the valid rows in its own transaction.
+    Only the current batch and the error report are held in memory.
+
+    With `user`, rows may only target clubs that user coordinates and are
+    created by that user; an RVA may target any club, and created_by defaults
+    to the club's coordinator.
+    """
+
+    def __init__(self, user=None, batch_size=1000, max_errors=1000):
+        self.user = user
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, rows):
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.import_batch(batch)
+        return self.report()
+
+    def report(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+    def import_batch(self, batch):
+        parsed = []
+        for line_number, row in batch:
+            if isinstance(row, ValueError):
+                self.add_error(line_number, {'non_field_errors': [str(row)]})
+                continue
+            row = {key: value for key, value in row.items() if value not in ('', None)}
+            if self.user is not None and self.user.role != Role.STUDENT_LIFE_OFFICER:
+                row['created_by'] = self.user.pk
+            parsed.append((line_number, row))
+
+        clubs = related_queryset('club').in_bulk(self.collect_ids(parsed, 'club'))
+        if self.user is not None:
+            # Import par le RVA : l'événement est attribué par défaut au coordinateur du club.
+            for _, row in parsed:
+                club = clubs.get(self.parse_id(row.get('club')))
+                if 'created_by' not in row and club is not None and club.coordinator_id is not None:
+                    row['created_by'] = club.coordinator_id
+        related = {
+            'club': clubs,
+            'created_by': related_queryset('created_by').in_bulk(self.collect_ids(parsed, 'created_by')),
+        }
+        serializer = EventImportSerializer(context={'related': related})
+
+        valid = []
+        for line_number, row in parsed:
+            try:
+                data = serializer.run_validation(row)
+            except serializers.ValidationError as exc:
+                self.add_error(line_number, exc.detail)
+                continue
+            if not self.may_import_into(data['club']):
+                self.add_error(line_number, {'club': ['You do not coordinate this club.']})
+                continue
+            valid.append((line_number, Event(**data)))
+
+        with transaction.atomic():
+            # Salles verrouillées jusqu'à l'insertion : pas de double réservation concurrente.
+            lock_locations(location_key(event.location) for _, event in valid)
+            events = self.reject_conflicts(valid)
+            if events:
+                Event.objects.bulk_create(events, batch_size=self.batch_size)
+                self.after_insert({event.club_id for event in events})
+                index_objects(events)
+                dispatch(events_created, [event.pk for event in events])
+        self.created += len(events)
+
+    def reject_conflicts(self, rows):
+        """Events of `rows` [(line, event)] that do not double-book a location."""
+        for _, event in rows:
+            event.location_key = location_key(event.location)
+        bookings = BookingIndex.load([
+            (event.location, event.start_time, event.end_time)
+            for _, event in rows if event.status != EventStatus.CANCELLED
+        ])
+        accepted = []
+        for line_number, event in rows:
+            if event.status != EventStatus.CANCELLED:
+                conflict = bookings.find(event.location_key, event.start_time, event.end_time)
+                if conflict is not None:
+                    by = f'line {-conflict.id} of this file' if conflict.id < 0 else None
+                    self.add_error(line_number, {'location': [conflict_message(conflict, by)]})
+                    continue
+                # Id provisoire (négatif) : les lignes suivantes du fichier sont aussi vérifiées.
+                bookings.add(Booking(
+                    -line_number, event.location_key, event.location, event.title,
+                    event.club_id, event.start_time, event.end_time,
+                ))
+            accepted.append(event)
+        return accepted
+
+    def after_insert(self, club_ids):
+        # bulk_create n'émet pas de signaux.
+        bump_versions('events', *(f'events:club:{club_id}' for club_id in club_ids))
+        if settings.CLUB_COUNTERS_DENORMALIZED:
+            Club.objects.filter(pk__in=club_ids).refresh_counters()
+
+    def may_import_into(self, club):
+        if self.user is None or self.user.role == Role.STUDENT_LIFE_OFFICER:
+            return True
+        return club.coordinator_id == self.user.pk
+
+    def add_error(self, line_number, detail):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'line': line_number, 'errors': detail})
+
+    @staticmethod
+    def parse_id(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def collect_ids(cls, rows, field):
+        return {cls.parse_id(row.get(field)) for _, row in rows} - {None}
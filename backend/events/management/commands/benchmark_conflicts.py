@@ -0,0 +1,88 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from clubs.models import Club
+from events.conflicts import Booking, conflict_groups, conflict_report
+from events.models import Event, location_key
+from shared.benchmark import benchmark_database
+from shared.enums import Role
+from users.models import CustomUser
+
+
+def pairwise_conflicts(bookings):
+    """Naive baseline: compare every pair of bookings."""
+    found = 0
+    for i, first in enumerate(bookings):
+        for second in bookings[i + 1:]:
+            if (first.location_key == second.location_key
+                    and first.start_time < second.end_time and second.start_time < first.end_time):
+                found += 1
+    return found
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the /api/events/conflicts/ report (sorted scan + sweep) as the number '
+        'of events doubles, next to a pairwise comparison on small samples.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='12500,25000,50000,100000')
+        parser.add_argument('--rooms', type=int, default=300)
+        parser.add_argument('--pairwise', default='1000,2000,4000')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        rng = random.Random(0)
+        with benchmark_database():
+            coordinator = CustomUser.objects.create_user(
+                username='bench', password='bench', role=Role.COORDINATOR
+            )
+            club = Club.objects.create(name='Bench', description='', coordinator=coordinator)
+            start = timezone.now().replace(minute=0, second=0, microsecond=0)
+            total = 0
+            for size in sizes:
+                self.populate(rng, club, coordinator, start, options['rooms'], size - total)
+                total = size
+                started = time.perf_counter()
+                groups = conflict_report(Event.objects.all())
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'sweep     {size:>7} events  {elapsed * 1000:8.1f} ms  '
+                    f'{elapsed / size * 1e6:5.2f} µs/event  {len(groups)} conflict groups'
+                )
+
+            bookings = [
+                Booking(*row) for row in Event.objects.order_by('location_key', 'start_time', 'id')
+                .values_list('id', 'location_key', 'location', 'title', 'club_id', 'start_time', 'end_time')
+            ]
+            for size in (int(size) for size in options['pairwise'].split(',')):
+                sample = bookings[:size]
+                started = time.perf_counter()
+                pairwise_conflicts(sample)
+                pairwise = time.perf_counter() - started
+                started = time.perf_counter()
+                list(conflict_groups(sample))
+                sweep = time.perf_counter() - started
+                self.stdout.write(
+                    f'pairwise  {size:>7} events  {pairwise * 1000:8.1f} ms  '
+                    f'(in-memory sweep {sweep * 1000:.2f} ms)'
+                )
+
+    def populate(self, rng, club, coordinator, start, rooms, count):
+        events = []
+        for _ in range(count):
+            room = rng.randrange(rooms)
+            location = rng.choice(('Salle {}', 'salle  {}', 'SALLE {}')).format(room)
+            # Créneaux d'une heure sur un an, durées de 1 à 3 h : quelques chevauchements.
+            begins = start + timedelta(hours=rng.randrange(24 * 365))
+            events.append(Event(
+                club=club, title='Bench', description='', location=location,
+                location_key=location_key(location), start_time=begins,
+                end_time=begins + timedelta(hours=rng.randint(1, 3)), created_by=coordinator,
+            ))
+        Event.objects.bulk_create(events, batch_size=5000)
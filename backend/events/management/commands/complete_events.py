@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.status import complete_events
+
+
+class Command(BaseCommand):
+    help = (
+        'Mark ended UPCOMING events as COMPLETED, one UPDATE per batch. Run it from '
+        'cron, or with --every to keep it running as a periodic worker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--every', type=float, default=0, help='Repeat every N seconds instead of running once.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            completed = complete_events(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Completed {completed} events in {time.perf_counter() - started:.2f}s.'
+            ))
+            if not options['every']:
+                return
+            time.sleep(options['every'])
@@ -0,0 +1,46 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events.importers import EventImporter, UnreadableFile, detect_format, iter_rows
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = 'Stream-import events from a CSV or JSON Lines file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', dest='file_format', choices=['csv', 'jsonl'],
+                            help='Defaults to the file extension.')
+        parser.add_argument('--as-user', help='Import on behalf of this username '
+                                              '(ownership checks, default created_by).')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--max-errors', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        file_format = detect_format(options['path'], options['file_format'])
+        if file_format is None:
+            raise CommandError('Cannot tell the file format; pass --format.')
+        user = None
+        if options['as_user']:
+            try:
+                user = CustomUser.objects.get(username=options['as_user'])
+            except CustomUser.DoesNotExist:
+                raise CommandError(f"Unknown user {options['as_user']!r}.")
+
+        importer = EventImporter(
+            user=user, batch_size=options['batch_size'], max_errors=options['max_errors']
+        )
+        with open(options['path'], 'rb') as stream:
+            try:
+                rows = iter_rows(stream, file_format)
+            except UnreadableFile as exc:
+                raise CommandError(str(exc))
+            report = importer.run(rows)
+
+        for error in report['errors']:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} event(s), rejected {report['failed']}."
+        ))
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0003_event_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["end_time", "start_time"], name="event_end_start_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:55
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+def location_key(location):
+    # Copie de events.models.location_key au moment de la migration.
+    text = unicodedata.normalize("NFKD", (location or "").casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    # Tronquée à la taille de la colonne (la clé peut être plus longue que location).
+    return " ".join(re.findall(r"[^\W\d_]+|\d+", text))[:200].rstrip()
+
+
+def fill_location_keys(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    batch = []
+    for event in Event.objects.only("pk", "location").iterator(chunk_size=2000):
+        event.location_key = location_key(event.location)
+        batch.append(event)
+        if len(batch) == 2000:
+            Event.objects.bulk_update(batch, ["location_key"])
+            batch = []
+    Event.objects.bulk_update(batch, ["location_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0005_event_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="location_key",
+            field=models.CharField(default="", editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_location_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["location_key", "start_time", "end_time"],
+                name="event_location_time_idx",
+            ),
+        ),
+    ]
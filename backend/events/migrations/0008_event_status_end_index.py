@@ -0,0 +1,19 @@
+# Generated by Django 4.2.20 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0007_event_updated_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["status", "end_time"], name="event_status_end_idx"
+            ),
+        ),
+    ]
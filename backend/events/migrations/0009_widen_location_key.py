@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0008_event_status_end_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="event",
+            name="location_key",
+            field=models.CharField(default="", editable=False, max_length=255),
+        ),
+    ]
@@ -1,8 +1,74 @@
+import re
+import unicodedata
+
 from django.db import models
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
 from clubs.models import Club
 from users.models import CustomUser
 from shared.enums import EventType, EventStatus, Role
 
+LOCATION_KEY_LENGTH = 255
+
+
+def location_key(location):
+    """Comparable room key: 'Salle  B-12', 'salle b12' and 'SALLE B 12' all give 'salle b 12'."""
+    text = unicodedata.normalize('NFKD', (location or '').casefold())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    # NFKD et la séparation lettres/chiffres peuvent allonger le texte : la clé est tronquée.
+    return ' '.join(re.findall(r'[^\W\d_]+|\d+', text))[:LOCATION_KEY_LENGTH].rstrip()
+
+
+class EventQuerySet(models.QuerySet):
+    def upcoming(self, now=None):
+        return self.filter(start_time__gt=now or timezone.now())
+
+    def past(self, now=None):
+        return self.filter(end_time__lt=now or timezone.now())
+
+    def overlapping(self, start=None, end=None):
+        """Events whose [start_time, end_time) interval intersects [start, end)."""
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(end_time__gt=start)
+        if end is not None:
+            queryset = queryset.filter(start_time__lt=end)
+        return queryset
+
+    def due_for_completion(self, now=None):
+        """UPCOMING events that have ended: what the status engine will mark COMPLETED."""
+        return self.filter(status=EventStatus.UPCOMING, end_time__lte=now or timezone.now())
+
+    def with_effective_status(self, now=None):
+        """
+        Annotate `effective_status`: the stored status, except that ended
+        UPCOMING events read as COMPLETED before `complete_events` has run.
+        """
+        return self.annotate(effective_status=Case(
+            When(status=EventStatus.UPCOMING, end_time__lte=now or timezone.now(),
+                 then=Value(EventStatus.COMPLETED)),
+            default=F('status'),
+            output_field=models.CharField(max_length=20),
+        ))
+
+    def with_status(self, status, now=None):
+        """Events whose effective status is `status`, using the (status, end_time) index."""
+        now = now or timezone.now()
+        if status == EventStatus.UPCOMING:
+            return self.filter(status=EventStatus.UPCOMING, end_time__gt=now)
+        if status == EventStatus.COMPLETED:
+            return self.filter(
+                Q(status=EventStatus.COMPLETED) | Q(status=EventStatus.UPCOMING, end_time__lte=now)
+            )
+        return self.filter(status=status)
+
+    def booked(self, key, start, end):
+        """Non-cancelled events at location `key` overlapping [start, end)."""
+        return self.exclude(status=EventStatus.CANCELLED).filter(
+            location_key=key, start_time__lt=end, end_time__gt=start
+        )
+
+
 class Event(models.Model):
     club = models.ForeignKey(
         Club,
@@ -14,6 +80,8 @@ class Event(models.Model):
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
     location = models.CharField(max_length=200)
+    # location normalisée (casse, accents, ponctuation), pour détecter les doubles réservations
+    location_key = models.CharField(max_length=LOCATION_KEY_LENGTH, default='', editable=False)
     event_type = models.CharField(
         max_length=20,
         choices=EventType.choices,
@@ -30,19 +98,41 @@ class Event(models.Model):
         limit_choices_to={'role': Role.COORDINATOR},
         related_name='created_events'
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = EventQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Event'
         verbose_name_plural = 'Events'
         ordering = ['-start_time']
+        indexes = [
+            # Ordre de la pagination keyset
+            models.Index(fields=['-start_time', '-id'], name='event_start_id_idx'),
+            models.Index(fields=['club', '-start_time'], name='event_club_start_idx'),
+            models.Index(fields=['status', 'start_time'], name='event_status_start_idx'),
+            # Filtre ?status= et passage UPCOMING -> COMPLETED : status = :s AND end_time <= :now
+            models.Index(fields=['status', 'end_time'], name='event_status_end_idx'),
+            # Fenêtres de temps à venir : end_time > :from
+            models.Index(fields=['end_time', 'start_time'], name='event_end_start_idx'),
+            # Chevauchements dans une salle : location_key = :k AND start_time < :end AND end_time > :start
+            models.Index(fields=['location_key', 'start_time', 'end_time'], name='event_location_time_idx'),
+            # Lignes modifiées depuis le dernier rafraîchissement des statistiques
+            models.Index(fields=['updated_at'], name='event_updated_idx'),
+        ]
 
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.location_key = location_key(self.location)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'location' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'location_key'}
+        super().save(*args, **kwargs)
+
     def is_upcoming(self) -> bool:
-        from django.utils import timezone
         return self.start_time > timezone.now()
 
     def is_past(self) -> bool:
-        from django.utils import timezone
         return self.end_time < timezone.now()
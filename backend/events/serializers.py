@@ -1,8 +1,53 @@
 from rest_framework import serializers
-from .models import Event
+from .conflicts import conflict_message, find_conflict, lock_locations
+from .models import Event, location_key
+from shared.expansions import ExpandableFieldsMixin
+from shared.enums import EventStatus
+from shared.fieldsets import SparseFieldsetMixin
+
+class EventStatusField(serializers.ChoiceField):
+    """
+    Writes the stored status; reads the effective one (ended UPCOMING events
+    show as COMPLETED) when the queryset was annotated by
+    EventQuerySet.with_effective_status.
+    """
+    annotation = 'effective_status'
+
+    def get_attribute(self, instance):
+        return getattr(instance, self.annotation, instance.status)
+
+
+class EventSerializer(SparseFieldsetMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
+    status = EventStatusField(choices=EventStatus.choices, required=False)
 
-class EventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = ['id', 'club', 'title', 'description', 'start_time', 'end_time', 'location', 'event_type', 'status', 'created_by']
-        read_only_fields = ['id']
\ No newline at end of file
+        read_only_fields = ['id']
+        expandable_fields = {
+            'club': 'clubs.serializers.ClubSerializer',
+            'created_by': 'users.serializers.UserSerializer',
+        }
+
+    # The bulk importer checks a whole batch at once (see EventImporter).
+    check_conflicts = True
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if not self.check_conflicts:
+            return attrs
+        values = {
+            name: attrs.get(name, getattr(self.instance, name, None))
+            for name in ('location', 'start_time', 'end_time', 'status')
+        }
+        if values['status'] == EventStatus.CANCELLED:
+            return attrs
+        # Held until the view's transaction commits the write (see EventViewSet.create/update).
+        lock_locations([location_key(values['location'])])
+        conflict = find_conflict(
+            values['location'], values['start_time'], values['end_time'],
+            exclude=getattr(self.instance, 'pk', None),
+        )
+        if conflict is not None:
+            raise serializers.ValidationError({'location': [conflict_message(conflict)]})
+        return attrs
@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.utils import timezone
+
+from shared.conditional import bump_versions
+from shared.enums import EventStatus
+from .models import Event
+
+
+def complete_events(now=None, batch_size=1000):
+    """
+    Mark every UPCOMING event that has ended as COMPLETED and return how many
+    were updated.
+
+    Each batch is one indexed SELECT of (id, club) followed by one UPDATE;
+    `status = 'upcoming'` is repeated in the UPDATE so that concurrent runs
+    never count the same event twice. updated_at is set explicitly (update()
+    bypasses auto_now) so the stats refresh and row ETags see the change.
+    """
+    now = now or timezone.now()
+    completed = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Event.objects.due_for_completion(now)
+                .order_by('end_time', 'id')
+                .values_list('id', 'club_id')[:batch_size]
+            )
+            if not batch:
+                break
+            completed += Event.objects.filter(
+                pk__in=[pk for pk, _ in batch], status=EventStatus.UPCOMING
+            ).update(status=EventStatus.COMPLETED, updated_at=now)
+            # update() n'émet pas de signaux : invalider comme shared.signals.
+            bump_versions('events', *{f'events:club:{club_id}' for _, club_id in batch})
+        if len(batch) < batch_size:
+            break
+    return completed
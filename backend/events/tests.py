@@ -1,3 +1,413 @@
-from django.test import TestCase
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from clubs.models import Club
+from notifications.models import Notification
+from shared.compiled import CompiledSerializer
+from shared.enums import EventStatus, Role
+from shared.testing import QueryBudgetTestCase
+from users.models import CustomUser
+from .conflicts import lock_locations
+from .filters import filter_events, parse_moment, parse_month
+from .models import Event, location_key
+from .status import complete_events
+
+
+class EventQueryBudgetTests(QueryBudgetTestCase):
+    def test_event_endpoints_stay_within_query_budget(self):
+        self.assertEndpointBudgets({
+            '/api/events/': 2,
+            f'/api/events/by-club/{self.club.pk}/': 2,
+        })
+
+
+class EventSparseFieldsetTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.grow_to(3)
+
+    def test_fields_trim_payload_and_columns(self):
+        with self.assertQueryBudget(2) as queries:
+            response = self.client.get('/api/events/', {'fields': 'id,title'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+        self.assertNotIn('description', queries.captured_queries[-1]['sql'])
+
+    def test_omit_drops_fields(self):
+        response = self.client.get(f'/api/events/by-club/{self.club.pk}/', {'omit': 'description'})
+        self.assertNotIn('description', response.data['results'][0])
+        self.assertIn('title', response.data['results'][0])
+
+    def test_unknown_field_is_rejected(self):
+        self.assertEqual(self.client.get('/api/events/', {'fields': 'nope'}).status_code, 400)
+
+
+class EventExpansionTests(QueryBudgetTestCase):
+    def test_expanded_pages_stay_within_query_budget(self):
+        self.assertEndpointBudgets({
+            '/api/events/?expand=club,created_by': 3,
+            f'/api/events/by-club/{self.club.pk}/?expand=club': 3,
+            '/api/memberships/?expand=user,club': 3,
+        })
+
+    def test_related_objects_are_inlined(self):
+        self.grow_to(2)
+        event = self.client.get('/api/events/', {'expand': 'club,created_by'}).data['results'][0]
+        self.assertEqual(event['club']['name'], self.club.name)
+        self.assertIn('active_member_count', event['club'])
+        self.assertEqual(event['created_by']['username'], self.coordinator.username)
+
+    def test_expanded_club_change_invalidates_etag(self):
+        self.grow_to(2)
+        etag = self.client.get('/api/events/', {'expand': 'club'})['ETag']
+        self.club.name = 'Renamed'
+        self.club.save()
+        response = self.client.get('/api/events/', {'expand': 'club'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_expansion_is_rejected(self):
+        self.assertEqual(self.client.get('/api/events/', {'expand': 'nope'}).status_code, 400)
+
+
+class CompiledListTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.grow_to(3)
+
+    def test_compiled_page_matches_model_serializer(self):
+        with mock.patch.object(CompiledSerializer, 'compile', return_value=None):
+            expected = self.client.get('/api/events/', {'page_size': 2}).content
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        original = CompiledSerializer.bind
+        with mock.patch.object(CompiledSerializer, 'bind', autospec=True, side_effect=original) as bind:
+            content = self.client.get('/api/events/', {'page_size': 2}).content
+        bind.assert_called_once()
+        self.assertEqual(content, expected)
+
+    def test_expansion_falls_back_to_model_serializer(self):
+        with mock.patch.object(CompiledSerializer, 'bind') as bind:
+            response = self.client.get('/api/events/', {'expand': 'club'})
+        bind.assert_not_called()
+        self.assertEqual(response.data['results'][0]['club']['name'], self.club.name)
+
+
+class EventFilterTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        march = timezone.make_aware(datetime(2031, 3, 1))
+        self.past, self.ongoing, self.spanning, self.april = Event.objects.bulk_create([
+            Event(
+                club=self.club, title=title, description='', location=f'Room {title}',
+                start_time=start, end_time=end, created_by=self.coordinator,
+            )
+            for title, start, end in (
+                ('Past', now - timedelta(days=2), now - timedelta(days=1)),
+                ('Ongoing', now - timedelta(hours=1), now + timedelta(hours=1)),
+                ('Spanning', march - timedelta(hours=1), march + timedelta(hours=1)),
+                ('April', march.replace(month=4), march.replace(month=4) + timedelta(hours=1)),
+            )
+        ])
+
+    def titles(self, queryset):
+        return set(queryset.values_list('title', flat=True))
+
+    def test_querysets(self):
+        events = Event.objects.all()
+        self.assertEqual(self.titles(events.upcoming()), {'Spanning', 'April'})
+        self.assertEqual(self.titles(events.past()), {'Past'})
+        march = timezone.make_aware(datetime(2031, 3, 1))
+        self.assertEqual(self.titles(events.overlapping(march, march.replace(month=4))), {'Spanning'})
+        self.assertEqual(self.titles(events.overlapping(start=march)), {'Spanning', 'April'})
+        self.assertEqual(self.titles(events.overlapping(end=timezone.now())), {'Past', 'Ongoing'})
+
+    def test_parse_moment_and_month(self):
+        self.assertEqual(parse_moment('from', '2031-03-01'), timezone.make_aware(datetime(2031, 3, 1)))
+        self.assertEqual(
+            parse_moment('from', '2031-03-01T10:00:00+02:00'),
+            datetime(2031, 3, 1, 8, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(
+            parse_month('2031-12'),
+            (timezone.make_aware(datetime(2031, 12, 1)), timezone.make_aware(datetime(2032, 1, 1))),
+        )
+        for value in ('tomorrow', '2031-02-30', '2031-13-01T00:00'):
+            with self.subTest(value=value), self.assertRaises(ValidationError):
+                parse_moment('from', value)
+        for value in ('2031', '2031-13', 'march', '9999-12', '0-1'):
+            with self.subTest(value=value), self.assertRaises(ValidationError):
+                parse_month(value)
+
+    def test_filter_events(self):
+        events = Event.objects.all()
+        self.assertEqual(self.titles(filter_events(events, {'upcoming': 'true'})), {'Spanning', 'April'})
+        self.assertEqual(self.titles(filter_events(events, {'upcoming': 'no'})), {'Past', 'Ongoing'})
+        window = {'from': '2031-03-01', 'to': '2031-04-01'}
+        self.assertEqual(self.titles(filter_events(events, window)), {'Spanning'})
+        self.assertEqual(filter_events(events, {'club': str(self.club.pk + 1)}).count(), 0)
+        for params in ({'club': 'chess'}, {'upcoming': 'soon'}, {'status': 'over'},
+                       {'from': '2031-04-01', 'to': '2031-03-01'}):
+            with self.subTest(params=params), self.assertRaises(ValidationError):
+                filter_events(events, params)
+        response = self.client.get('/api/events/', {'from': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_calendar(self):
+        response = self.client.get('/api/events/calendar/', {'month': '2031-03'})
+        self.assertEqual(response.data['fields'], ('id', 'title', 'start_time', 'end_time', 'club'))
+        self.assertEqual([row[0] for row in response.data['events']], [self.spanning.pk])
+        self.assertEqual(self.client.get('/api/events/calendar/').status_code, 400)
+        self.assertEqual(self.client.get('/api/events/calendar/', {'month': '9999-12'}).status_code, 400)
+        other = self.client.get('/api/events/calendar/', {'month': '2031-03', 'club': self.club.pk + 1})
+        self.assertEqual(other.data['events'], [])
+
+
+class EventConflictTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.booked = Event.objects.create(
+            club=self.club, title='Robotics', description='', location='Salle B-12',
+            start_time=self.start, end_time=self.start + timedelta(hours=2), created_by=self.coordinator,
+        )
+
+    def create(self, location='salle b12', start=None, hours=1):
+        start = start or self.start + timedelta(hours=1)
+        return self.client.post('/api/events/', {
+            'club': self.club.pk, 'title': 'Chess', 'description': 'Weekly games', 'location': location,
+            'start_time': start.isoformat(), 'end_time': (start + timedelta(hours=hours)).isoformat(),
+            'created_by': self.coordinator.pk,
+        })
+
+    def test_overlapping_booking_is_rejected(self):
+        response = self.create()
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(f'event {self.booked.pk}', response.data['location'][0])
+        self.assertEqual(self.create(start=self.start + timedelta(hours=2)).status_code, 201)
+        self.assertEqual(self.create(location='Salle C').status_code, 201)
+
+    def test_update_and_cancelled_events(self):
+        other = self.create(start=self.start + timedelta(hours=3)).data['id']
+        url = f'/api/events/{other}/'
+        self.assertEqual(self.client.patch(url, {'start_time': self.start.isoformat()}).status_code, 400)
+        self.assertEqual(self.client.patch(url, {'title': 'Renamed'}).status_code, 200)
+        self.booked.status = EventStatus.CANCELLED
+        self.booked.save()
+        self.assertEqual(self.client.patch(url, {'start_time': self.start.isoformat()}).status_code, 200)
+
+    def test_postgresql_locks_each_room_once_in_order(self):
+        with mock.patch.object(connection, 'vendor', 'postgresql'), mock.patch.object(connection, 'cursor') as cursor:
+            lock_locations(['salle c', '', 'salle b 12', 'salle c'])
+            lock_locations([''])
+        execute = cursor.return_value.__enter__.return_value.execute
+        execute.assert_called_once()
+        sql, params = execute.call_args.args
+        self.assertIn('pg_advisory_xact_lock', sql)
+        self.assertEqual(params, [['salle b 12', 'salle c']])
+
+    def test_long_location_key_fits_its_column(self):
+        # 'a1' * 100 : 200 caractères, 399 une fois lettres et chiffres séparés.
+        for location in ('a1' * 100, '\ufdfa' * 200):
+            with self.subTest(location=location[:10]):
+                self.assertLessEqual(len(location_key(location)), Event._meta.get_field('location_key').max_length)
+        response = self.create(location='a1' * 100)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.create(location='A-1' * 100).status_code, 400)
+
+    def test_report_groups_overlaps_for_the_rva(self):
+        Event.objects.bulk_create([
+            Event(
+                club=self.club, title=f'Overlap {i}', description='', location='SALLE B 12',
+                location_key='salle b 12', start_time=self.start + timedelta(minutes=30 * i),
+                end_time=self.start + timedelta(minutes=30 * i + 45), created_by=self.coordinator,
+            )
+            for i in (1, 2)
+        ])
+        self.assertEqual(self.client.get('/api/events/conflicts/').status_code, 403)
+        rva = CustomUser.objects.create_user(username='rva', password='secret', role=Role.STUDENT_LIFE_OFFICER)
+        self.client.force_authenticate(rva)
+        conflicts = self.client.get('/api/events/conflicts/').data['conflicts']
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(conflicts[0]['events'][0]['id'], self.booked.pk)
+        self.assertEqual(len(conflicts[0]['events']), 3)
+
+    def test_import_rejects_double_bookings(self):
+        rows = [
+            {'club': self.club.pk, 'title': 'A', 'description': 'x', 'location': 'Salle B12',
+             'start_time': self.start.isoformat(), 'end_time': (self.start + timedelta(hours=1)).isoformat()},
+            {'club': self.club.pk, 'title': 'B', 'description': 'x', 'location': 'Hall',
+             'start_time': self.start.isoformat(), 'end_time': (self.start + timedelta(hours=1)).isoformat()},
+            {'club': self.club.pk, 'title': 'C', 'description': 'x', 'location': 'hall',
+             'start_time': self.start.isoformat(), 'end_time': (self.start + timedelta(hours=1)).isoformat()},
+        ]
+        upload = SimpleUploadedFile('events.jsonl', '\n'.join(json.dumps(row) for row in rows).encode())
+        report = self.client.post('/api/events/import/', {'file': upload}, format='multipart').data
+        self.assertEqual(report['created'], 1)
+        self.assertEqual([error['line'] for error in report['errors']], [1, 3])
+        self.assertIn('line 2 of this file', report['errors'][1]['errors']['location'][0])
+
+
+class EventImportTests(QueryBudgetTestCase):
+    url = '/api/events/import/'
+
+    def setUp(self):
+        super().setUp()
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=2)
+        self.member = CustomUser.objects.create_user(username='member', password='secret', role=Role.MEMBER)
+
+    def row(self, title, hours=0, **fields):
+        start = self.start + timedelta(hours=hours)
+        return {
+            'club': self.club.pk, 'title': title, 'description': 'Imported', 'location': f'Room {title}',
+            'start_time': start.isoformat(), 'end_time': (start + timedelta(hours=1)).isoformat(), **fields,
+        }
+
+    def upload(self, name, content):
+        upload = SimpleUploadedFile(name, content if isinstance(content, bytes) else content.encode())
+        return self.client.post(self.url, {'file': upload}, format='multipart')
+
+    def jsonl(self, *rows):
+        return '\n'.join(row if isinstance(row, str) else json.dumps(row) for row in rows)
+
+    def test_csv_and_jsonl_files_are_imported(self):
+        header = 'club,title,description,location,start_time,end_time'
+        line = ','.join(str(value) for value in self.row('CSV').values())
+        response = self.upload('events.csv', f'{header}\n{line}\n')
+        self.assertEqual((response.status_code, response.data['created']), (201, 1))
+        response = self.upload('events.jsonl', self.jsonl(self.row('One', 2), self.row('Two', 4)))
+        self.assertEqual(response.data, {'created': 2, 'failed': 0, 'errors': [], 'errors_truncated': False})
+        self.assertEqual(Event.objects.filter(created_by=self.coordinator).count(), 3)
+
+    @override_settings(NOTIFICATIONS_ASYNC=False)
+    def test_imported_events_notify_the_club(self):
+        self.grow_to(2)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload('events.jsonl', self.jsonl(self.row('One'), self.row('Two', 2)))
+        self.assertEqual(response.data['created'], 2)
+        imported = Event.objects.filter(title__in=['One', 'Two'])
+        notified = Notification.objects.filter(event__in=imported)
+        self.assertEqual(notified.count(), 4)
+        self.assertEqual(set(notified.values_list('recipient__username', flat=True)), {'member00000', 'member00001'})
+
+    def test_rejected_rows_are_reported_by_line(self):
+        response = self.upload('events.jsonl', self.jsonl(
+            self.row('Good'), '{not json', self.row('', 2), '[1, 2]', self.row('Also good', 4),
+        ))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2)
+        errors = {error['line']: error['errors'] for error in response.data['errors']}
+        self.assertEqual(sorted(errors), [2, 3, 4])
+        self.assertIn('title', errors[3])
+
+    def test_rows_must_target_clubs_of_the_importer(self):
+        outsider = CustomUser.objects.create_user(username='outsider', password='secret', role=Role.COORDINATOR)
+        other = Club.objects.create(name='Other', description='', coordinator=outsider)
+        response = self.upload('events.jsonl', self.jsonl(self.row('Theirs', club=other.pk)))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0]['errors'], {'club': ['You do not coordinate this club.']})
+
+    def test_created_by_is_restricted_to_coordinators(self):
+        # Un coordinateur importe toujours en son nom.
+        self.upload('events.jsonl', self.jsonl(self.row('Mine', created_by=self.member.pk)))
+        self.assertEqual(Event.objects.get(title='Mine').created_by, self.coordinator)
+
+        rva = CustomUser.objects.create_user(username='rva', password='secret', role=Role.STUDENT_LIFE_OFFICER)
+        self.client.force_authenticate(rva)
+        response = self.upload('events.jsonl', self.jsonl(
+            self.row('By member', 2, created_by=self.member.pk), self.row('Default', 4),
+        ))
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['line'], 1)
+        self.assertIn('created_by', response.data['errors'][0]['errors'])
+        self.assertEqual(Event.objects.get(title='Default').created_by, self.coordinator)
+
+    def test_undecodable_files_are_rejected(self):
+        response = self.upload('events.csv', b'\xff\xfe,title\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('file', response.data)
+        response = self.upload('events.jsonl', self.jsonl(self.row('Kept')).encode() + b'\n\xff\xfe\n')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['line'], 2)
+        header = 'club,title,description,location,start_time,end_time\n'
+        response = self.upload('events.csv', header + '1,"unterminated\0\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['failed'], 1)
+
+    def test_import_events_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl') as handle:
+            handle.write(self.jsonl(self.row('Command'), {'title': 'No club'}))
+            handle.flush()
+            stdout, stderr = StringIO(), StringIO()
+            call_command('import_events', handle.name, '--as-user', 'coordinator', stdout=stdout, stderr=stderr)
+        self.assertIn('Imported 1 event(s), rejected 1.', stdout.getvalue())
+        self.assertIn('line 2:', stderr.getvalue())
+        self.assertTrue(Event.objects.filter(title='Command', created_by=self.coordinator).exists())
+
+
+class EventStatusTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.ended, self.running, self.cancelled = Event.objects.bulk_create([
+            Event(
+                club=self.club, title=title, description='', location=f'Room {title}',
+                start_time=now + timedelta(hours=start), end_time=now + timedelta(hours=start + 2),
+                created_by=self.coordinator, status=status,
+            )
+            for title, start, status in (
+                ('Ended', -3, EventStatus.UPCOMING),
+                ('Running', -1, EventStatus.UPCOMING),
+                ('Cancelled', -3, EventStatus.CANCELLED),
+            )
+        ])
+
+    def statuses(self, **params):
+        results = self.client.get('/api/events/', params).data['results']
+        return {event['title']: event['status'] for event in results}
+
+    def test_ended_events_read_as_completed_before_the_engine_runs(self):
+        self.assertEqual(self.statuses(), {
+            'Ended': EventStatus.COMPLETED, 'Running': EventStatus.UPCOMING, 'Cancelled': EventStatus.CANCELLED,
+        })
+        self.assertEqual(set(self.statuses(status='completed')), {'Ended'})
+        self.assertEqual(set(self.statuses(status='upcoming')), {'Running'})
+        detail = self.client.get(f'/api/events/{self.ended.pk}/').data
+        self.assertEqual(detail['status'], EventStatus.COMPLETED)
+        club_events = self.client.get(f'/api/clubs/{self.club.pk}/events/').data['results']
+        self.assertIn(EventStatus.COMPLETED, {event['status'] for event in club_events})
+        self.assertEqual(self.client.get('/api/events/', {'status': 'over'}).status_code, 400)
+
+    def test_write_responses_show_the_effective_status(self):
+        response = self.client.patch(f'/api/events/{self.ended.pk}/', {'title': 'Ended, renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], EventStatus.COMPLETED)
+        later = timezone.now() + timedelta(days=1)
+        response = self.client.patch(f'/api/events/{self.ended.pk}/', {
+            'start_time': later.isoformat(), 'end_time': (later + timedelta(hours=2)).isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], EventStatus.UPCOMING)
+
+    def test_complete_events_updates_in_bulk(self):
+        before = self.ended.updated_at
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(complete_events(batch_size=10), 1)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "events_event"')]
+        self.assertEqual(len(updates), 1)
+        self.ended.refresh_from_db()
+        self.assertEqual(self.ended.status, EventStatus.COMPLETED)
+        self.assertGreater(self.ended.updated_at, before)
+        self.assertEqual(complete_events(), 0)
+        self.assertEqual(set(self.statuses(status='completed')), {'Ended'})
@@ -1,20 +1,191 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from .models import Event
+from .conflicts import conflict_report
+from .filters import filter_events, parse_moment, parse_month
+from .importers import EventImporter, UnreadableFile, detect_format, iter_rows
+from .models import Event, location_key
 from .serializers import EventSerializer
+from notifications.fanout import dispatch, event_created
+from shared.async_views import AsyncAPIView
+from shared.compiled import CompiledListMixin
+from shared.conditional import aconditional, conditional
+from shared.enums import Role
+from shared.exports import export_response
+from shared.permissions import IsRVA
+from shared.expansions import ExpandableViewMixin, plan_expansions
+from shared.fieldsets import SparseFieldsetViewMixin, narrow_queryset
 
-class EventViewSet(viewsets.ModelViewSet):
+CALENDAR_FIELDS = ('id', 'title', 'start_time', 'end_time', 'club')
+EXPORT_FIELDS = (
+    'pk', 'club_id', 'club__name', 'title', 'start_time', 'end_time', 'location',
+    'event_type', 'effective_status', 'created_by__username',
+)
+EXPORT_HEADER = (
+    'event_id', 'club_id', 'club', 'title', 'start_time', 'end_time', 'location',
+    'event_type', 'status', 'created_by',
+)
+
+
+def window_starts_now(request):
+    return 'from' not in request.GET
+
+
+def club_events_versions(request, club_id=None, **kwargs):
+    return [f'events:club:{club_id}']
+
+
+class EventViewSet(
+    SparseFieldsetViewMixin, ExpandableViewMixin, CompiledListMixin, viewsets.ModelViewSet
+):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAuthenticated]
+    compiled_actions = ('list', 'by_club')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'by_club', 'calendar', 'export'):
+            queryset = filter_events(queryset, self.request.query_params)
+        if self.action in ('list', 'by_club', 'retrieve', 'export'):
+            queryset = queryset.with_effective_status()
+        return queryset
+
+    # Statut effectif calculé à la lecture : les réponses changent quand un événement se termine.
+    @conditional(lambda request, **kwargs: ['events'], time_sensitive=True)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    # Vérification des doubles réservations et écriture dans une même transaction
+    # (verrou par salle, voir EventSerializer.validate).
+    @transaction.atomic
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        event = serializer.save()
+        self.read_effective_status(event)
+        # Après le commit, hors de la requête : la latence ne dépend pas de la taille du club.
+        dispatch(event_created, event.pk)
+
+    def perform_update(self, serializer):
+        self.read_effective_status(serializer.save())
+
+    def read_effective_status(self, event):
+        # La réponse d'écriture montre le statut effectif de la ligne écrite, comme retrieve ;
+        # une annotation lue avant l'écriture serait périmée.
+        event.effective_status = (
+            Event.objects.with_effective_status()
+            .values_list('effective_status', flat=True)
+            .get(pk=event.pk)
+        )
+
+    @conditional(lambda request, **kwargs: [], model=Event, time_sensitive=True)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     @action(detail=False, methods=['get'], url_path='by-club/(?P<club_id>[^/.]+)')
+    @conditional(club_events_versions, time_sensitive=True)
     def by_club(self, request, club_id=None):
-        events = self.queryset.filter(club_id=club_id)
+        events = self.filter_queryset(self.get_queryset()).filter(club_id=club_id)
         page = self.paginate_queryset(events)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(events, many=True)
         return Response(serializer.data)
+
+    @action(detail=False, methods=['get'], url_path='calendar')
+    def calendar(self, request):
+        """
+        Compact month view: ?month=YYYY-MM (plus the usual ?club= filter) returns
+        one [id, title, start_time, end_time, club] row per overlapping event.
+        """
+        if not request.query_params.get('month'):
+            raise ValidationError({'month': 'This parameter is required.'})
+        start, end = parse_month(request.query_params['month'])
+        rows = (
+            self.get_queryset()
+            .overlapping(start, end)
+            .order_by('start_time', 'id')
+            .values_list(*CALENDAR_FIELDS)
+        )
+        return Response({
+            'month': request.query_params['month'],
+            'fields': CALENDAR_FIELDS,
+            'events': list(rows),
+        })
+
+    @action(detail=False, methods=['get'], url_path='conflicts', permission_classes=[IsRVA])
+    @conditional(lambda request, **kwargs: ['events'], time_sensitive=window_starts_now)
+    def conflicts(self, request):
+        """
+        Double-booking report for the student life office: groups of
+        overlapping events per (normalized) location. Defaults to events that
+        have not ended yet; ?from=/?to= choose another window, ?location= one room.
+        """
+        params = request.query_params
+        # Sans ?from=, la minute courante (l'ETag change chaque minute).
+        now = timezone.now().replace(second=0, microsecond=0)
+        start = parse_moment('from', params['from']) if params.get('from') else now
+        end = parse_moment('to', params['to']) if params.get('to') else None
+        if end is not None and start >= end:
+            raise ValidationError({'to': 'Must be later than from.'})
+        events = Event.objects.overlapping(start, end)
+        if params.get('location'):
+            events = events.filter(location_key=location_key(params['location']))
+        return Response({
+            'from': start,
+            'to': end,
+            'conflicts': conflict_report(events),
+        })
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """Stream the (filtered) event list as CSV or XLSX (?type=)."""
+        rows = self.get_queryset().order_by('pk').values_list(*EXPORT_FIELDS)
+        return export_response(request, 'events', EXPORT_HEADER, rows.iterator(chunk_size=2000))
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_events(self, request):
+        """
+        Bulk import from a multipart `file` (.csv or .jsonl, or set `format`).
+        Rows are streamed from the upload and inserted in batches; the response
+        lists the rejected rows with their line numbers.
+        """
+        if request.user.role not in (Role.COORDINATOR, Role.STUDENT_LIFE_OFFICER):
+            raise PermissionDenied('Only coordinators can import events.')
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': 'This field is required.'})
+        file_format = detect_format(upload.name, request.data.get('format'))
+        if file_format is None:
+            raise ValidationError({'format': 'Expected csv or jsonl.'})
+
+        try:
+            rows = iter_rows(upload, file_format)
+        except UnreadableFile as exc:
+            raise ValidationError({'file': str(exc)})
+        report = EventImporter(user=request.user).run(rows)
+        return Response(report, status=201 if report['created'] else 400)
+
+
+class AsyncEventsByClubView(AsyncAPIView):
+    serializer_class = EventSerializer
+
+    @aconditional(club_events_versions, time_sensitive=True)
+    async def get(self, request, club_id):
+        events = filter_events(Event.objects.with_effective_status(), request.GET).filter(club_id=club_id)
+        events = plan_expansions(events, EventSerializer, request)
+        events = narrow_queryset(events, EventSerializer, request)
+        page, paginator = await self.paginate(request, events)
+        context = self.serializer_context(request)
+        return self.paginated_response(paginator, EventSerializer(page, many=True, context=context).data)
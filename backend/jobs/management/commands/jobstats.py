@@ -0,0 +1,15 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Print per-queue job counts, backlog lag, throughput and latency percentiles as JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=3600, help='Seconds of finished jobs to summarize.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(queue_stats(window=options['window']), indent=2))
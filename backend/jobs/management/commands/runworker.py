@@ -0,0 +1,102 @@
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from jobs.queue import claim, execute, purge, queue_stats, requeue_stale
+
+logger = logging.getLogger('jobs')
+
+
+def _init_process():
+    # Processus « spawn » : Django doit être initialisé avant la première tâche.
+    django.setup()
+
+
+def run_job(job_id):
+    try:
+        return execute(job_id)
+    finally:
+        # Une connexion par thread ou processus du pool, fermée entre deux tâches.
+        close_old_connections()
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        'Run queued jobs (jobs.queue.enqueue) on a pool of threads or processes, '
+        'logging per-queue throughput and latency. SIGINT/SIGTERM finish the running jobs, then exit.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queues', default='', help='Comma-separated queues to serve (default: all).')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--pool', choices=('thread', 'process'), default='thread')
+        parser.add_argument('--poll-interval', type=float, default=settings.JOBS_POLL_INTERVAL)
+        parser.add_argument('--stats-interval', type=float, default=60, help='Seconds between stats lines (0: never).')
+        parser.add_argument('--once', action='store_true', help='Exit once no job is ready.')
+        parser.add_argument('--worker-id', default=f'{socket.gethostname()}:{os.getpid()}')
+
+    def handle(self, *args, **options):
+        queues = [queue for queue in options['queues'].split(',') if queue]
+        concurrency = options['concurrency']
+        if options['pool'] == 'process':
+            # Pas de fork : les processus ne doivent pas hériter des connexions ouvertes.
+            pool = ProcessPoolExecutor(
+                concurrency, mp_context=multiprocessing.get_context('spawn'), initializer=_init_process
+            )
+        else:
+            pool = ThreadPoolExecutor(concurrency, thread_name_prefix='jobs')
+
+        stopping = []
+        handlers = {signum: signal.signal(signum, lambda *_: stopping.append(True))
+                    for signum in (signal.SIGINT, signal.SIGTERM)}
+
+        running = set()
+        maintenance = stats_at = time.monotonic()
+        completed = 0
+        self.stdout.write(f'Worker {options["worker_id"]}: {options["pool"]} pool of {concurrency}, '
+                          f'queues {", ".join(queues) or "all"}.')
+        with pool:
+            while not stopping:
+                now = time.monotonic()
+                if now - maintenance >= settings.JOBS_LEASE / 2:
+                    close_old_connections()
+                    requeue_stale()
+                    purge()
+                    maintenance = now
+                if options['stats_interval'] and now - stats_at >= options['stats_interval']:
+                    logger.info(json.dumps({'event': 'job_stats', 'worker': options['worker_id'],
+                                            'queues': queue_stats(window=options['stats_interval'])}))
+                    stats_at = now
+
+                ids = claim(options['worker_id'], concurrency - len(running), queues) if len(running) < concurrency else []
+                running.update(pool.submit(run_job, job_id) for job_id in ids)
+                if options['once'] and not running:
+                    break
+                if running:
+                    # Place libérée : réserver aussitôt ; sinon attendre au plus un intervalle.
+                    done, running = wait(running, timeout=0 if ids else options['poll_interval'],
+                                         return_when=FIRST_COMPLETED)
+                    completed += len(done)
+                    for future in done:
+                        if future.exception() is not None:
+                            # Erreur du worker lui-même (base indisponible...) : la réservation expirera.
+                            logger.error('Job runner failed', exc_info=future.exception())
+                elif not ids:
+                    time.sleep(options['poll_interval'])
+            if running:
+                done, _ = wait(running)
+                completed += len(done)
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS(f'Worker {options["worker_id"]} stopped after {completed} jobs.'))
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from shared.enums import JobStatus
+
+
+def default_max_attempts():
+    return settings.JOBS_MAX_ATTEMPTS
+
+
+class Job(models.Model):
+    """
+    One call of `task` (dotted path of a function) with JSON arguments,
+    claimed by `manage.py runworker` once `run_at` has passed.
+    """
+    queue = models.CharField(max_length=50, default='default')
+    task = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=JobStatus.choices, default=JobStatus.QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=default_max_attempts)
+    created_at = models.DateTimeField(default=timezone.now)
+    # Prochaine exécution possible (reculée à chaque nouvel essai)
+    run_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Réservation : worker et lot, jusqu'à `locked_until` (au-delà, la tâche est remise en file)
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Réservation : status = 'queued' AND queue IN (...) AND run_at <= :now ORDER BY run_at
+            models.Index(
+                fields=['queue', 'run_at'], condition=Q(status=JobStatus.QUEUED), name='job_ready_idx'
+            ),
+            # Réservations expirées (worker arrêté en cours de tâche)
+            models.Index(
+                fields=['locked_until'], condition=Q(status=JobStatus.RUNNING), name='job_running_idx'
+            ),
+            models.Index(fields=['locked_by'], name='job_locked_by_idx'),
+            # Statistiques par file et purge des tâches terminées
+            models.Index(fields=['queue', 'finished_at'], name='job_finished_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.task} [{self.queue}] {self.status}'
@@ -0,0 +1,166 @@
+import random
+import traceback
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Min, Subquery
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from shared.benchmark import percentile
+from shared.enums import JobStatus
+from .models import Job
+
+
+def task_path(task):
+    """Dotted path stored in Job.task for a module-level function (or a path already)."""
+    if isinstance(task, str):
+        return task
+    return f'{task.__module__}.{task.__qualname__}'
+
+
+def enqueue(task, *args, queue='default', run_at=None, max_attempts=None, **kwargs):
+    """
+    Queue `task(*args, **kwargs)` for a worker. Arguments must be JSON
+    serializable (pass ids, not model instances). The row belongs to the
+    current transaction: a rolled-back request leaves no job behind.
+    """
+    job = Job(queue=queue, task=task_path(task), args=list(args), kwargs=kwargs)
+    if run_at is not None:
+        job.run_at = run_at
+    if max_attempts is not None:
+        job.max_attempts = max_attempts
+    job.save()
+    return job
+
+
+def backoff(attempts):
+    """Delay before retry number `attempts`: exponential, capped, half-jittered."""
+    delay = min(settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1), settings.JOBS_RETRY_BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def claim(worker, limit, queues=None, now=None):
+    """
+    Reserve up to `limit` ready jobs for `worker`, oldest run_at first, and
+    return their ids. Concurrent workers never get the same job.
+    """
+    now = now or timezone.now()
+    token = f'{worker}:{uuid.uuid4().hex[:12]}'
+    ready = Job.objects.filter(status=JobStatus.QUEUED, run_at__lte=now)
+    if queues:
+        ready = ready.filter(queue__in=queues)
+    ready = ready.order_by('run_at', 'id')
+    changes = {
+        'status': JobStatus.RUNNING, 'locked_by': token, 'started_at': now,
+        'locked_until': now + timedelta(seconds=settings.JOBS_LEASE), 'attempts': F('attempts') + 1,
+    }
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            # Les lignes déjà verrouillées par un autre worker sont sautées, pas attendues.
+            ids = list(ready.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            Job.objects.filter(pk__in=ids).update(**changes)
+            return ids
+        # SQLite : pas de verrou de ligne, mais un seul écrivain ; un UPDATE ... WHERE id IN
+        # (SELECT ... LIMIT n) réserve le lot d'un coup, relu ensuite par son jeton.
+        Job.objects.filter(pk__in=Subquery(ready.values('pk')[:limit])).update(**changes)
+        return list(Job.objects.filter(locked_by=token).values_list('pk', flat=True))
+
+
+def execute(job_id):
+    """
+    Run a claimed job and record the outcome: DONE, QUEUED again after
+    backoff(attempts) while attempts remain, FAILED after the last one.
+    Returns (queue, status).
+    """
+    job = Job.objects.get(pk=job_id)
+    # Réservation expirée et reprise par un autre worker : ne pas écraser son résultat.
+    mine = Job.objects.filter(pk=job.pk, locked_by=job.locked_by, status=JobStatus.RUNNING)
+    # Début réel de l'exécution : un lot réservé d'un coup n'attend pas au chronomètre de la tâche.
+    started = timezone.now()
+    try:
+        import_string(job.task)(*job.args, **job.kwargs)
+    except Exception:
+        now = timezone.now()
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            status = JobStatus.QUEUED
+            mine.update(
+                status=status, run_at=now + backoff(job.attempts), started_at=started, last_error=error,
+                locked_by='', locked_until=None,
+            )
+        else:
+            status = JobStatus.FAILED
+            mine.update(status=status, started_at=started, finished_at=now, last_error=error, locked_until=None)
+        return job.queue, status
+    mine.update(status=JobStatus.DONE, started_at=started, finished_at=timezone.now(), locked_until=None)
+    return job.queue, JobStatus.DONE
+
+
+def requeue_stale(now=None):
+    """Jobs whose worker died mid-run (lease expired): queue them again, or fail the last attempt."""
+    now = now or timezone.now()
+    stale = Job.objects.filter(status=JobStatus.RUNNING, locked_until__lt=now)
+    error = 'Lease expired before the job finished.'
+    requeued = stale.filter(attempts__lt=F('max_attempts')).update(
+        status=JobStatus.QUEUED, run_at=now, locked_by='', locked_until=None, last_error=error
+    )
+    failed = stale.update(status=JobStatus.FAILED, finished_at=now, locked_until=None, last_error=error)
+    return requeued + failed
+
+
+def purge(now=None):
+    """Delete DONE jobs older than JOBS_RETENTION_DAYS (failed ones are kept for inspection)."""
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=settings.JOBS_RETENTION_DAYS)
+    return Job.objects.filter(status=JobStatus.DONE, finished_at__lt=cutoff).delete()[0]
+
+
+def run_pending(queues=None, worker='inline', batch_size=100):
+    """Claim and run ready jobs in the current thread until none are left; returns how many ran."""
+    ran = 0
+    while ids := claim(worker, batch_size, queues):
+        for job_id in ids:
+            execute(job_id)
+        ran += len(ids)
+    return ran
+
+
+def queue_stats(window=3600, now=None):
+    """
+    Per queue: jobs by status, age of the oldest ready job, and over the last
+    `window` seconds the finished jobs per minute, the wait (ready -> started)
+    and run time percentiles in milliseconds.
+    """
+    now = now or timezone.now()
+    stats = defaultdict(lambda: {'status': dict.fromkeys(JobStatus.values, 0)})
+    for queue, status, count in Job.objects.values_list('queue', 'status').annotate(count=Count('id')).order_by():
+        stats[queue]['status'][status] = count
+    ready = (
+        Job.objects.filter(status=JobStatus.QUEUED, run_at__lte=now)
+        .values_list('queue').annotate(oldest=Min('run_at')).order_by()
+    )
+    for queue, oldest in ready:
+        stats[queue]['lag_seconds'] = round((now - oldest).total_seconds(), 3)
+
+    waits, runs = defaultdict(list), defaultdict(list)
+    finished = Job.objects.filter(
+        finished_at__gte=now - timedelta(seconds=window), status__in=(JobStatus.DONE, JobStatus.FAILED)
+    ).values_list('queue', 'run_at', 'started_at', 'finished_at')
+    for queue, run_at, started_at, finished_at in finished.iterator(chunk_size=2000):
+        waits[queue].append(max(0.0, (started_at - run_at).total_seconds()))
+        runs[queue].append((finished_at - started_at).total_seconds())
+    for queue, durations in runs.items():
+        wait, run = sorted(waits[queue]), sorted(durations)
+        stats[queue].update({
+            'finished': len(run),
+            'per_minute': round(len(run) * 60 / window, 2),
+            'wait_p50_ms': round(percentile(wait, 0.5) * 1000, 3),
+            'wait_p95_ms': round(percentile(wait, 0.95) * 1000, 3),
+            'run_p50_ms': round(percentile(run, 0.5) * 1000, 3),
+            'run_p95_ms': round(percentile(run, 0.95) * 1000, 3),
+        })
+    return dict(stats)
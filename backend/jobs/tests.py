@@ -0,0 +1,119 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from clubs.models import Club
+from shared.enums import JobStatus, Role
+from users.models import CustomUser
+from .models import Job
+from .queue import claim, enqueue, execute, queue_stats, requeue_stale, run_pending
+
+calls = []
+
+
+def record(value, suffix=''):
+    calls.append(f'{value}{suffix}')
+
+
+def explode():
+    raise ValueError('boom')
+
+
+def lose_lease(job_id):
+    # Réservation expirée et reprise par un autre worker pendant l'exécution.
+    Job.objects.filter(pk=job_id).update(locked_by='other-worker')
+
+
+@override_settings(JOBS_MAX_ATTEMPTS=3, JOBS_RETRY_BACKOFF=10, JOBS_RETRY_BACKOFF_MAX=60)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueued_job_runs_with_its_arguments(self):
+        job = enqueue(record, 'a', suffix='!')
+        self.assertEqual(job.task, 'jobs.tests.record')
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, ['a!'])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (JobStatus.DONE, 1))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_claim_skips_future_claimed_and_other_queues(self):
+        ready = enqueue(record, 1)
+        enqueue(record, 2, run_at=timezone.now() + timedelta(hours=1))
+        enqueue(record, 3, queue='other')
+        self.assertEqual(claim('w1', 10, ['default']), [ready.pk])
+        self.assertEqual(claim('w2', 10, ['default']), [])
+
+    def test_failure_is_retried_with_backoff_then_failed(self):
+        job = enqueue(explode)
+        before = timezone.now()
+        for attempt in range(1, 3):
+            self.assertEqual(claim('w', 1), [job.pk])
+            self.assertEqual(execute(job.pk), ('default', JobStatus.QUEUED))
+            job.refresh_from_db()
+            self.assertEqual(job.attempts, attempt)
+            self.assertGreater(job.run_at, before)
+            self.assertIn('ValueError: boom', job.last_error)
+            self.assertEqual(claim('w', 1), [])
+            Job.objects.filter(pk=job.pk).update(run_at=before)
+        claim('w', 1)
+        self.assertEqual(execute(job.pk), ('default', JobStatus.FAILED))
+
+    def test_expired_lease_is_requeued(self):
+        job = enqueue(record, 'x')
+        claim('dead-worker', 1)
+        later = timezone.now() + timedelta(days=1)
+        self.assertEqual(requeue_stale(now=later), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (JobStatus.QUEUED, ''))
+
+    def test_late_worker_does_not_overwrite_the_new_owner(self):
+        job = enqueue(lose_lease)
+        Job.objects.filter(pk=job.pk).update(args=[job.pk])
+        claim('slow-worker', 1)
+        execute(job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (JobStatus.RUNNING, 'other-worker'))
+
+    def test_queue_stats_report_throughput_and_latency(self):
+        enqueue(record, 1)
+        enqueue(record, 2, queue='mail')
+        enqueue(explode, queue='mail', max_attempts=1)
+        run_pending()
+        enqueue(record, 3, queue='mail')
+        stats = queue_stats()
+        self.assertEqual(stats['default']['finished'], 1)
+        self.assertEqual(stats['mail']['status'][JobStatus.FAILED], 1)
+        self.assertEqual(stats['mail']['status'][JobStatus.QUEUED], 1)
+        self.assertIn('lag_seconds', stats['mail'])
+        self.assertIn('wait_p95_ms', stats['mail'])
+
+    def test_event_notifications_are_queued_and_delivered_by_the_worker(self):
+        coordinator = CustomUser.objects.create_user(username='coord', password='secret', role=Role.COORDINATOR)
+        club = Club.objects.create(name='Queue club', description='', coordinator=coordinator)
+        self.client.force_login(coordinator)
+        start = timezone.now() + timedelta(days=3)
+        response = self.client.post('/api/events/', {
+            'club': club.pk, 'title': 'Queued', 'description': 'Open to all', 'location': 'Room C',
+            'start_time': start.isoformat(), 'end_time': (start + timedelta(hours=1)).isoformat(),
+            'created_by': coordinator.pk,
+        })
+        self.assertEqual(response.status_code, 201)
+        job = Job.objects.get(queue='notifications')
+        self.assertEqual((job.task, job.args), ('notifications.fanout.event_created', [response.data['id']]))
+        self.assertEqual(run_pending(queues=['notifications']), 1)
+
+
+class RunWorkerTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_runworker_once_drains_the_queue(self):
+        enqueue(record, 'a')
+        enqueue(record, 'b')
+        call_command('runworker', '--once', '--pool', 'thread', '--concurrency', '1', stdout=StringIO())
+        self.assertEqual(sorted(calls), ['a', 'b'])
@@ -1,4 +1,9 @@
 from django.contrib import admin
 from .models import Membership
 
-admin.site.register(Membership)
+
+@admin.register(Membership)
+class MembershipAdmin(admin.ModelAdmin):
+    # __str__ lit user.username et club.name
+    list_select_related = ('user', 'club')
+    raw_id_fields = ('user', 'club')
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memberships", "0004_alter_membership_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="membership",
+            index=models.Index(
+                fields=["joined_at", "id"], name="membership_joined_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="membership",
+            index=models.Index(
+                fields=["club", "status"], name="membership_club_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="membership",
+            index=models.Index(
+                fields=["user", "status"], name="membership_user_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="membership",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["club", "joined_at"],
+                name="membership_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.20 on 2026-10-18 10:18
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_reviewed_at(apps, schema_editor):
+    # Au mieux : la dernière modification d'une adhésion déjà traitée.
+    Membership = apps.get_model("memberships", "Membership")
+    Membership.objects.exclude(status="pending").update(reviewed_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memberships", "0006_membership_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="membership",
+            name="reviewed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_reviewed_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="membership",
+            index=models.Index(fields=["updated_at"], name="membership_updated_idx"),
+        ),
+    ]
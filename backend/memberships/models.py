@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from users.models import CustomUser
 from clubs.models import Club
 from shared.enums import MembershipStatus, MembershipRole, Role
@@ -16,6 +17,9 @@ class Membership(models.Model):
         related_name='memberships'
     )
     joined_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Acceptation ou refus : latence de validation (statistiques du RVA)
+    reviewed_at = models.DateTimeField(null=True, blank=True)
     status = models.CharField(
         max_length=20,
         choices=MembershipStatus.choices,
@@ -32,6 +36,29 @@ class Membership(models.Model):
         verbose_name = 'Membership'
         verbose_name_plural = 'Memberships'
         ordering = ['joined_at']
+        indexes = [
+            # Ordre de la pagination keyset
+            models.Index(fields=['joined_at', 'id'], name='membership_joined_id_idx'),
+            models.Index(fields=['club', 'status'], name='membership_club_status_idx'),
+            models.Index(fields=['user', 'status'], name='membership_user_status_idx'),
+            # Lignes modifiées depuis le dernier rafraîchissement des statistiques
+            models.Index(fields=['updated_at'], name='membership_updated_idx'),
+            # File d'attente des demandes à valider (index partiel si supporté)
+            models.Index(
+                fields=['club', 'joined_at'],
+                condition=models.Q(status=MembershipStatus.PENDING),
+                name='membership_pending_idx',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        reviewed = self.status != MembershipStatus.PENDING
+        if reviewed != (self.reviewed_at is not None):
+            self.reviewed_at = timezone.now() if reviewed else None
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'reviewed_at'}
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return f"{self.user.username} in {self.club.name}"
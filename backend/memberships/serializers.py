@@ -1,8 +1,22 @@
 from rest_framework import serializers
 from .models import Membership
+from shared.enums import MembershipRole, MembershipStatus
+from shared.expansions import ExpandableFieldsMixin
+from shared.fieldsets import SparseFieldsetMixin
 
-class MembershipSerializer(serializers.ModelSerializer):
+class MembershipSerializer(SparseFieldsetMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Membership
         fields = ['id', 'user', 'club', 'role', 'status', 'joined_at']
-        read_only_fields = ['id', 'joined_at']
\ No newline at end of file
+        read_only_fields = ['id', 'joined_at']
+        expandable_fields = {
+            'user': 'users.serializers.UserSerializer',
+            'club': 'clubs.serializers.ClubSerializer',
+        }
+
+class MembershipBulkReviewSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=10000
+    )
+    status = serializers.ChoiceField(choices=[MembershipStatus.ACTIVE, MembershipStatus.REJECTED])
+    role = serializers.ChoiceField(choices=MembershipRole.choices, required=False)
@@ -1,3 +1,98 @@
-from django.test import TestCase
+import io
+import time
+import zipfile
 
-# Create your tests here.
+from clubs.models import Club
+from memberships.models import Membership
+from shared.enums import MembershipRole, MembershipStatus, Role
+from shared.testing import QueryBudgetTestCase
+from users.models import CustomUser
+
+
+class MembershipQueryBudgetTests(QueryBudgetTestCase):
+    def test_membership_endpoints_stay_within_query_budget(self):
+        self.assertEndpointBudgets({
+            '/api/memberships/': 2,
+            f'/api/memberships/by-club/{self.club.pk}/': 2,
+        })
+
+
+class MembershipConditionalGetTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.grow_to(10)
+        self.url = f'/api/memberships/by-club/{self.club.pk}/'
+
+    def test_unchanged_collection_answers_304_without_loading_rows(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        membership = Membership.objects.filter(club=self.club).first()
+        membership.status = MembershipStatus.REJECTED
+        membership.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class MembershipBulkReviewTests(QueryBudgetTestCase):
+    url = '/api/memberships/bulk-review/'
+
+    def test_reviews_thousands_of_requests_in_constant_queries(self):
+        self.grow_to(5000)
+        Membership.objects.update(status=MembershipStatus.PENDING)
+        ids = list(Membership.objects.values_list('pk', flat=True))
+        started = time.perf_counter()
+        with self.assertQueryBudget(6):
+            response = self.client.post(self.url, {
+                'ids': ids, 'status': MembershipStatus.ACTIVE, 'role': MembershipRole.DESIGNER,
+            }, format='json')
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(response.data['updated'], 5000)
+        self.assertFalse(Membership.objects.exclude(status=MembershipStatus.ACTIVE).exists())
+        self.assertFalse(Membership.objects.exclude(role=MembershipRole.DESIGNER).exists())
+
+    def test_reports_per_id_results(self):
+        self.grow_to(3)
+        pending, active, _ = Membership.objects.order_by('pk')
+        Membership.objects.filter(pk=pending.pk).update(status=MembershipStatus.PENDING)
+        outsider = CustomUser.objects.create_user(username='outsider', role=Role.COORDINATOR)
+        foreign = Membership.objects.create(
+            user=outsider,
+            club=Club.objects.create(name='Other', description='', coordinator=outsider),
+        )
+        response = self.client.post(self.url, {
+            'ids': [pending.pk, active.pk, foreign.pk, 999999], 'status': MembershipStatus.REJECTED,
+        }, format='json')
+        self.assertEqual(response.data['results'], [
+            {'id': pending.pk, 'result': 'updated'},
+            {'id': active.pk, 'result': 'not_pending'},
+            {'id': foreign.pk, 'result': 'forbidden'},
+            {'id': 999999, 'result': 'not_found'},
+        ])
+        self.assertEqual(Membership.objects.get(pk=foreign.pk).status, MembershipStatus.PENDING)
+
+
+class MembershipExportTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.grow_to(5)
+        self.url = f'/api/clubs/{self.club.pk}/members/export/'
+
+    def test_streams_csv_with_one_line_per_membership(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[0], 'membership_id')
+        self.assertEqual(len(lines), 6)
+
+    def test_streams_a_readable_xlsx_workbook(self):
+        response = self.client.get(self.url, {'type': 'xlsx'})
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+        self.assertEqual(sheet.count('<row>'), 6)
+
+    def test_rejects_unknown_type(self):
+        self.assertEqual(self.client.get(self.url, {'type': 'pdf'}).status_code, 400)
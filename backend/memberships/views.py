@@ -1,20 +1,129 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
+from clubs.models import Club
 from .models import Membership
-from .serializers import MembershipSerializer
+from .serializers import MembershipBulkReviewSerializer, MembershipSerializer
+from notifications.fanout import dispatch, memberships_reviewed
+from shared.compiled import CompiledListMixin
+from shared.conditional import bump_versions, conditional
+from shared.enums import MembershipStatus, Role
+from shared.exports import export_response
+from shared.expansions import ExpandableViewMixin
+from shared.fieldsets import SparseFieldsetViewMixin
 
-class MembershipViewSet(viewsets.ModelViewSet):
+# Projection jointe utilisateur / club des exports d'adhésions
+MEMBER_EXPORT_FIELDS = (
+    'pk', 'user__username', 'user__first_name', 'user__last_name', 'user__email',
+    'club_id', 'club__name', 'role', 'status', 'joined_at',
+)
+MEMBER_EXPORT_HEADER = (
+    'membership_id', 'username', 'first_name', 'last_name', 'email',
+    'club_id', 'club', 'role', 'status', 'joined_at',
+)
+
+class MembershipViewSet(
+    SparseFieldsetViewMixin, ExpandableViewMixin, CompiledListMixin, viewsets.ModelViewSet
+):
     queryset = Membership.objects.all()
     serializer_class = MembershipSerializer
     permission_classes = [permissions.IsAuthenticated]
+    compiled_actions = ('list', 'by_club')
+
+    @conditional(lambda request, **kwargs: ['memberships'])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional(lambda request, **kwargs: [], model=Membership)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        was_pending = serializer.instance.status == MembershipStatus.PENDING
+        membership = serializer.save()
+        if was_pending and membership.status != MembershipStatus.PENDING:
+            dispatch(memberships_reviewed, [membership.pk])
 
     @action(detail=False, methods=['get'], url_path='by-club/(?P<club_id>[^/.]+)')
+    @conditional(lambda request, club_id=None, **kwargs: [f'memberships:club:{club_id}'])
     def by_club(self, request, club_id=None):
-        memberships = self.queryset.filter(club_id=club_id)
+        memberships = self.filter_queryset(self.get_queryset()).filter(club_id=club_id)
         page = self.paginate_queryset(memberships)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(memberships, many=True)
         return Response(serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='bulk-review')
+    def bulk_review(self, request):
+        """
+        Approve or reject many pending memberships at once.
+
+        Body: {"ids": [...], "status": "active" | "rejected", "role": optional}.
+        Ownership is checked for every id with one joined SELECT ... FOR UPDATE,
+        then all reviewable rows are changed by a single UPDATE in the same
+        transaction. Each id gets a result: updated, not_found, forbidden or
+        not_pending.
+        """
+        serializer = MembershipBulkReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        ids = list(dict.fromkeys(data['ids']))
+        is_rva = request.user.role == Role.STUDENT_LIFE_OFFICER
+
+        results = dict.fromkeys(ids, 'not_found')
+        reviewable, club_ids = [], set()
+        with transaction.atomic():
+            rows = (
+                Membership.objects.select_for_update(of=('self',))
+                .filter(pk__in=ids)
+                .values_list('pk', 'club_id', 'status', 'club__coordinator_id')
+            )
+            for pk, club_id, status, coordinator_id in rows:
+                if not (is_rva or coordinator_id == request.user.id):
+                    results[pk] = 'forbidden'
+                elif status != MembershipStatus.PENDING:
+                    results[pk] = 'not_pending'
+                else:
+                    results[pk] = 'updated'
+                    reviewable.append(pk)
+                    club_ids.add(club_id)
+
+            if reviewable:
+                now = timezone.now()
+                changes = {'status': data['status'], 'updated_at': now, 'reviewed_at': now}
+                if 'role' in data:
+                    changes['role'] = data['role']
+                Membership.objects.filter(pk__in=reviewable).update(**changes)
+                # update() n'émet pas de signaux : versions et compteurs à la main.
+                bump_versions('memberships', *(f'memberships:club:{club_id}' for club_id in club_ids))
+                if settings.CLUB_COUNTERS_DENORMALIZED:
+                    Club.objects.filter(pk__in=club_ids).refresh_counters()
+                dispatch(memberships_reviewed, reviewable)
+
+        return Response({
+            'updated': len(reviewable),
+            'results': [{'id': pk, 'result': result} for pk, result in results.items()],
+        })
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Campus-wide membership export for the RVA, streamed as CSV or XLSX
+        (?type=); ?club= narrows it to one club.
+        """
+        if request.user.role != Role.STUDENT_LIFE_OFFICER:
+            raise PermissionDenied('Only the student life officer can export all memberships.')
+        memberships = Membership.objects.order_by('pk')
+        club = request.query_params.get('club')
+        if club:
+            if not club.isdigit():
+                raise ValidationError({'club': 'Expected a club id.'})
+            memberships = memberships.filter(club_id=int(club))
+        rows = memberships.values_list(*MEMBER_EXPORT_FIELDS).iterator(chunk_size=2000)
+        return export_response(request, 'memberships', MEMBER_EXPORT_HEADER, rows)
@@ -0,0 +1,115 @@
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from clubs.models import ClubCreationRequest
+from events.models import Event
+from jobs.queue import enqueue
+from memberships.models import Membership
+from shared.enums import MembershipStatus, NotificationKind, RequestStatus
+from .models import Notification
+
+
+def dispatch(task, *args):
+    """
+    Run `task(*args)` outside the request: as a job on the 'notifications'
+    queue (see `manage.py runworker`), or inline once the transaction commits
+    when NOTIFICATIONS_ASYNC is off. Tasks take ids and re-read what they need.
+    """
+    if settings.NOTIFICATIONS_ASYNC:
+        enqueue(task, *args, queue='notifications')
+    else:
+        transaction.on_commit(lambda: task(*args))
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def notify_club(club_id, kind, message, event_id=None, exclude_user_id=None):
+    """
+    Notify the active members of a club. Up to NOTIFICATIONS_FANOUT_ON_READ_THRESHOLD
+    members, one row per member in bulk_create batches; above, a single broadcast
+    row that inboxes pick up at read time. Returns the number of rows written.
+    """
+    members = Membership.objects.filter(club_id=club_id, status=MembershipStatus.ACTIVE)
+    if members.count() > settings.NOTIFICATIONS_FANOUT_ON_READ_THRESHOLD:
+        Notification.objects.create(
+            club_id=club_id, event_id=event_id, kind=kind, message=message, excluded_user_id=exclude_user_id
+        )
+        return 1
+    if exclude_user_id is not None:
+        members = members.exclude(user_id=exclude_user_id)
+    batch_size = settings.NOTIFICATIONS_BATCH_SIZE
+    written = 0
+    recipients = members.values_list('user_id', flat=True).iterator(chunk_size=batch_size)
+    for chunk in _chunks(recipients, batch_size):
+        Notification.objects.bulk_create(
+            Notification(
+                recipient_id=user_id, club_id=club_id, event_id=event_id, kind=kind, message=message
+            )
+            for user_id in chunk
+        )
+        written += len(chunk)
+    return written
+
+
+def event_created(event_id):
+    return events_created([event_id])
+
+
+def events_created(event_ids):
+    """Notify each event's club of its creation (bulk imports pass a whole batch)."""
+    rows = Event.objects.filter(pk__in=event_ids).order_by('pk').values(
+        'pk', 'club_id', 'club__name', 'title', 'created_by_id'
+    )
+    return sum(
+        notify_club(
+            event['club_id'], NotificationKind.EVENT_CREATED,
+            f'{event["club__name"]}: new event "{event["title"]}".',
+            event_id=event['pk'], exclude_user_id=event['created_by_id'],
+        )
+        for event in rows
+    )
+
+
+def memberships_reviewed(membership_ids):
+    rows = (
+        Membership.objects.filter(pk__in=membership_ids)
+        .exclude(status=MembershipStatus.PENDING)
+        .values_list('user_id', 'club_id', 'club__name', 'status')
+    )
+    verdicts = {MembershipStatus.ACTIVE: 'accepted', MembershipStatus.REJECTED: 'rejected'}
+    notifications = Notification.objects.bulk_create(
+        (
+            Notification(
+                recipient_id=user_id, club_id=club_id, kind=NotificationKind.MEMBERSHIP_REVIEWED,
+                message=f'Your membership in {club_name} was {verdicts[status]}.',
+            )
+            for user_id, club_id, club_name, status in rows
+        ),
+        batch_size=settings.NOTIFICATIONS_BATCH_SIZE,
+    )
+    return len(notifications)
+
+
+def club_requests_reviewed(request_ids):
+    rows = (
+        ClubCreationRequest.objects.filter(pk__in=request_ids)
+        .exclude(status=RequestStatus.PENDING)
+        .values_list('coordinator_id', 'club__id', 'club_name', 'status')
+    )
+    notifications = Notification.objects.bulk_create(
+        (
+            Notification(
+                recipient_id=coordinator_id, club_id=club_id, kind=NotificationKind.CLUB_REQUEST_REVIEWED,
+                message=f'Your request to create {club_name} was {status}.',
+            )
+            for coordinator_id, club_id, club_name, status in rows
+        ),
+        batch_size=settings.NOTIFICATIONS_BATCH_SIZE,
+    )
+    return len(notifications)
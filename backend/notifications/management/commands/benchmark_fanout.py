@@ -0,0 +1,81 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clubs.models import Club
+from memberships.models import Membership
+from jobs.queue import queue_stats, run_pending
+from notifications.models import Notification
+from shared.benchmark import benchmark_database, summarize
+from shared.enums import MembershipStatus, Role
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        'Time POST /api/events/ for clubs of growing size, with the notification '
+        'fan-out inline in the request and then queued as a job, then run the '
+        'queued fan-out jobs and report their throughput and latency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,1000,5000,20000')
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        with benchmark_database():
+            created = 0
+            for size in sizes:
+                coordinator = CustomUser.objects.create_user(
+                    username=f'bench-coordinator-{size}', password='bench', role=Role.COORDINATOR
+                )
+                club = Club.objects.create(name=f'Bench {size}', description='', coordinator=coordinator)
+                members = CustomUser.objects.bulk_create(
+                    CustomUser(username=f'bench-{size}-{i}', password='!', role=Role.MEMBER) for i in range(size)
+                )
+                Membership.objects.bulk_create(
+                    (Membership(user=user, club=club, status=MembershipStatus.ACTIVE) for user in members),
+                    batch_size=5000,
+                )
+                client = APIClient()
+                client.force_authenticate(coordinator)
+                for mode, asynchronous in (('inline', False), ('queued', True)):
+                    latencies = []
+                    with override_settings(NOTIFICATIONS_ASYNC=asynchronous):
+                        started = time.perf_counter()
+                        for _ in range(options['iterations']):
+                            created += 1
+                            begins = timezone.now() + timedelta(days=30, hours=created)
+                            t0 = time.perf_counter()
+                            response = client.post('/api/events/', {
+                                'club': club.pk, 'title': f'Bench {created}', 'description': 'Benchmark',
+                                'location': f'Bench room {created}', 'created_by': coordinator.pk,
+                                'start_time': begins.isoformat(),
+                                'end_time': (begins + timedelta(hours=1)).isoformat(),
+                            })
+                            latencies.append(time.perf_counter() - t0)
+                            assert response.status_code == 201, response.data
+                        elapsed = time.perf_counter() - started
+                    summary = summarize(latencies, elapsed)
+                    self.stdout.write(
+                        f'{size:>6} members  {mode:<6}  p50 {summary["p50_ms"]:8.2f} ms  '
+                        f'p95 {summary["p95_ms"]:8.2f} ms'
+                    )
+                    if asynchronous:
+                        # Les tâches en file s'exécutent ici, hors chronomètre, comme le ferait runworker.
+                        started = time.perf_counter()
+                        ran = run_pending(queues=['notifications'])
+                        self.stdout.write(
+                            f'{size:>6} members  worker  {ran} jobs in {time.perf_counter() - started:.2f} s'
+                        )
+            stats = queue_stats().get('notifications', {})
+            self.stdout.write(
+                f'notifications queue: {stats.get("finished", 0)} jobs, run p50 {stats.get("run_p50_ms", 0):.2f} ms, '
+                f'p95 {stats.get("run_p95_ms", 0):.2f} ms'
+            )
+            self.stdout.write(f'{Notification.objects.count()} notification rows written.')
@@ -0,0 +1,92 @@
+from django.db import models
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from clubs.models import Club
+from events.models import Event
+from memberships.models import Membership
+from shared.enums import MembershipStatus, NotificationKind
+from users.models import CustomUser
+
+
+class NotificationQuerySet(models.QuerySet):
+    def inbox(self, user):
+        """
+        The notifications `user` sees: their own rows, plus the broadcasts of
+        the clubs they are an active member of, from the day they were
+        accepted (not excluding them). Each row is annotated with `seen_at`,
+        when `user` read it (or None).
+        """
+        inbox = Q(recipient=user)
+        clubs = Membership.objects.filter(user=user, status=MembershipStatus.ACTIVE)
+        # Accepté après une attente : les annonces envoyées pendant l'attente ne le concernent pas.
+        since = Coalesce('reviewed_at', 'joined_at')
+        for club_id, member_since in clubs.values_list('club_id', since):
+            inbox |= Q(recipient=None, club_id=club_id, created_at__gte=member_since) & ~Q(excluded_user=user)
+        receipts = NotificationRead.objects.filter(notification=OuterRef('pk'), user=user)
+        return self.filter(inbox).annotate(
+            seen_at=Coalesce('read_at', models.Subquery(receipts.values('read_at')[:1]))
+        )
+
+    def unread(self, user):
+        """inbox(user) restricted to the notifications `user` has not read."""
+        receipts = NotificationRead.objects.filter(notification=OuterRef('pk'), user=user)
+        return self.inbox(user).filter(read_at=None).exclude(Exists(receipts))
+
+
+class Notification(models.Model):
+    # Sans destinataire : annonce d'un club trop grand pour une ligne par membre,
+    # distribuée à la lecture (voir NotificationQuerySet.inbox).
+    recipient = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='notifications'
+    )
+    club = models.ForeignKey(Club, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    # Annonce : membre qui ne la reçoit pas (l'auteur de l'événement, par exemple).
+    excluded_user = models.ForeignKey(
+        CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    kind = models.CharField(max_length=30, choices=NotificationKind.choices)
+    message = models.CharField(max_length=255)
+    created_at = models.DateTimeField(default=timezone.now)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    objects = NotificationQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Notification'
+        verbose_name_plural = 'Notifications'
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Boîte de réception paginée (keyset) d'un utilisateur
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notification_inbox_idx'),
+            models.Index(
+                fields=['recipient'], condition=Q(read_at=None), name='notification_unread_idx'
+            ),
+            models.Index(
+                fields=['club', '-created_at'], condition=Q(recipient=None),
+                name='notification_broadcast_idx',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class NotificationRead(models.Model):
+    """A member having read a club broadcast (broadcast rows have no read_at of their own)."""
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='reads')
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='+')
+    read_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Notification Read'
+        verbose_name_plural = 'Notification Reads'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'notification'], name='notificationread_uniq'),
+        ]
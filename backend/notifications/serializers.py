@@ -0,0 +1,12 @@
+from rest_framework import serializers
+from .models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    # Lu pour l'utilisateur courant (annonces de club comprises), voir Notification.objects.inbox
+    read_at = serializers.DateTimeField(source='seen_at', read_only=True)
+
+    class Meta:
+        model = Notification
+        fields = ['id', 'kind', 'message', 'club', 'event', 'created_at', 'read_at']
+        read_only_fields = fields
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+
+from memberships.models import Membership
+from shared.enums import MembershipStatus, NotificationKind, Role
+from shared.testing import QueryBudgetTestCase
+from users.models import CustomUser
+from .models import Notification
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False, NOTIFICATIONS_FANOUT_ON_READ_THRESHOLD=5)
+class NotificationTests(QueryBudgetTestCase):
+    def create_event(self, title='Robotics night', days=3):
+        start = timezone.now() + timedelta(days=days)
+        self.client.force_authenticate(self.coordinator)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/events/', {
+                'club': self.club.pk, 'title': title, 'description': 'Open to all', 'location': 'Room B',
+                'start_time': start.isoformat(), 'end_time': (start + timedelta(hours=1)).isoformat(),
+                'created_by': self.coordinator.pk,
+            })
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def inbox(self, user, **params):
+        self.client.force_authenticate(user)
+        return self.client.get('/api/notifications/', params).data
+
+    def test_event_creation_fans_out_to_active_members(self):
+        self.grow_to(3)
+        pending = CustomUser.objects.create_user(username='pending', password='secret', role=Role.MEMBER)
+        Membership.objects.create(user=pending, club=self.club)
+        event_id = self.create_event()
+        self.assertEqual(Notification.objects.filter(event_id=event_id, recipient__isnull=False).count(), 3)
+
+        member = CustomUser.objects.get(username='member00000')
+        inbox = self.inbox(member)
+        self.assertEqual(inbox['unread'], 1)
+        self.assertEqual(inbox['results'][0]['kind'], NotificationKind.EVENT_CREATED)
+        self.assertIsNone(inbox['results'][0]['read_at'])
+        self.assertEqual(self.inbox(pending)['results'], [])
+
+        self.client.force_authenticate(member)
+        notification = inbox['results'][0]['id']
+        self.assertEqual(self.client.post(f'/api/notifications/{notification}/read/').data['unread'], 0)
+        self.assertIsNotNone(self.inbox(member)['results'][0]['read_at'])
+        self.assertEqual(self.inbox(member, unread='true')['results'], [])
+
+    def test_large_clubs_get_one_broadcast_read_per_member(self):
+        self.grow_to(6)
+        self.create_event()
+        broadcast = Notification.objects.get()
+        self.assertIsNone(broadcast.recipient_id)
+
+        first, second = CustomUser.objects.filter(username__in=['member00000', 'member00001'])
+        self.assertEqual(self.inbox(first)['unread'], 1)
+        self.client.post('/api/notifications/read-all/')
+        self.assertEqual(self.client.get('/api/notifications/unread-count/').data['unread'], 0)
+        self.assertEqual(self.inbox(second)['unread'], 1)
+
+        # Arrivé après l'annonce : il ne la voit pas.
+        late = CustomUser.objects.create_user(username='late', password='secret', role=Role.MEMBER)
+        Membership.objects.create(user=late, club=self.club, status=MembershipStatus.ACTIVE)
+        self.assertEqual(self.inbox(late)['results'], [])
+
+    def test_broadcasts_skip_the_event_author(self):
+        self.grow_to(6)
+        Membership.objects.create(user=self.coordinator, club=self.club, status=MembershipStatus.ACTIVE)
+        self.create_event()
+        self.assertIsNone(Notification.objects.get().recipient_id)
+        self.assertEqual(self.inbox(self.coordinator)['results'], [])
+        member = CustomUser.objects.get(username='member00000')
+        self.assertEqual(self.inbox(member)['unread'], 1)
+
+    def test_broadcasts_sent_while_pending_stay_hidden_once_accepted(self):
+        self.grow_to(6)
+        joiner = CustomUser.objects.create_user(username='joiner', password='secret', role=Role.MEMBER)
+        membership = Membership.objects.create(user=joiner, club=self.club)
+        self.create_event('While pending')
+        membership.status = MembershipStatus.ACTIVE
+        membership.save()
+        self.assertEqual(self.inbox(joiner)['results'], [])
+        self.create_event('Once accepted', days=4)
+        self.assertEqual([row['message'] for row in self.inbox(joiner)['results']],
+                         [f'{self.club.name}: new event "Once accepted".'])
+
+    def test_membership_review_notifies_the_member(self):
+        joiner = CustomUser.objects.create_user(username='joiner', password='secret', role=Role.MEMBER)
+        membership = Membership.objects.create(user=joiner, club=self.club)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/memberships/bulk-review/', {
+                'ids': [membership.pk], 'status': MembershipStatus.ACTIVE,
+            }, format='json')
+        self.assertEqual(response.data['updated'], 1)
+        inbox = self.inbox(joiner)
+        self.assertEqual(inbox['results'][0]['kind'], NotificationKind.MEMBERSHIP_REVIEWED)
+        self.assertIn('accepted', inbox['results'][0]['message'])
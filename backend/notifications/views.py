@@ -0,0 +1,63 @@
+from django.utils import timezone
+from rest_framework import mixins, permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from events.filters import FALSE_VALUES, TRUE_VALUES
+from shared.compiled import CompiledListMixin
+from .models import Notification, NotificationRead
+from .serializers import NotificationSerializer
+
+
+class NotificationViewSet(CompiledListMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    The current user's inbox, newest first. ?unread=true lists unread
+    notifications only; list responses carry the unread count.
+    """
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    compiled_actions = ('list',)
+
+    def get_queryset(self):
+        notifications = Notification.objects.inbox(self.request.user)
+        unread = self.request.query_params.get('unread', '').lower()
+        if unread in TRUE_VALUES:
+            notifications = notifications.filter(seen_at=None)
+        elif unread in FALSE_VALUES:
+            notifications = notifications.exclude(seen_at=None)
+        elif unread:
+            raise ValidationError({'unread': 'Expected true or false.'})
+        return notifications
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        response.data['unread'] = Notification.objects.unread(request.user).count()
+        return response
+
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        """Number of unread notifications, for the inbox badge."""
+        return Response({'unread': Notification.objects.unread(request.user).count()})
+
+    @action(detail=True, methods=['post'], url_path='read')
+    def read(self, request, pk=None):
+        notification = self.get_object()
+        if notification.recipient_id is None:
+            NotificationRead.objects.get_or_create(notification=notification, user=request.user)
+        elif notification.read_at is None:
+            notification.read_at = timezone.now()
+            notification.save(update_fields=['read_at'])
+        return Response({'unread': Notification.objects.unread(request.user).count()})
+
+    @action(detail=False, methods=['post'], url_path='read-all')
+    def read_all(self, request):
+        """Mark the whole inbox as read."""
+        now = timezone.now()
+        marked = Notification.objects.filter(recipient=request.user, read_at=None).update(read_at=now)
+        broadcasts = Notification.objects.unread(request.user).filter(recipient=None).values_list('pk', flat=True)
+        receipts = NotificationRead.objects.bulk_create(
+            [NotificationRead(notification_id=pk, user=request.user, read_at=now) for pk in broadcasts],
+            ignore_conflicts=True,
+        )
+        return Response({'marked': marked + len(receipts), 'unread': 0})
@@ -0,0 +1,198 @@
+import functools
+
+from django.db import connection, connections
+from django.db.models import Q, Sum
+
+from shared.enums import DocumentKind
+from .models import SearchDocument, SearchTerm
+
+FTS_TABLE = 'search_searchdocument_fts'
+TITLE_WEIGHT = 10
+BODY_WEIGHT = 1
+# Au-delà, seul ce nombre de correspondances par type est classé (termes très
+# fréquents) : le coût du classement reste borné quelle que soit la table.
+RANKED_CANDIDATES = 1000
+RESULT_COLUMNS = 'd.id, d.kind, d.object_id, d.title, d.body'
+
+
+def _union_by_kind(select, kind, limit):
+    """
+    Best `limit` hits of each kind (`select(kind)` -> (sql, params)), merged by
+    rank in one query: clubs are never crowded out by the far more numerous events.
+    """
+    parts, params = [], []
+    for value in [kind] if kind else DocumentKind.values:
+        sql, select_params = select(value)
+        parts.append(f'SELECT * FROM ({sql} ORDER BY rank DESC, id DESC LIMIT %s) AS hits_{value}')
+        params += [*select_params, limit]
+    sql = ' UNION ALL '.join(parts) + ' ORDER BY rank DESC, id DESC LIMIT %s'
+    return list(SearchDocument.objects.raw(sql, [*params, limit]))
+
+
+class PostgresBackend:
+    """Generated tsvector column with a GIN index, ranked by ts_rank."""
+    maintains_terms = False
+
+    def search(self, terms, kind=None, limit=20):
+        words = ' & '.join(f"'{term}':*AB" if len(term) > 1 else f"'{term}':AB" for term in terms)
+        # Poids {D, C, B, A} : le type (D) sert de filtre sans compter dans le score.
+        weights = f"'{{0, 0, {BODY_WEIGHT / TITLE_WEIGHT}, 1}}'::float4[]"
+        rank = f'SELECT {RESULT_COLUMNS}, ts_rank({weights}, d.search_vector, q) AS rank '
+
+        def select(value):
+            if value == DocumentKind.CLUB:
+                # Peu de clubs : le type est filtré dans l'index et tous sont classés.
+                query = f"'{value}':D & ({words})"
+                sql = rank + (
+                    "FROM search_searchdocument d, to_tsquery('simple'::regconfig, %s) q "
+                    'WHERE d.search_vector @@ q'
+                )
+                return sql, [query]
+            sql = rank + (
+                "FROM search_searchdocument d, to_tsquery('simple'::regconfig, %s) q "
+                'WHERE d.kind = %s AND d.id IN (SELECT id FROM search_searchdocument '
+                "WHERE search_vector @@ to_tsquery('simple'::regconfig, %s) LIMIT %s)"
+            )
+            return sql, [words, value, words, RANKED_CANDIDATES]
+        return _union_by_kind(select, kind, limit)
+
+    def optimize(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE search_searchdocument')
+
+
+class SQLiteFTSBackend:
+    """
+    FTS5 external-content table kept in sync by triggers. Selective queries
+    are ranked by bm25(); when more than RANKED_CANDIDATES documents match,
+    bm25() alone costs several milliseconds (document frequencies over the
+    whole doclist), so hits are ranked by where the terms occur instead.
+    """
+    maintains_terms = False
+
+    def search(self, terms, kind=None, limit=20):
+        # La colonne kind est indexée : la requête ne porte que sur titre et corps.
+        words = '{title_terms body_terms} : (%s)' % ' '.join(
+            f'"{term}"*' if len(term) > 1 else f'"{term}"' for term in terms
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM (SELECT 1 FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s LIMIT %s)',
+                [words, RANKED_CANDIDATES + 1],
+            )
+            broad = cursor.fetchone()[0] > RANKED_CANDIDATES
+        if broad:
+            select = functools.partial(self.select_broad, words, terms)
+        else:
+            select = functools.partial(self.select_ranked, words)
+        return _union_by_kind(select, kind, limit)
+
+    def select_ranked(self, words, value):
+        rank = f'-bm25({FTS_TABLE}, 0.0, {TITLE_WEIGHT}.0, {BODY_WEIGHT}.0) AS rank'
+        if value == DocumentKind.CLUB:
+            # Peu de clubs : filtrer le type dans l'index est le plus rapide.
+            sql = (
+                f'SELECT {RESULT_COLUMNS}, {rank} FROM {FTS_TABLE} '
+                f'JOIN search_searchdocument d ON d.id = {FTS_TABLE}.rowid WHERE {FTS_TABLE} MATCH %s'
+            )
+            return sql, [f'kind : {value} AND {words}']
+        # CROSS JOIN : parcourir les correspondances FTS, puis lire chaque document.
+        sql = (
+            f'SELECT {RESULT_COLUMNS}, {rank} FROM {FTS_TABLE} '
+            f'CROSS JOIN search_searchdocument d ON d.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND d.kind = %s'
+        )
+        return sql, [words, value]
+
+    def select_broad(self, words, terms, value):
+        rank, rank_params = _occurrence_rank(terms)
+        if value == DocumentKind.CLUB:
+            # Parcourir les clubs (index kind, object_id) et tester chacun dans l'index FTS.
+            sql = (
+                f'SELECT {RESULT_COLUMNS}, {rank} AS rank FROM search_searchdocument d '
+                f'CROSS JOIN {FTS_TABLE} ON {FTS_TABLE}.rowid = d.id '
+                f'WHERE d.kind = %s AND {FTS_TABLE} MATCH %s'
+            )
+            return sql, [*rank_params, value, words]
+        # Les RANKED_CANDIDATES correspondances les plus récentes (rowid décroissant).
+        floor = (
+            f'COALESCE((SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            'ORDER BY rowid DESC LIMIT 1 OFFSET %s), 0)'
+        )
+        sql = (
+            f'SELECT {RESULT_COLUMNS}, {rank} AS rank FROM {FTS_TABLE} '
+            f'CROSS JOIN search_searchdocument d ON d.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid >= {floor} AND d.kind = %s'
+        )
+        return sql, [*rank_params, words, words, RANKED_CANDIDATES - 1, value]
+
+    def optimize(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def _occurrence_rank(terms):
+    """SQL score: TITLE_WEIGHT per term found in the title, BODY_WEIGHT per term found in the body."""
+    parts, params = [], []
+    for term in terms:
+        # Début d'un mot : les termes sont séparés par des espaces ; '_' est un joker de LIKE.
+        pattern = '% ' + term.replace('_', '\\_') + '%'
+        for column, weight in (('title_terms', TITLE_WEIGHT), ('body_terms', BODY_WEIGHT)):
+            parts.append(f"CASE WHEN ' ' || d.{column} LIKE %s ESCAPE '\\' THEN {weight} ELSE 0 END")
+            params.append(pattern)
+    return '(' + ' + '.join(parts) + ')', params
+
+
+class InvertedIndexBackend:
+    """
+    Portable fallback: SearchTerm rows written alongside each document,
+    matched with `term LIKE 'prefix%'` on the (term, document) index.
+    """
+    maintains_terms = True
+
+    def search(self, terms, kind=None, limit=20):
+        documents = SearchDocument.objects.only('id', 'kind', 'object_id', 'title', 'body')
+        if kind:
+            documents = documents.filter(kind=kind)
+        matched = Q()
+        for term in terms:
+            # Chaque terme de la requête doit correspondre (ET).
+            documents = documents.filter(
+                pk__in=SearchTerm.objects.filter(term__startswith=term).values('document_id')
+            )
+            matched |= Q(terms__term__startswith=term)
+        documents = documents.annotate(rank=Sum('terms__weight', filter=matched))
+        return list(documents.order_by('-rank', '-pk')[:limit])
+
+    def optimize(self, connection):
+        pass
+
+
+def get_backend(using='default'):
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        return PostgresBackend()
+    if connection.vendor == 'sqlite' and has_fts_table(connection):
+        return SQLiteFTSBackend()
+    return InvertedIndexBackend()
+
+
+_fts_tables = {}
+
+
+def has_fts_table(connection):
+    # La migration 0002 ne crée la table FTS5 que si SQLite a été compilé avec.
+    key = (connection.alias, connection.settings_dict['NAME'])
+    if key not in _fts_tables:
+        with connection.cursor() as cursor:
+            _fts_tables[key] = FTS_TABLE in connection.introspection.table_names(cursor)
+    return _fts_tables[key]
+
+
+def document_terms(document):
+    """SearchTerm rows of a saved document: one per distinct term, title hits weigh more."""
+    weights = {}
+    for field, weight in (('title_terms', TITLE_WEIGHT), ('body_terms', BODY_WEIGHT)):
+        for term in getattr(document, field).split():
+            weights[term] = weights.get(term, 0) + weight
+    return [SearchTerm(term=term, document_id=document.pk, weight=weight) for term, weight in weights.items()]
@@ -0,0 +1,104 @@
+from django.db import connection, transaction
+
+from clubs.models import Club
+from events.models import Event
+from shared.enums import DocumentKind
+from .backends import document_terms, get_backend
+from .models import SearchDocument, SearchTerm
+from .text import tokenize
+
+INDEXED_FIELDS = ('title', 'body', 'title_terms', 'body_terms')
+
+
+def club_document(club):
+    return SearchDocument(title=club.name, body=club.description)
+
+
+def event_document(event):
+    return SearchDocument(title=event.title, body='\n'.join(filter(None, [event.location, event.description])))
+
+
+# modèle -> (kind, fonction qui construit le document)
+INDEXED_MODELS = {
+    Club: (DocumentKind.CLUB, club_document),
+    Event: (DocumentKind.EVENT, event_document),
+}
+
+
+def build_document(instance):
+    kind, build = INDEXED_MODELS[type(instance)]
+    document = build(instance)
+    document.kind = kind
+    document.object_id = instance.pk
+    document.title_terms = ' '.join(tokenize(document.title))
+    document.body_terms = ' '.join(tokenize(document.body))
+    return document
+
+
+def index_objects(objects):
+    """
+    Create or update the search documents of `objects` (instances of one
+    indexed model) with a constant number of queries. Objects without a
+    primary key are skipped: bulk_create only returns keys on some backends,
+    `manage.py rebuild_search_index` picks those rows up.
+    """
+    documents = [build_document(obj) for obj in objects if obj.pk is not None]
+    if not documents:
+        return 0
+    kind = documents[0].kind
+    backend = get_backend()
+    with transaction.atomic():
+        existing = dict(
+            SearchDocument.objects.filter(kind=kind, object_id__in=[doc.object_id for doc in documents])
+            .values_list('object_id', 'pk')
+        )
+        for document in documents:
+            document.pk = existing.get(document.object_id)
+        updated = [document for document in documents if document.pk is not None]
+        created = [document for document in documents if document.pk is None]
+        if updated:
+            SearchDocument.objects.bulk_update(updated, INDEXED_FIELDS)
+        if created:
+            SearchDocument.objects.bulk_create(created)
+        if backend.maintains_terms:
+            replace_terms(kind, documents, existing)
+    return len(documents)
+
+
+def replace_terms(kind, documents, existing):
+    SearchTerm.objects.filter(document_id__in=existing.values()).delete()
+    if any(document.pk is None for document in documents):
+        # bulk_create n'a pas renvoyé les clés (MySQL...) : les relire.
+        keys = dict(
+            SearchDocument.objects.filter(kind=kind, object_id__in=[doc.object_id for doc in documents])
+            .values_list('object_id', 'pk')
+        )
+        for document in documents:
+            document.pk = keys[document.object_id]
+    SearchTerm.objects.bulk_create(
+        [term for document in documents for term in document_terms(document)], batch_size=5000
+    )
+
+
+def remove_objects(model, object_ids):
+    kind, _ = INDEXED_MODELS[model]
+    SearchDocument.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def rebuild(batch_size=2000):
+    """Reindex every club and event in one transaction; returns {kind: count}."""
+    counts = {}
+    with transaction.atomic():
+        SearchTerm.objects.all().delete()
+        SearchDocument.objects.all().delete()
+        for model, (kind, _) in INDEXED_MODELS.items():
+            counts[kind] = 0
+            batch = []
+            for instance in model.objects.order_by('pk').iterator(chunk_size=batch_size):
+                batch.append(instance)
+                if len(batch) == batch_size:
+                    counts[kind] += index_objects(batch)
+                    batch = []
+            counts[kind] += index_objects(batch)
+    get_backend().optimize(connection)
+    return counts
@@ -0,0 +1,80 @@
+import itertools
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clubs.models import Club
+from events.models import Event
+from search.backends import get_backend
+from search.index import rebuild
+from shared.benchmark import benchmark_database, measure
+from shared.enums import Role
+from users.models import CustomUser
+
+WORDS = (
+    'atelier concert conférence débat robotique théâtre cinéma football basket '
+    'échecs musique photo danse hackathon tournoi soirée gala sortie randonnée '
+    'bénévolat collecte formation python design marketing finance startup '
+    'salle amphi campus bibliothèque gymnase auditorium laboratoire cafétéria'
+).split()
+QUERIES = ('théâtre', 'rob', 'concert amphi', 'hack', 'soirée gala campus', 'ba', 'co', 'zzz')
+
+
+class Command(BaseCommand):
+    help = 'Time /api/search/ over a generated data set (default 200k events).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=200_000)
+        parser.add_argument('--clubs', type=int, default=200)
+        parser.add_argument('--iterations', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.populate(options['events'], options['clubs'])
+            counts = rebuild()
+            self.stdout.write(f'{type(get_backend()).__name__}: {counts}')
+            client = APIClient()
+            client.force_authenticate(CustomUser.objects.get(username='bench'))
+            for query in QUERIES:
+                hits = len(client.get('/api/search/', {'q': query}).data['results'])
+                result = measure(
+                    lambda: client.get('/api/search/', {'q': query}), options['iterations'], warmup=3
+                )
+                self.stdout.write(
+                    f"q={query!r:<22} {hits:>2} hits  p50 {result['p50_ms']:.2f} ms  "
+                    f"p95 {result['p95_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms"
+                )
+
+    def populate(self, events, clubs):
+        rng = random.Random(0)
+        # Vocabulaire à la Zipf : quelques mots très fréquents, une longue traîne de mots rares.
+        syllables = ['ba', 'co', 'di', 'fu', 'ga', 'li', 'mo', 'ne', 'pa', 'ri', 'so', 'tu', 'va', 'xe']
+        vocabulary = WORDS + [
+            ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(5000)
+        ]
+        rng.shuffle(vocabulary)
+        cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+
+        def text(words):
+            return ' '.join(rng.choices(vocabulary, cum_weights=cum_weights, k=words))
+
+        coordinator = CustomUser.objects.create_user(username='bench', password='bench', role=Role.COORDINATOR)
+        # bulk_create : pas de signaux, l'index est construit par rebuild().
+        club_objects = Club.objects.bulk_create(
+            Club(name=f'Club {text(2)} {i}', description=text(30)) for i in range(clubs)
+        )
+        now = timezone.now()
+        Event.objects.bulk_create(
+            (
+                Event(
+                    club=club_objects[i % clubs], title=text(3).capitalize(), description=text(40),
+                    location=text(1), start_time=now + timedelta(hours=i),
+                    end_time=now + timedelta(hours=i + 2), created_by=coordinator,
+                )
+                for i in range(events)
+            ),
+            batch_size=5000,
+        )
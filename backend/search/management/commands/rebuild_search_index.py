@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from search.index import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index of every club and event (run once after migrating).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        counts = rebuild(batch_size=options['batch_size'])
+        summary = ', '.join(f'{count} {kind}(s)' for kind, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Indexed {summary}.'))
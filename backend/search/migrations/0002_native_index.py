@@ -0,0 +1,85 @@
+from django.db import migrations
+
+FTS_TABLE = "search_searchdocument_fts"
+
+# PostgreSQL : colonne tsvector générée (type en poids D, titre A, corps B) + index GIN.
+POSTGRES_VECTOR = [
+    "ALTER TABLE search_searchdocument ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple'::regconfig, kind), 'D') || "
+    "setweight(to_tsvector('simple'::regconfig, title_terms), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, body_terms), 'B')) STORED",
+    "CREATE INDEX search_document_vector_idx ON search_searchdocument USING gin (search_vector)",
+]
+POSTGRES_VECTOR_DROP = [
+    "DROP INDEX IF EXISTS search_document_vector_idx",
+    "ALTER TABLE search_searchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+# Table FTS5 à contenu externe : les triggers la synchronisent avec
+# search_searchdocument. Attention, SQLite reconstruit la table (et perd les
+# triggers) quand une migration modifie ses colonnes : les recréer ensuite.
+SQLITE_FTS = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    "kind, title_terms, body_terms, content='search_searchdocument', content_rowid='id', "
+    "tokenize='unicode61', prefix='2 3 4')",
+    "CREATE TRIGGER search_searchdocument_ai AFTER INSERT ON search_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, kind, title_terms, body_terms) "
+    "VALUES (new.id, new.kind, new.title_terms, new.body_terms); END",
+    "CREATE TRIGGER search_searchdocument_ad AFTER DELETE ON search_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, kind, title_terms, body_terms) "
+    "VALUES ('delete', old.id, old.kind, old.title_terms, old.body_terms); END",
+    "CREATE TRIGGER search_searchdocument_au AFTER UPDATE ON search_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, kind, title_terms, body_terms) "
+    "VALUES ('delete', old.id, old.kind, old.title_terms, old.body_terms); "
+    f"INSERT INTO {FTS_TABLE}(rowid, kind, title_terms, body_terms) "
+    "VALUES (new.id, new.kind, new.title_terms, new.body_terms); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS search_searchdocument_ai",
+    "DROP TRIGGER IF EXISTS search_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS search_searchdocument_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return "ENABLE_FTS5" in {row[0] for row in cursor.fetchall()}
+
+
+def create_native_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        statements = POSTGRES_VECTOR
+    elif connection.vendor == "sqlite" and sqlite_has_fts5(connection):
+        statements = SQLITE_FTS
+    else:
+        # Autres bases : index inversé SearchTerm, rien à créer.
+        statements = []
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_native_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        statements = POSTGRES_VECTOR_DROP
+    elif connection.vendor == "sqlite":
+        statements = SQLITE_FTS_DROP
+    else:
+        statements = []
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_native_index, drop_native_index),
+    ]
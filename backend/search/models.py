@@ -0,0 +1,49 @@
+from django.db import models
+
+from shared.enums import DocumentKind
+
+
+class SearchDocument(models.Model):
+    """
+    One searchable club or event. `title` / `body` are what the results
+    display; `title_terms` / `body_terms` hold the normalized tokens
+    (lowercase, no accents) that the full-text index covers.
+    """
+    kind = models.CharField(max_length=10, choices=DocumentKind.choices)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True)
+    title_terms = models.TextField(blank=True, editable=False)
+    body_terms = models.TextField(blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Search Document'
+        verbose_name_plural = 'Search Documents'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='searchdoc_kind_object_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} #{self.object_id}: {self.title}'
+
+
+class SearchTerm(models.Model):
+    """
+    Inverted index used when the database has no native full-text search:
+    one row per distinct term of a document, weighted by where it occurs.
+    """
+    term = models.CharField(max_length=64)
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name='terms')
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        verbose_name = 'Search Term'
+        verbose_name_plural = 'Search Terms'
+        indexes = [
+            # Recherche par préfixe : term LIKE 'abc%'
+            models.Index(fields=['term', 'document'], name='searchterm_term_doc_idx'),
+        ]
+
+    def __str__(self):
+        return self.term
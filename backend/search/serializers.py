@@ -0,0 +1,22 @@
+from rest_framework import serializers
+
+from .models import SearchDocument
+from .text import highlight, snippet
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    """A ranked hit; `highlight` and `snippet` are HTML with the matches in <mark>."""
+    type = serializers.CharField(source='kind')
+    id = serializers.IntegerField(source='object_id')
+    highlight = serializers.SerializerMethodField()
+    snippet = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SearchDocument
+        fields = ['type', 'id', 'title', 'highlight', 'snippet']
+
+    def get_highlight(self, obj):
+        return highlight(obj.title, self.context['terms'])
+
+    def get_snippet(self, obj):
+        return snippet(obj.body, self.context['terms'])
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from clubs.models import Club
+from events.models import Event
+from .index import index_objects, remove_objects
+
+# Champs recopiés dans les documents : une sauvegarde qui n'en touche aucun ne réindexe pas.
+SOURCE_FIELDS = {
+    Club: {'name', 'description'},
+    Event: {'title', 'description', 'location'},
+}
+
+
+@receiver(post_save, sender=Club)
+@receiver(post_save, sender=Event)
+def index_saved_object(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not SOURCE_FIELDS[sender] & set(update_fields):
+        return
+    index_objects([instance])
+
+
+@receiver(post_delete, sender=Club)
+@receiver(post_delete, sender=Event)
+def remove_deleted_object(sender, instance, **kwargs):
+    remove_objects(sender, [instance.pk])
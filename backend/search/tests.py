@@ -0,0 +1,81 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from clubs.models import Club
+from events.models import Event
+from shared.enums import Role
+from users.models import CustomUser
+from .backends import InvertedIndexBackend, SQLiteFTSBackend, get_backend
+from .index import rebuild
+
+
+class SearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.coordinator = CustomUser.objects.create_user(
+            username='coordinator', password='secret', role=Role.COORDINATOR
+        )
+        cls.club = Club.objects.create(
+            name='Théâtre Club', description='Improvisation every week.', coordinator=cls.coordinator
+        )
+        start = timezone.now() + timedelta(days=1)
+        cls.event = Event.objects.create(
+            club=cls.club, title='Robotics workshop', description='Build a robot for the theatre stage.',
+            location='Lab 2', start_time=start, end_time=start + timedelta(hours=2),
+            created_by=cls.coordinator,
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.coordinator)
+
+    def search(self, **params):
+        response = self.client.get('/api/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_prefix_accent_insensitive_and_ranked(self):
+        results = self.search(q='theat')
+        self.assertEqual([(hit['type'], hit['id']) for hit in results], [
+            ('club', self.club.pk), ('event', self.event.pk),
+        ])
+        self.assertEqual(results[0]['highlight'], '<mark>Théâtre</mark> Club')
+        self.assertIn('the <mark>theatre</mark> stage', results[1]['snippet'])
+        self.assertEqual(self.search(q='robo lab', type='event')[0]['id'], self.event.pk)
+        self.assertEqual(self.search(q='robo lab', type='club'), [])
+
+    def test_broad_query_ranks_title_matches_first(self):
+        with mock.patch('search.backends.RANKED_CANDIDATES', 1):
+            results = self.search(q='theat')
+        self.assertEqual([hit['type'] for hit in results], ['club', 'event'])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.event.title = 'Chess night'
+        self.event.save()
+        self.assertEqual(self.search(q='robotics'), [])
+        self.assertEqual(self.search(q='chess')[0]['id'], self.event.pk)
+        self.event.delete()
+        self.assertEqual(self.search(q='chess'), [])
+
+    def test_inverted_index_fallback_matches_native_results(self):
+        self.assertIsInstance(get_backend(), SQLiteFTSBackend)
+        native = [self.search(q=q) for q in ('theat', 'robo lab', 'week')]
+        with mock.patch('search.index.get_backend', return_value=InvertedIndexBackend()), \
+                mock.patch('search.views.get_backend', return_value=InvertedIndexBackend()):
+            rebuild()
+            self.assertEqual([self.search(q=q) for q in ('theat', 'robo lab', 'week')], native)
+
+    def test_rebuild_command_and_validation(self):
+        Event.objects.bulk_create([Event(
+            club=self.club, title='Bulk concert', description='', location='Hall',
+            start_time=self.event.start_time, end_time=self.event.end_time, created_by=self.coordinator,
+        )])
+        self.assertEqual(self.search(q='concert'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(len(self.search(q='concert')), 1)
+        self.assertEqual(self.client.get('/api/search/', {'q': 'x', 'type': 'user'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/search/', {'q': 'x', 'limit': '0'}).status_code, 400)
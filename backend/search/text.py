@@ -0,0 +1,72 @@
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+from django.utils.html import escape
+
+TOKEN_RE = re.compile(r'\w+')
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 8
+SNIPPET_WORDS = 30
+
+
+@lru_cache(maxsize=None)
+def _combining_marks():
+    # Table de str.translate : retire les diacritiques en C plutôt que caractère par caractère.
+    return dict.fromkeys(cp for cp in range(sys.maxunicode + 1) if unicodedata.combining(chr(cp)))
+
+
+def normalize(text):
+    """Lowercase and strip accents, so 'Théâtre' and 'theatre' index the same."""
+    text = unicodedata.normalize('NFKD', text.casefold())
+    return text if text.isascii() else text.translate(_combining_marks())
+
+
+def tokenize(text):
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall(normalize(text or ''))]
+
+
+def query_terms(query):
+    """Distinct normalized terms of a user query, each matched as a prefix."""
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+
+
+@lru_cache(maxsize=65536)
+def _normalize_word(word):
+    return normalize(word)
+
+
+def _matches(word, terms):
+    # terms : tuple, str.startswith teste tous les préfixes d'un coup.
+    return _normalize_word(word).startswith(terms)
+
+
+def highlight(text, terms, start=0, end=None):
+    """HTML-escaped text[start:end] with every word matching a term wrapped in <mark>."""
+    end = len(text) if end is None else end
+    terms = tuple(terms)
+    parts, position = [], start
+    for match in TOKEN_RE.finditer(text, start, end):
+        if _matches(match.group(), terms):
+            parts.append(escape(text[position:match.start()]))
+            parts.append(f'<mark>{escape(match.group())}</mark>')
+            position = match.end()
+    parts.append(escape(text[position:end]))
+    return ''.join(parts)
+
+
+def snippet(text, terms, words=SNIPPET_WORDS):
+    """A highlighted window of about `words` words around the first match."""
+    terms = tuple(terms)
+    tokens = list(TOKEN_RE.finditer(text))
+    if len(tokens) <= words:
+        return highlight(text, terms)
+    first = next((i for i, token in enumerate(tokens) if _matches(token.group(), terms)), 0)
+    first = max(0, min(first - words // 4, len(tokens) - words))
+    last = first + words - 1
+    start = tokens[first].start() if first else 0
+    end = tokens[last].end() if last < len(tokens) - 1 else len(text)
+    prefix = '… ' if first else ''
+    suffix = ' …' if end < len(text) else ''
+    return prefix + highlight(text, terms, start, end) + suffix
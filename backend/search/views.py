@@ -0,0 +1,48 @@
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from shared.conditional import conditional
+from shared.enums import DocumentKind
+from .backends import get_backend
+from .serializers import SearchResultSerializer
+from .text import query_terms
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+
+def parse_limit(value):
+    if value in (None, ''):
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValidationError({'limit': 'Expected an integer.'})
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValidationError({'limit': f'Expected a value between 1 and {MAX_LIMIT}.'})
+    return limit
+
+
+class SearchView(APIView):
+    """
+    GET /api/search/?q=... ranks clubs (name, description) and events (title,
+    description, location). Every word of `q` is matched as a prefix,
+    regardless of case and accents. Optional `type` (club or event) and
+    `limit` (default 20, at most 50).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @conditional(lambda request, **kwargs: ['clubs', 'events'])
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        kind = request.query_params.get('type') or None
+        if kind is not None and kind not in DocumentKind.values:
+            raise ValidationError({'type': f'Expected one of: {", ".join(DocumentKind.values)}.'})
+        limit = parse_limit(request.query_params.get('limit'))
+
+        terms = query_terms(query)
+        documents = get_backend().search(terms, kind=kind, limit=limit) if terms else []
+        serializer = SearchResultSerializer(documents, many=True, context={'terms': terms})
+        return Response({'query': query, 'results': serializer.data})
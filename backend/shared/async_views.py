@@ -0,0 +1,96 @@
+# shared/async_views.py
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .authentication import CachedTokenAuthentication
+from .expansions import expansion_versions
+
+
+class AsyncAPIView(View):
+    """
+    Vue de lecture entièrement asynchrone : sous ASGI elle s'exécute dans la
+    boucle d'événements au lieu d'occuper un thread de l'exécuteur, si bien
+    qu'un worker peut garder ouvertes un grand nombre de connexions lentes.
+
+    Reprend le contrat des vues DRF synchrones : authentification par token
+    (CachedTokenAuthentication) puis session, IsAuthenticated, pagination
+    keyset et rendu JSONRenderer, pour des corps identiques octet pour octet.
+    Les méthodes `get` des sous-classes doivent être `async def`.
+    """
+    http_method_names = ['get', 'head', 'options']
+    authentication = CachedTokenAuthentication()
+    pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+    renderer = JSONRenderer()
+    # Serializer de la réponse, pour les clés de version des expansions (?expand=).
+    serializer_class = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.user = await self.authenticate(request)
+            if not request.user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+            return await super().dispatch(request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    async def authenticate(self, request):
+        result = await self.authentication.aauthenticate(request)
+        if result is not None:
+            return result[0]
+        # Pas de token : session, comme SessionAuthentication (lecture seule, donc pas de CSRF).
+        user = await sync_to_async(get_user)(request)
+        return user if user.is_active else AnonymousUser()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, Http404):
+            exc = exceptions.NotFound(*exc.args)
+        if not isinstance(exc, exceptions.APIException):
+            raise exc
+        headers = {}
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            headers['WWW-Authenticate'] = self.authentication.authenticate_header(None)
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        return self.render(data, status=exc.status_code, headers=headers)
+
+    def render(self, data, status=200, headers=None):
+        return HttpResponse(
+            self.renderer.render(data),
+            status=status,
+            headers=headers,
+            content_type='application/json',
+        )
+
+    def get_expansion_versions(self, request):
+        if self.serializer_class is None:
+            return ()
+        return expansion_versions(self.serializer_class, request)
+
+    def serializer_context(self, request):
+        return {'request': Request(request), 'view': self}
+
+    async def paginate(self, request, queryset):
+        """
+        Renvoie (page, paginator) : la page est lue avec `async for`, le
+        paginator fournit ensuite les liens next / previous.
+        """
+        paginator = self.pagination_class()
+        page_queryset = paginator.get_page_queryset(queryset, Request(request), self)
+        if page_queryset is None:
+            return [obj async for obj in queryset], None
+        return paginator.set_page([obj async for obj in page_queryset]), paginator
+
+    def paginated_response(self, paginator, data):
+        if paginator is None:
+            return self.render(data)
+        return self.render({
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'results': data,
+        })
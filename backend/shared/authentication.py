@@ -0,0 +1,96 @@
+# shared/authentication.py
+import copy
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+from .cache import TTLCache
+
+SHARED_KEY_PREFIX = 'auth:token:'
+
+# Résolution token -> (user, token) propre au processus.
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_AUTH_CACHE_SIZE,
+    ttl=settings.TOKEN_AUTH_CACHE_TTL,
+)
+
+
+def _shared_cache():
+    alias = settings.TOKEN_AUTH_SHARED_CACHE
+    return caches[alias] if alias else None
+
+
+def invalidate_token(key):
+    """Oublie la résolution d'un token, localement et dans le cache partagé."""
+    token_cache.delete(key)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete(SHARED_KEY_PREFIX + key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Remplaçant de TokenAuthentication qui met en cache la résolution
+    token -> utilisateur : LRU en mémoire (TOKEN_AUTH_CACHE_SIZE / _TTL), puis
+    cache Django partagé optionnel (TOKEN_AUTH_SHARED_CACHE), puis la base.
+
+    L'invalidation est faite par shared/signals.py (suppression du token,
+    modification de l'utilisateur). Sur les autres processus, une entrée locale
+    périmée vit au plus TOKEN_AUTH_CACHE_TTL secondes.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            shared = _shared_cache()
+            if shared is not None:
+                cached = shared.get(SHARED_KEY_PREFIX + key)
+            if cached is None:
+                cached = super().authenticate_credentials(key)
+                if shared is not None:
+                    shared.set(SHARED_KEY_PREFIX + key, cached, settings.TOKEN_AUTH_SHARED_CACHE_TTL)
+            token_cache.set(key, cached)
+        return self._active_copy(cached)
+
+    async def aauthenticate(self, request):
+        """
+        Pendant asynchrone de authenticate() pour shared/async_views.py :
+        mêmes caches, et l'ORM asynchrone en cas d'absence.
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed('Invalid token header.')
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed('Invalid token header.')
+
+        cached = token_cache.get(key)
+        if cached is None:
+            shared = _shared_cache()
+            if shared is not None:
+                cached = await shared.aget(SHARED_KEY_PREFIX + key)
+            if cached is None:
+                try:
+                    token = await self.get_model().objects.select_related('user').aget(key=key)
+                except self.get_model().DoesNotExist:
+                    raise exceptions.AuthenticationFailed('Invalid token.')
+                if not token.user.is_active:
+                    raise exceptions.AuthenticationFailed('User inactive or deleted.')
+                cached = (token.user, token)
+                if shared is not None:
+                    await shared.aset(SHARED_KEY_PREFIX + key, cached, settings.TOKEN_AUTH_SHARED_CACHE_TTL)
+            token_cache.set(key, cached)
+        return self._active_copy(cached)
+
+    @staticmethod
+    def _active_copy(cached):
+        user, token = cached
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        # Copie : une vue qui modifie request.user ne doit pas altérer le cache.
+        return copy.copy(user), token
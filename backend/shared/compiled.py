@@ -0,0 +1,198 @@
+# shared/compiled.py
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+from rest_framework.settings import api_settings
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from .profiling import profiled
+
+# Champs dont la représentation est la valeur brute de la colonne.
+_IDENTITY_FIELDS = (drf_fields.CharField, drf_fields.IntegerField)
+# Champs qui ne se réduisent pas à une colonne (objet lié, calcul, imbrication).
+_UNSUPPORTED_FIELDS = (
+    serializers.BaseSerializer,
+    drf_fields.SerializerMethodField,
+    drf_fields.HiddenField,
+    relations.ManyRelatedField,
+)
+
+
+def _datetime_converter(field):
+    """DateTimeField.to_representation (ISO 8601) avec le fuseau résolu une fois."""
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != 'iso-8601' or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not value:
+            return None
+        if isinstance(value, str):
+            return value
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _choice_converter(field):
+    get = field.choice_strings_to_values.get
+
+    def convert(value):
+        if value in ('', None):
+            return value
+        return get(str(value), value)
+    return convert
+
+
+def _generic_converter(field):
+    to_representation = field.to_representation
+
+    def convert(value):
+        return None if value is None else to_representation(value)
+    return convert
+
+
+def _converter(field):
+    """
+    Fonction valeur de colonne -> représentation, None si la valeur brute
+    convient telle quelle. Lève TypeError si le champ n'est pas compilable.
+    """
+    if isinstance(field, _UNSUPPORTED_FIELDS):
+        raise TypeError(field)
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        # values_list() renvoie déjà la clé étrangère.
+        return None if field.pk_field is None else _generic_converter(field.pk_field)
+    if isinstance(field, relations.RelatedField):
+        raise TypeError(field)
+    if isinstance(field, drf_fields.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, drf_fields.ChoiceField):
+        return _choice_converter(field)
+    if type(field) in _IDENTITY_FIELDS or isinstance(field, drf_fields.EmailField):
+        # str(value) / int(value) sur une valeur déjà de ce type.
+        return None
+    return _generic_converter(field)
+
+
+class CompiledSerializer:
+    """
+    Sérialisation en lecture seule d'une liste, compilée à partir des champs
+    d'un ModelSerializer : les lignes viennent de `values_list(named=True)` et
+    chaque dict est produit par une fonction générée une fois par requête,
+    avec des convertisseurs précalculés (dates, choix). Le JSON rendu est
+    identique octet pour octet à celui du serializer d'origine.
+
+    compile() renvoie None si un champ ne se réduit pas à une colonne
+    (expansion, SerializerMethodField, relation multiple...).
+    """
+
+    def __init__(self, names, columns, render):
+        self.names = names
+        self.columns = columns
+        self._render = render
+
+    @classmethod
+    def compile(cls, serializer, queryset):
+        model = queryset.model
+        annotations = queryset.query.annotations
+        names, sources, converters = [], [], []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if len(field.source_attrs) != 1:
+                return None
+            source = field.source_attrs[0]
+            # Champ qui lit de préférence une annotation du queryset (ex. statut effectif).
+            if getattr(field, 'annotation', None) in annotations:
+                source = field.annotation
+            if source not in annotations:
+                try:
+                    model_field = model._meta.get_field(source)
+                except FieldDoesNotExist:
+                    return None
+                if not model_field.concrete or model_field.many_to_many:
+                    return None
+            try:
+                converters.append(_converter(field))
+            except TypeError:
+                return None
+            names.append(name)
+            sources.append(source)
+
+        # Colonnes : celles des champs, puis celles dont la pagination keyset a besoin.
+        columns = list(dict.fromkeys(sources))
+        for ordering in list(queryset.query.order_by or model._meta.ordering) + ['id']:
+            column = ordering.lstrip('-')
+            column = 'id' if column == 'pk' else column
+            if '__' not in column and column not in columns:
+                columns.append(column)
+
+        namespace, items = {}, []
+        for index, (name, source, converter) in enumerate(zip(names, sources, converters)):
+            expression = f'row[{columns.index(source)}]'
+            if converter is not None:
+                namespace[f'convert_{index}'] = converter
+                expression = f'convert_{index}({expression})'
+            items.append(f'{name!r}: {expression}')
+        source = 'def render(rows):\n    return [{' + ', '.join(items) + '} for row in rows]\n'
+        exec(compile(source, f'<compiled {type(serializer).__name__}>', 'exec'), namespace)
+        return cls(names, columns, namespace['render'])
+
+    def rows(self, queryset):
+        """Queryset de tuples nommés (attributs lisibles par la pagination keyset)."""
+        return queryset.values_list(*self.columns, named=True)
+
+    def bind(self, rows):
+        return _CompiledData(self, rows)
+
+
+class _CompiledData:
+    """Équivalent de `Serializer(rows, many=True)` : seul `.data` est fourni."""
+
+    def __init__(self, compiled, rows):
+        self.compiled = compiled
+        self.rows = rows
+        self.many = True
+
+    @property
+    def data(self):
+        return ReturnList(self.compiled._render(self.rows), serializer=self)
+
+
+class CompiledListMixin:
+    """
+    Mixin de vue générique DRF : les actions listées dans `compiled_actions`
+    (toutes celles d'une ListAPIView si l'attribut `action` n'existe pas)
+    sérialisent leurs listes avec CompiledSerializer, quand le serializer s'y prête.
+    get_serializer() est aussi le point où ProfilingMiddleware chronomètre `.data`.
+    """
+    compiled_actions = ()
+
+    def get_compiled_serializer(self, queryset):
+        if getattr(self, 'action', 'list') not in self.compiled_actions:
+            return None
+        if self.request.method not in ('GET', 'HEAD'):
+            return None
+        serializer_class = self.get_serializer_class()
+        if getattr(getattr(serializer_class, 'Meta', None), 'model', None) is not queryset.model:
+            return None
+        serializer = serializer_class(context=self.get_serializer_context())
+        return CompiledSerializer.compile(serializer, queryset)
+
+    def paginate_queryset(self, queryset):
+        self._compiled = self.get_compiled_serializer(queryset)
+        if self._compiled is not None:
+            queryset = self._compiled.rows(queryset)
+        return super().paginate_queryset(queryset)
+
+    def get_serializer(self, *args, **kwargs):
+        compiled = getattr(self, '_compiled', None)
+        if compiled is not None and kwargs.get('many') and args:
+            rows = args[0]
+            if hasattr(rows, 'values_list') and not getattr(rows, '_fields', None):
+                rows = compiled.rows(rows)
+            return profiled(compiled.bind(rows))
+        return profiled(super().get_serializer(*args, **kwargs))
@@ -0,0 +1,171 @@
+# shared/conditional.py
+import functools
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+from .models import CollectionVersion
+
+
+def bump_versions(*keys):
+    """Incrémente les versions des collections `keys` (une requête dans le cas courant)."""
+    keys = set(keys)
+    if not keys:
+        return
+    now = timezone.now()
+    updated = CollectionVersion.objects.filter(key__in=keys).update(
+        version=F('version') + 1, updated_at=now
+    )
+    if updated == len(keys):
+        return
+    existing = set(CollectionVersion.objects.filter(key__in=keys).values_list('key', flat=True))
+    for key in keys - existing:
+        try:
+            with transaction.atomic():
+                CollectionVersion.objects.create(key=key, version=1, updated_at=now)
+        except IntegrityError:
+            # Créée entre-temps par une écriture concurrente.
+            CollectionVersion.objects.filter(key=key).update(version=F('version') + 1, updated_at=now)
+
+
+def get_versions(keys):
+    """{key: (version, updated_at)} ; une collection jamais modifiée vaut (0, None)."""
+    versions = {key: (0, None) for key in keys}
+    rows = CollectionVersion.objects.filter(key__in=keys).values_list('key', 'version', 'updated_at')
+    for key, version, updated_at in rows:
+        versions[key] = (version, updated_at)
+    return versions
+
+
+def _validators(request, versions, model, updated_at, time_sensitive):
+    # updated_at en plus du numéro : une base restaurée ne recycle pas d'anciens ETag.
+    parts = [
+        f'{key}={version}@{stamp.timestamp() if stamp else 0}'
+        for key, (version, stamp) in sorted(versions.items())
+    ]
+    stamps = [stamp for _, stamp in versions.values() if stamp]
+
+    if model is not None:
+        if updated_at is None:
+            # Objet absent : pas de validateurs, la vue répondra 404.
+            return None, None
+        parts.append(f'object={updated_at.timestamp()}')
+        stamps.append(updated_at)
+
+    if callable(time_sensitive):
+        time_sensitive = time_sensitive(request)
+    if time_sensitive:
+        # Contenu qui dépend de l'heure (événements « à venir ») : change chaque minute.
+        parts.append(f'minute={int(timezone.now().timestamp() // 60)}')
+    # Le corps dépend aussi des paramètres (curseur, filtres) et du format demandé.
+    parts.append(request.META.get('QUERY_STRING', ''))
+    parts.append(request.META.get('HTTP_ACCEPT', ''))
+
+    etag = hashlib.sha1('|'.join(parts).encode()).hexdigest()
+    return etag, max(stamps) if stamps else None
+
+
+def _keys(request, kwargs, keys_func, view):
+    keys = set(keys_func(request, **kwargs))
+    # Objets imbriqués par ?expand= (shared.expansions.ExpandableViewMixin).
+    extra = getattr(view, 'get_expansion_versions', None)
+    if extra is not None:
+        keys.update(extra(request))
+    return sorted(keys)
+
+
+def request_validators(request, kwargs, keys_func, model, time_sensitive):
+    """
+    Calcule (etag, last_modified) une seule fois par requête, à partir des
+    compteurs de version et, pour un objet, de sa colonne updated_at.
+    """
+    state = getattr(request, '_conditional_state', None)
+    if state is not None:
+        return state
+
+    view = (getattr(request, 'parser_context', None) or {}).get('view')
+    versions = get_versions(_keys(request, kwargs, keys_func, view))
+    updated_at = None
+    if model is not None:
+        try:
+            updated_at = model.objects.filter(pk=kwargs.get('pk')).values_list('updated_at', flat=True).first()
+        except (TypeError, ValueError):
+            # pk mal formé : la vue répondra 404, comme get_object_or_404.
+            pass
+    request._conditional_state = _validators(request, versions, model, updated_at, time_sensitive)
+    return request._conditional_state
+
+
+async def arequest_validators(request, kwargs, keys_func, model, time_sensitive, view=None):
+    """Variante asynchrone de request_validators (ORM asynchrone), mêmes ETag."""
+    state = getattr(request, '_conditional_state', None)
+    if state is not None:
+        return state
+
+    keys = _keys(request, kwargs, keys_func, view)
+    versions = {key: (0, None) for key in keys}
+    rows = CollectionVersion.objects.filter(key__in=keys).values_list('key', 'version', 'updated_at')
+    async for key, version, updated_at in rows:
+        versions[key] = (version, updated_at)
+    updated_at = None
+    if model is not None:
+        try:
+            updated_at = await (
+                model.objects.filter(pk=kwargs.get('pk')).values_list('updated_at', flat=True).afirst()
+            )
+        except (TypeError, ValueError):
+            pass
+    request._conditional_state = _validators(request, versions, model, updated_at, time_sensitive)
+    return request._conditional_state
+
+
+def conditional(keys_func, model=None, time_sensitive=False):
+    """
+    Décorateur de méthode de vue DRF : ETag fort + Last-Modified, et 304 sur
+    If-None-Match / If-Modified-Since sans exécuter la vue.
+
+    `keys_func(request, **kwargs)` renvoie les clés de CollectionVersion dont
+    dépend la réponse ; avec `model`, la ligne `kwargs['pk']` y est ajoutée.
+    `time_sensitive` (booléen ou fonction de la requête) ajoute la minute courante.
+    """
+    def etag_func(request, *args, **kwargs):
+        return request_validators(request, kwargs, keys_func, model, time_sensitive)[0]
+
+    def last_modified_func(request, *args, **kwargs):
+        return request_validators(request, kwargs, keys_func, model, time_sensitive)[1]
+
+    return method_decorator(condition(etag_func=etag_func, last_modified_func=last_modified_func))
+
+
+def aconditional(keys_func, model=None, time_sensitive=False):
+    """
+    Équivalent de `conditional` pour les méthodes `async def` des vues de
+    shared/async_views.py : même ETag, mêmes 304 / 412, calculés avec l'ORM asynchrone.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def inner(view, request, *args, **kwargs):
+            etag, last_modified = await arequest_validators(
+                request, kwargs, keys_func, model, time_sensitive, view
+            )
+            etag = quote_etag(etag) if etag else None
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is not None:
+                return response
+            response = await handler(view, request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD') and response.status_code == 200:
+                if timestamp and not response.has_header('Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(timestamp)
+                if etag:
+                    response.headers.setdefault('ETag', etag)
+            return response
+        return inner
+    return decorator
@@ -38,4 +38,24 @@ class MembershipRole(models.TextChoices):
     MEDIA_MANAGER = "media_manager", "Media Manager"
     HR_MANAGER = "hr_manager", "HR Manager"
     SPONSOR_MANAGER = "sponsor_manager", "Sponsorship Manager"
-    DESIGNER = "designer", "Graphic Designer"
\ No newline at end of file
+    DESIGNER = "designer", "Graphic Designer"
+class DocumentKind(models.TextChoices):
+    CLUB = 'club', 'Club'
+    EVENT = 'event', 'Event'
+
+class StatsMetric(models.TextChoices):
+    MEMBERS = 'members', 'Members joined'
+    EVENTS = 'events', 'Events'
+    MEMBERSHIP_REVIEWS = 'membership_reviews', 'Membership reviews'
+    CLUB_REQUESTS = 'club_requests', 'Club creation requests'
+
+class NotificationKind(models.TextChoices):
+    EVENT_CREATED = 'event_created', 'New event'
+    MEMBERSHIP_REVIEWED = 'membership_reviewed', 'Membership reviewed'
+    CLUB_REQUEST_REVIEWED = 'club_request_reviewed', 'Club request reviewed'
+
+class JobStatus(models.TextChoices):
+    QUEUED = 'queued', 'Queued'
+    RUNNING = 'running', 'Running'
+    DONE = 'done', 'Done'
+    FAILED = 'failed', 'Failed'
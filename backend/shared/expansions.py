@@ -0,0 +1,125 @@
+# shared/expansions.py
+from functools import lru_cache
+
+from django.db.models import Prefetch
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import ValidationError
+
+from .fieldsets import is_response_root
+
+
+def requested_expansions(request):
+    """Noms demandés par `?expand=a,b` (GET et HEAD seulement), sans doublons."""
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return []
+    params = getattr(request, 'query_params', request.GET)
+    names = (name.strip() for name in params.get('expand', '').split(','))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def expandable_fields(serializer_class):
+    return getattr(getattr(serializer_class, 'Meta', None), 'expandable_fields', {})
+
+
+@lru_cache(maxsize=None)
+def _nested_class(path):
+    # Chemins en chaîne : pas d'imports circulaires entre les serializers des apps.
+    return import_string(path)
+
+
+def selected_expansions(serializer_class, request):
+    """
+    {nom: classe du serializer imbriqué} pour les expansions demandées ;
+    ValidationError si l'une n'est pas déclarée dans Meta.expandable_fields.
+    """
+    names = requested_expansions(request)
+    if not names:
+        return {}
+    available = expandable_fields(serializer_class)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValidationError({'expand': f'Unknown expansion(s): {", ".join(unknown)}.'})
+    return {name: _nested_class(available[name]) for name in names}
+
+
+class ExpandableFieldsMixin:
+    """
+    Mixin de serializer : `?expand=a,b` remplace les champs relationnels
+    déclarés dans Meta.expandable_fields (`{nom: 'app.serializers.Classe'}`)
+    par l'objet lié sérialisé (et les ajoute s'ils ne font pas partie des
+    champs par défaut). Seul le serializer racine est concerné : une
+    expansion ne s'étend pas elle-même.
+
+    Le chargement des objets liés est planifié côté vue par plan_expansions().
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not is_response_root(self):
+            return fields
+        expansions = selected_expansions(type(self), self.context.get('request'))
+        for name, nested_class in expansions.items():
+            # Une relation absente de Meta.fields est ajoutée quand on l'expanse.
+            source = fields[name].source if name in fields else None
+            kwargs = {'source': source} if source and source != name else {}
+            fields[name] = nested_class(read_only=True, **kwargs)
+        return fields
+
+
+def _active_expansions(serializer_class, request):
+    """[(source, classe imbriquée)] des expansions effectivement rendues (après ?fields / ?omit)."""
+    if not requested_expansions(request) or not expandable_fields(serializer_class):
+        return []
+    try:
+        fields = serializer_class(context={'request': request}).fields
+    except ValidationError:
+        # Le serializer de la vue répondra 400.
+        return []
+    nested = selected_expansions(serializer_class, request)
+    return [(fields[name].source, nested[name]) for name in nested if name in fields]
+
+
+def plan_expansions(queryset, serializer_class, request):
+    """
+    Ajoute au queryset les select_related / prefetch_related nécessaires aux
+    expansions demandées : relation simple -> jointure, relation multiple ->
+    prefetch. Un serializer imbriqué qui définit get_expansion_queryset()
+    (annotations à calculer, par exemple) est chargé par un Prefetch sur ce
+    queryset. Le nombre de requêtes ne dépend donc pas de la taille de la page.
+    """
+    if getattr(getattr(serializer_class, 'Meta', None), 'model', None) is not queryset.model:
+        return queryset
+    for source, nested_class in _active_expansions(serializer_class, request):
+        custom = getattr(nested_class, 'get_expansion_queryset', None)
+        relation = queryset.model._meta.get_field(source)
+        if custom is not None:
+            queryset = queryset.prefetch_related(Prefetch(source, queryset=custom()))
+        elif relation.many_to_one or relation.one_to_one:
+            queryset = queryset.select_related(source)
+        else:
+            queryset = queryset.prefetch_related(source)
+    return queryset
+
+
+def expansion_versions(serializer_class, request):
+    """Clés de CollectionVersion dont dépendent les objets imbriqués (Meta.expansion_versions)."""
+    keys = set()
+    for _, nested_class in _active_expansions(serializer_class, request):
+        keys.update(getattr(nested_class.Meta, 'expansion_versions', ()))
+    return keys
+
+
+class ExpandableViewMixin:
+    """
+    Mixin de vue générique DRF : planifie les expansions dans filter_queryset()
+    et expose leurs clés de version à shared.conditional (ETag, cache de réponses).
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # Valide les noms même quand la page est vide (400 sur une expansion inconnue).
+        selected_expansions(self.get_serializer_class(), self.request)
+        return plan_expansions(queryset, self.get_serializer_class(), self.request)
+
+    def get_expansion_versions(self, request):
+        return expansion_versions(self.get_serializer_class(), request)
@@ -0,0 +1,147 @@
+# shared/fieldsets.py
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def _split(value):
+    if value is None:
+        return None
+    return [name for name in (part.strip() for part in value.split(',')) if name]
+
+
+def requested_fields(request):
+    """
+    (fields, omit) demandés par `?fields=a,b` / `?omit=c` ; None hors GET/HEAD
+    ou sans aucun des deux paramètres. Chaque élément vaut None s'il est absent.
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+    params = getattr(request, 'query_params', request.GET)
+    fields, omit = _split(params.get('fields')), _split(params.get('omit'))
+    if fields is None and omit is None:
+        return None
+    return fields, omit
+
+
+def select_fields(names, request):
+    """Noms de `names` conservés (dans leur ordre) ; ValidationError si un nom est inconnu."""
+    selection = requested_fields(request)
+    if selection is None:
+        return list(names)
+    fields, omit = selection
+    for param, values in (('fields', fields), ('omit', omit)):
+        unknown = [name for name in values or () if name not in names]
+        if unknown:
+            raise ValidationError({param: f'Unknown field(s): {", ".join(unknown)}.'})
+    return [
+        name for name in names
+        if (fields is None or name in fields) and (omit is None or name not in omit)
+    ]
+
+
+def is_response_root(serializer):
+    """Vrai pour le serializer racine de la réponse ou l'enfant d'un ListSerializer racine."""
+    parent = getattr(serializer, 'parent', None)
+    if isinstance(parent, serializers.ListSerializer):
+        parent = getattr(parent, 'parent', None)
+    return parent is None
+
+
+class SparseFieldsetMixin:
+    """
+    Mixin de serializer : `?fields=` / `?omit=` (GET et HEAD seulement)
+    restreignent les champs rendus. Seul le serializer racine de la réponse
+    (ou l'enfant d'un ListSerializer racine) est concerné, jamais un serializer
+    imbriqué. Sans `request` dans le contexte, tous les champs sont rendus.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not is_response_root(self):
+            return fields
+        selected = select_fields(list(fields), self.context.get('request'))
+        return {name: fields[name] for name in selected}
+
+
+def sparse_columns(serializer_class, request, annotations=()):
+    """
+    Colonnes du modèle lues par les champs sélectionnés de `serializer_class`,
+    ou None si la sélection ne peut pas être traduite en colonnes (champ
+    calculé, source '*', relation multiple) : le queryset reste alors complet.
+    Les champs issus d'une annotation (`annotations`) ne demandent aucune colonne.
+    """
+    if requested_fields(request) is None:
+        return None
+    model = serializer_class.Meta.model
+    columns = {model._meta.pk.name}
+    try:
+        fields = serializer_class(context={'request': request}).fields
+    except ValidationError:
+        # Nom inconnu : c'est le serializer de la vue qui répondra 400.
+        return None
+    for field in fields.values():
+        if field.write_only:
+            continue
+        if not field.source_attrs:
+            return None
+        name = field.source_attrs[0]
+        if name in annotations:
+            continue
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        columns.add(name)
+    return columns
+
+
+def narrow_queryset(queryset, serializer_class, request, through=None):
+    """
+    Applique `.only()` au queryset pour ne lire que les colonnes des champs
+    demandés, plus celles dont l'ORM et la pagination ont besoin (clé
+    primaire, ordering, relations de select_related).
+
+    Avec `through`, les objets sérialisés sont `obj.<through>` (chargés par
+    select_related) : ce sont leurs colonnes qui sont restreintes.
+    """
+    model = queryset.model
+    if through is not None:
+        model = model._meta.get_field(through).related_model
+    if getattr(getattr(serializer_class, 'Meta', None), 'model', None) is not model:
+        return queryset
+    select_related = queryset.query.select_related
+    if select_related is True:
+        return queryset
+
+    annotations = queryset.query.annotations if through is None else ()
+    columns = sparse_columns(serializer_class, request, annotations)
+    if columns is None:
+        return queryset
+    if through is not None:
+        columns = {f'{through}__{name}' for name in columns} | {through}
+
+    columns.add(queryset.model._meta.pk.name)
+    for field in queryset.query.order_by or queryset.model._meta.ordering:
+        name = field.lstrip('-')
+        if name != 'pk' and '__' not in name and name not in queryset.query.annotations:
+            columns.add(name)
+    if select_related:
+        columns.update(select_related)
+    return queryset.only(*columns)
+
+
+class SparseFieldsetViewMixin:
+    """
+    Mixin de vue générique DRF : pousse la sélection `?fields=` / `?omit=`
+    dans le queryset (voir narrow_queryset) depuis filter_queryset().
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if requested_fields(self.request) is not None:
+            # Valide les noms même quand la page est vide (400 sur un nom inconnu).
+            self.get_serializer().fields
+        return narrow_queryset(queryset, self.get_serializer_class(), self.request)
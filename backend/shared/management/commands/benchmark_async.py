@@ -0,0 +1,95 @@
+import asyncio
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from clubs.models import Club
+from events.models import Event
+from memberships.models import Membership
+from shared.benchmark import benchmark_database, summarize
+from shared.conditional import bump_versions
+from shared.enums import MembershipStatus, Role
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare sync and async read endpoints under concurrent load, served '
+        'through the ASGI handler (sync views run in the thread executor).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint.')
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--rows', type=int, default=200, help='Members and events in the club.')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            club, token = self.populate(options['rows'])
+            endpoints = (
+                ('me', '/auth/me/', '/async/auth/me/'),
+                ('club', f'/api/clubs/{club.pk}/', f'/async/api/clubs/{club.pk}/'),
+                ('members', f'/api/clubs/{club.pk}/members/', f'/async/api/clubs/{club.pk}/members/'),
+                ('club events', f'/api/clubs/{club.pk}/events/', f'/async/api/clubs/{club.pk}/events/'),
+                ('events by club', f'/api/events/by-club/{club.pk}/', f'/async/api/events/by-club/{club.pk}/'),
+            )
+            for label, sync_url, async_url in endpoints:
+                for kind, url in (('sync', sync_url), ('async', async_url)):
+                    stats = asyncio.run(
+                        self.load(url, token, options['requests'], options['concurrency'])
+                    )
+                    self.stdout.write(
+                        f"{label:<15} {kind:<6} {stats['rps']:>9.1f} req/s  "
+                        f"p50 {stats['p50_ms']:.2f} ms  p95 {stats['p95_ms']:.2f} ms  "
+                        f"p99 {stats['p99_ms']:.2f} ms"
+                    )
+
+    def populate(self, rows):
+        coordinator = CustomUser.objects.create_user(
+            username='bench', password='bench', role=Role.COORDINATOR
+        )
+        club = Club.objects.create(name='Bench', description='', coordinator=coordinator)
+        users = CustomUser.objects.bulk_create(
+            CustomUser(username=f'member{i}', password='!', role=Role.MEMBER) for i in range(rows)
+        )
+        Membership.objects.bulk_create(
+            Membership(user=user, club=club, status=MembershipStatus.ACTIVE) for user in users
+        )
+        now = timezone.now()
+        Event.objects.bulk_create(
+            Event(
+                club=club, title=f'Event {i}', description='', location='Room A',
+                start_time=now + timedelta(hours=i), end_time=now + timedelta(hours=i + 1),
+                created_by=coordinator,
+            )
+            for i in range(rows)
+        )
+        bump_versions(
+            'memberships', 'events', f'memberships:club:{club.pk}',
+            f'events:club:{club.pk}', f'users:club:{club.pk}',
+        )
+        return club, Token.objects.create(user=coordinator)
+
+    async def load(self, url, token, requests, concurrency):
+        client = AsyncClient()
+        headers = {'Authorization': f'Token {token.key}', 'Accept': 'application/json'}
+        slots = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def call(n):
+            async with slots:
+                t0 = time.perf_counter()
+                # Paramètre unique : chaque requête exécute la vue, sans cache de réponses ni 304.
+                response = await client.get(url, {'bench': n}, headers=headers)
+                latencies.append(time.perf_counter() - t0)
+                assert response.status_code == 200, (url, response.status_code)
+
+        await asyncio.gather(*(call(-n) for n in range(1, min(requests, concurrency) + 1)))
+        latencies.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(call(n) for n in range(requests)))
+        return summarize(latencies, time.perf_counter() - started)
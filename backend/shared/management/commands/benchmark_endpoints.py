@@ -0,0 +1,338 @@
+import itertools
+import json
+import logging
+import sys
+from contextlib import nullcontext
+from datetime import timedelta
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from clubs.models import Club, ClubCreationRequest
+from events.models import Event, location_key
+from memberships.models import Membership
+from shared.benchmark import benchmark_database, measure
+from notifications.models import Notification
+from shared.enums import EventStatus, MembershipStatus, NotificationKind, RequestStatus, Role
+from shared.synthetic import PASSWORD, generate
+from stats.refresh import refresh as refresh_stats
+from users.models import CustomUser
+
+
+class Endpoint(NamedTuple):
+    route: str
+    method: str
+    # None : requête anonyme
+    user: Any
+    # Chemin et corps : valeurs fixes ou fonctions du numéro d'appel
+    path: Any
+    data: Any = None
+    format: str = 'json'
+
+
+def route_names():
+    """Noms des routes de core/urls.py (hors admin), variantes de format comprises une fois."""
+    names = set()
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                if pattern.app_name != 'admin':
+                    walk(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                names.add(pattern.name)
+
+    walk(get_resolver().url_patterns)
+    return names
+
+
+def resolve(value, n):
+    return value(n) if callable(value) else value
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a synthetic campus in a throwaway database, call every route of '
+        'core/urls.py through the test client and print p50/p95/p99 latency and '
+        'query counts per endpoint as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5000)
+        parser.add_argument('--clubs', type=int, default=100)
+        parser.add_argument('--events', type=int, default=20_000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument(
+            '--cold', action='store_true',
+            help='Add a unique query parameter to every GET so no response cache or 304 is involved.',
+        )
+        parser.add_argument(
+            '--profiling', action='store_true',
+            help='Run with shared.profiling.ProfilingMiddleware enabled, to measure its overhead.',
+        )
+        parser.add_argument('--only', default='', help='Comma-separated route names to run.')
+        parser.add_argument('--output', default='', help='Write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        calls = options['warmup'] + options['iterations'] + 1
+        with benchmark_database():
+            scale = generate(
+                users=options['users'], clubs=options['clubs'], events=options['events'],
+                seed=options['seed'],
+            )
+            refresh_stats(full=True)
+            endpoints = self.endpoints(calls)
+            missing = route_names() - {endpoint.route for endpoint in endpoints}
+            if missing:
+                raise CommandError(f'No benchmark for routes: {", ".join(sorted(missing))}')
+            only = set(filter(None, options['only'].split(',')))
+            # Les réponses 4xx sont résumées par run(), pas journalisées à chaque appel.
+            logger = logging.getLogger('django.request')
+            level = logger.level
+            logger.setLevel(logging.ERROR)
+            profiling = override_settings(REQUEST_PROFILING=True) if options['profiling'] else nullcontext()
+            try:
+                with profiling:
+                    results = [
+                        self.run(endpoint, options)
+                        for endpoint in endpoints
+                        if not only or endpoint.route in only
+                    ]
+            finally:
+                logger.setLevel(level)
+
+        report = json.dumps({
+            'scale': scale,
+            'iterations': options['iterations'],
+            'cold': options['cold'],
+            'profiling': options['profiling'],
+            'endpoints': results,
+        }, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report + '\n')
+        else:
+            self.stdout.write(report)
+
+    def run(self, endpoint, options):
+        client = APIClient()
+        if endpoint.user is not None:
+            client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user=endpoint.user)[0].key}')
+        counter = itertools.count()
+        status = set()
+
+        def call():
+            n = next(counter)
+            path, data = resolve(endpoint.path, n), resolve(endpoint.data, n)
+            if endpoint.method == 'get' and options['cold']:
+                data = {**(data or {}), '_bench': n}
+            send = getattr(client, endpoint.method)
+            if endpoint.method == 'get':
+                response = send(path, data)
+            else:
+                response = send(path, data, format=endpoint.format)
+            status.add(response.status_code)
+            # Consomme les réponses en flux (exports) pour mesurer leur génération.
+            if response.streaming:
+                b''.join(response.streaming_content)
+
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        for _ in range(options['warmup']):
+            call()
+        with CaptureQueriesContext(connection) as queries:
+            call()
+        # À lire tout de suite : chaque requête suivante vide connection.queries.
+        query_count = len(queries)
+        stats = measure(call, options['iterations'], warmup=0)
+        if any(code >= 400 for code in status):
+            sys.stderr.write(f'{endpoint.method.upper()} {endpoint.route}: HTTP {sorted(status)}\n')
+        return {
+            'route': endpoint.route,
+            'method': endpoint.method.upper(),
+            'path': resolve(endpoint.path, 0),
+            'status': sorted(status),
+            'queries': query_count,
+            **stats,
+        }
+
+    def endpoints(self, calls):
+        """Un scénario par route et méthode ; les écritures consomment des objets créés d'avance."""
+        rva = CustomUser.objects.filter(role=Role.STUDENT_LIFE_OFFICER).first()
+        member = CustomUser.objects.filter(role=Role.MEMBER).first()
+        # Le club le plus suivi : le pire cas des listes par club.
+        club = Club.objects.annotate(members=Count('memberships')).order_by('-members').first()
+        coordinator = club.coordinator
+        event = Event.objects.filter(club=club).order_by('-start_time').first()
+        membership = Membership.objects.filter(club=club).first()
+        request = ClubCreationRequest.objects.filter(status=RequestStatus.PENDING).first()
+        notification = Notification.objects.create(
+            recipient=member, kind=NotificationKind.MEMBERSHIP_REVIEWED, message='Benchmark'
+        )
+        pools = self.pools(calls, club, coordinator)
+        now = timezone.now()
+        month = now.strftime('%Y-%m')
+
+        def new_event(n):
+            start = now + timedelta(days=400, hours=n)
+            return {
+                'club': club.pk, 'title': f'Benchmark {n}', 'description': 'Benchmark event',
+                'start_time': start.isoformat(), 'end_time': (start + timedelta(hours=1)).isoformat(),
+                'location': f'Benchmark room {n}', 'created_by': coordinator.pk,
+            }
+
+        def import_file(n):
+            start = now + timedelta(days=800, hours=n * 10)
+            lines = ['club,title,description,start_time,end_time,location']
+            for i in range(10):
+                begins = start + timedelta(hours=i)
+                lines.append(
+                    f'{club.pk},Import {n}-{i},Imported,{begins.isoformat()},'
+                    f'{(begins + timedelta(hours=1)).isoformat()},Import room {n}'
+                )
+            content = ('\n'.join(lines) + '\n').encode()
+            return {'file': SimpleUploadedFile(f'import-{n}.csv', content, content_type='text/csv')}
+
+        def register(role):
+            return lambda n: {
+                'username': f'bench-{role}-{n}', 'first_name': 'Bench', 'last_name': str(n),
+                'email': f'bench.{role}.{n}@example.com', 'password': 'bench-password',
+            }
+
+        return [
+            Endpoint('register-member', 'post', None, '/auth/register/member/', register('member')),
+            Endpoint('register-coordinator', 'post', None, '/auth/register/coordinator/', register('coordinator')),
+            Endpoint('register-rva', 'post', None, '/auth/register/rva/', register('rva')),
+            Endpoint('login', 'post', None, '/auth/login/', {'username': member.username, 'password': PASSWORD}),
+            Endpoint('me', 'get', member, '/auth/me/'),
+            Endpoint('coordinators-list', 'get', rva, '/users/coordinators/'),
+            Endpoint('members-list', 'get', rva, '/users/members/'),
+            Endpoint('rvas-list', 'get', rva, '/users/rvas/'),
+            Endpoint('api-root', 'get', member, '/api/'),
+
+            Endpoint('club-list', 'get', member, '/api/clubs/'),
+            Endpoint('club-list', 'post', rva, '/api/clubs/', lambda n: {'name': f'Bench club {n}', 'description': 'Benchmark'}),
+            Endpoint('club-detail', 'get', member, f'/api/clubs/{club.pk}/'),
+            Endpoint('club-detail', 'patch', rva, f'/api/clubs/{club.pk}/', lambda n: {'description': f'Updated {n}'}),
+            Endpoint('club-detail', 'delete', rva, lambda n: f'/api/clubs/{pools["clubs"][n]}/'),
+            Endpoint('club-club-coordinator', 'get', member, f'/api/clubs/{club.pk}/coordinator/'),
+            Endpoint('club-club-events', 'get', member, f'/api/clubs/{club.pk}/events/'),
+            Endpoint('club-members', 'get', member, f'/api/clubs/{club.pk}/members/'),
+            Endpoint('club-export-members', 'get', coordinator, f'/api/clubs/{club.pk}/members/export/'),
+
+            Endpoint('clubrequest-list', 'get', rva, '/api/clubs/requests/'),
+            Endpoint('clubrequest-list', 'post', coordinator, '/api/clubs/requests/', lambda n: {
+                'club_name': f'Bench request {n}', 'description': 'Benchmark', 'coordinator': coordinator.pk,
+            }),
+            Endpoint('clubrequest-detail', 'get', rva, f'/api/clubs/requests/{request.pk}/'),
+            Endpoint('clubrequest-detail', 'patch', rva, f'/api/clubs/requests/{request.pk}/',
+                     lambda n: {'student_life_officer_comment': f'Comment {n}'}),
+            Endpoint('clubrequest-detail', 'delete', rva, lambda n: f'/api/clubs/requests/{pools["requests"][n]}/'),
+            Endpoint('clubrequest-approve', 'patch', rva, lambda n: f'/api/clubs/requests/{pools["approve"][n]}/approve/'),
+            Endpoint('clubrequest-reject', 'patch', rva, lambda n: f'/api/clubs/requests/{pools["reject"][n]}/reject/'),
+            Endpoint('clubrequest-bulk-review', 'post', rva, '/api/clubs/requests/bulk-review/',
+                     lambda n: {'ids': pools['review'][n], 'status': RequestStatus.APPROVED}),
+
+            Endpoint('membership-list', 'get', member, '/api/memberships/'),
+            Endpoint('membership-list', 'post', rva, '/api/memberships/',
+                     lambda n: {'user': pools['joiners'][n], 'club': club.pk}),
+            Endpoint('membership-detail', 'get', member, f'/api/memberships/{membership.pk}/'),
+            Endpoint('membership-detail', 'patch', coordinator, f'/api/memberships/{membership.pk}/',
+                     lambda n: {'role': 'member'}),
+            Endpoint('membership-detail', 'delete', rva, lambda n: f'/api/memberships/{pools["memberships"][n]}/'),
+            Endpoint('membership-by-club', 'get', member, f'/api/memberships/by-club/{club.pk}/'),
+            Endpoint('membership-bulk-review', 'post', coordinator, '/api/memberships/bulk-review/',
+                     lambda n: {'ids': pools['pending'][n], 'status': MembershipStatus.ACTIVE}),
+            Endpoint('membership-export', 'get', rva, '/api/memberships/export/'),
+
+            Endpoint('event-list', 'get', member, '/api/events/'),
+            Endpoint('event-list', 'get', member, '/api/events/', {'status': 'completed'}),
+            Endpoint('event-list', 'post', coordinator, '/api/events/', new_event),
+            Endpoint('event-detail', 'get', member, f'/api/events/{event.pk}/'),
+            Endpoint('event-detail', 'patch', coordinator, f'/api/events/{event.pk}/',
+                     lambda n: {'description': f'Updated {n}'}),
+            Endpoint('event-detail', 'delete', coordinator, lambda n: f'/api/events/{pools["events"][n]}/'),
+            Endpoint('event-by-club', 'get', member, f'/api/events/by-club/{club.pk}/'),
+            Endpoint('event-calendar', 'get', member, '/api/events/calendar/', {'month': month}),
+            Endpoint('event-conflicts', 'get', rva, '/api/events/conflicts/'),
+            Endpoint('event-export', 'get', member, '/api/events/export/'),
+            Endpoint('event-import-events', 'post', coordinator, '/api/events/import/', import_file, 'multipart'),
+
+            Endpoint('search', 'get', member, '/api/search/', {'q': 'atelier'}),
+
+            Endpoint('notification-list', 'get', member, '/api/notifications/'),
+            Endpoint('notification-unread-count', 'get', member, '/api/notifications/unread-count/'),
+            Endpoint('notification-read', 'post', member, f'/api/notifications/{notification.pk}/read/'),
+            Endpoint('notification-read-all', 'post', member, '/api/notifications/read-all/'),
+
+            Endpoint('stats-list', 'get', rva, '/api/stats/'),
+            Endpoint('stats-members', 'get', rva, '/api/stats/members/'),
+            Endpoint('stats-events', 'get', rva, '/api/stats/events/'),
+            Endpoint('stats-membership-reviews', 'get', rva, '/api/stats/membership-reviews/'),
+            Endpoint('stats-club-requests', 'get', rva, '/api/stats/club-requests/'),
+
+            Endpoint('async-me', 'get', member, '/async/auth/me/'),
+            Endpoint('async-club-detail', 'get', member, f'/async/api/clubs/{club.pk}/'),
+            Endpoint('async-club-members', 'get', member, f'/async/api/clubs/{club.pk}/members/'),
+            Endpoint('async-club-events', 'get', member, f'/async/api/clubs/{club.pk}/events/'),
+            Endpoint('async-events-by-club', 'get', member, f'/async/api/events/by-club/{club.pk}/'),
+        ]
+
+    def pools(self, calls, club, coordinator):
+        """`calls` objets à consommer par scénario destructif (un par appel)."""
+        stamp = timezone.now() + timedelta(days=1200)
+        applicants = CustomUser.objects.bulk_create(
+            CustomUser(username=f'bench-applicant-{i}', password='!', role=Role.COORDINATOR)
+            for i in range(23 * calls)
+        )
+        requests = ClubCreationRequest.objects.bulk_create(
+            ClubCreationRequest(club_name=f'Bench request {i}', description='Benchmark', coordinator=user)
+            for i, user in enumerate(applicants)
+        )
+        joiners = CustomUser.objects.bulk_create(
+            CustomUser(username=f'bench-joiner-{i}', password='!', role=Role.MEMBER)
+            for i in range(calls * 22)
+        )
+        memberships = Membership.objects.bulk_create(
+            Membership(user=user, club=club, status=MembershipStatus.PENDING)
+            for user in joiners[calls:]
+        )
+        clubs = Club.objects.bulk_create(
+            Club(name=f'Bench club {i}', description='Benchmark') for i in range(calls)
+        )
+        events = Event.objects.bulk_create(
+            Event(
+                club=club, title=f'Bench {i}', description='Benchmark', location='Bench room',
+                location_key=location_key('Bench room'), start_time=stamp + timedelta(hours=i),
+                end_time=stamp + timedelta(hours=i, minutes=30), created_by=coordinator,
+                status=EventStatus.UPCOMING,
+            )
+            for i in range(calls)
+        )
+        pending = [membership.pk for membership in memberships[calls:]]
+        return {
+            'requests': [request.pk for request in requests[:calls]],
+            'approve': [request.pk for request in requests[calls:2 * calls]],
+            'reject': [request.pk for request in requests[2 * calls:3 * calls]],
+            # 20 demandes en attente (et donc 20 clubs créés) par appel de bulk-review
+            'review': [
+                [request.pk for request in requests[i:i + 20]] for i in range(3 * calls, len(requests), 20)
+            ],
+            'joiners': [user.pk for user in joiners[:calls]],
+            'memberships': [membership.pk for membership in memberships[:calls]],
+            # 20 adhésions en attente par appel de bulk-review
+            'pending': [pending[i:i + 20] for i in range(0, len(pending), 20)],
+            'clubs': [club.pk for club in clubs],
+            'events': [event.pk for event in events],
+        }
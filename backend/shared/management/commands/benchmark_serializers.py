@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from clubs.models import Club
+from events.models import Event
+from events.serializers import EventSerializer
+from memberships.models import Membership
+from memberships.serializers import MembershipSerializer
+from shared.benchmark import benchmark_database, measure
+from shared.compiled import CompiledSerializer
+from shared.enums import MembershipStatus, Role
+from users.models import CustomUser
+from users.serializers import UserSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare ModelSerializer(many=True) with the compiled read-only path on '
+        'large pages (fetch + serialize + render, and serialize only).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--iterations', type=int, default=10)
+
+    def handle(self, *args, **options):
+        rows, iterations = options['rows'], options['iterations']
+        renderer = JSONRenderer()
+        with benchmark_database():
+            self.populate(rows)
+            cases = (
+                ('EventSerializer', EventSerializer, Event.objects.all()),
+                ('MembershipSerializer', MembershipSerializer, Membership.objects.all()),
+                ('UserSerializer', UserSerializer, CustomUser.objects.filter(role=Role.MEMBER)),
+            )
+            for label, serializer_class, queryset in cases:
+                queryset = queryset.order_by('pk')[:rows]
+                compiled = CompiledSerializer.compile(serializer_class(), queryset)
+                if compiled is None:
+                    raise CommandError(f'{label} cannot be compiled.')
+
+                def drf():
+                    return renderer.render(serializer_class(list(queryset), many=True).data)
+
+                def fast():
+                    return renderer.render(compiled.bind(list(compiled.rows(queryset))).data)
+
+                if drf() != fast():
+                    raise CommandError(f'{label}: compiled output differs from the serializer.')
+
+                instances = list(queryset)
+                tuples = list(compiled.rows(queryset))
+                results = {
+                    'end to end': (measure(drf, iterations, warmup=1), measure(fast, iterations, warmup=1)),
+                    'serialize': (
+                        measure(lambda: serializer_class(instances, many=True).data, iterations, warmup=1),
+                        measure(lambda: compiled.bind(tuples).data, iterations, warmup=1),
+                    ),
+                }
+                for phase, (before, after) in results.items():
+                    self.stdout.write(
+                        f"{label:<21} {phase:<10} {rows} rows  "
+                        f"ModelSerializer p50 {before['p50_ms']:.1f} ms  "
+                        f"compiled p50 {after['p50_ms']:.1f} ms  "
+                        f"x{before['p50_ms'] / after['p50_ms']:.1f}"
+                    )
+
+    def populate(self, rows):
+        coordinator = CustomUser.objects.create_user(
+            username='bench', password='bench', role=Role.COORDINATOR
+        )
+        club = Club.objects.create(name='Bench', description='', coordinator=coordinator)
+        users = CustomUser.objects.bulk_create(
+            CustomUser(
+                username=f'member{i}', password='!', role=Role.MEMBER,
+                first_name='Member', last_name=str(i), email=f'member{i}@example.com',
+            )
+            for i in range(rows)
+        )
+        Membership.objects.bulk_create(
+            Membership(user=user, club=club, status=MembershipStatus.ACTIVE) for user in users
+        )
+        now = timezone.now()
+        Event.objects.bulk_create(
+            Event(
+                club=club, title=f'Event {i}', description='Lorem ipsum ' * 20,
+                location='Room A', start_time=now + timedelta(hours=i),
+                end_time=now + timedelta(hours=i + 1), created_by=coordinator,
+            )
+            for i in range(rows)
+        )
@@ -0,0 +1,133 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.request import Request
+
+from shared.pagination import KeysetPagination
+
+
+def iter_view_classes(patterns):
+    """Classes de vues (viewsets et APIView génériques) derrière les URLs du projet."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_view_classes(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            callback = pattern.callback
+            view_class = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+            if view_class is not None:
+                yield view_class
+
+
+def _postgresql_nodes(node):
+    yield node
+    for child in node.get('Plans', ()):
+        yield from _postgresql_nodes(child)
+
+
+def plan_accesses(queryset):
+    """
+    [(table, index or None)] for every table access in the query plan; None
+    is a sequential scan. Read from the structured plan of the backend
+    (EXPLAIN (FORMAT JSON) on PostgreSQL, EXPLAIN QUERY PLAN rows on SQLite).
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            return [
+                (node['Relation Name'], node.get('Index Name'))
+                for node in _postgresql_nodes(plan[0]['Plan']) if 'Relation Name' in node
+            ]
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            accesses = []
+            for *_, detail in cursor.fetchall():
+                # « SCAN t », « SEARCH t USING INDEX i (...) », « SCAN TABLE t » (SQLite < 3.36)
+                words = detail.split()
+                if words[0] not in ('SCAN', 'SEARCH') or len(words) < 2:
+                    continue
+                table = words[2] if words[1] == 'TABLE' and len(words) > 2 else words[1]
+                index = None
+                if 'INDEX' in words and words.index('INDEX') + 1 < len(words):
+                    index = words[words.index('INDEX') + 1]
+                elif 'PRIMARY' in words:
+                    index = 'PRIMARY KEY'
+                accesses.append((table, index))
+            return accesses
+    return []
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN on the first page of every API view\'s default queryset, '
+        'list the indexes it uses and flag sequential scans on large tables.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-rows', type=int, default=10000,
+                            help='Only flag scans of tables with at least this many rows.')
+        parser.add_argument('--strict', action='store_true',
+                            help='Exit with an error when a sequential scan is flagged.')
+
+    def handle(self, *args, **options):
+        factory = RequestFactory(SERVER_NAME='localhost')
+        seen = set()
+        flagged = []
+
+        for view_class in iter_view_classes(get_resolver().url_patterns):
+            if view_class in seen or not hasattr(view_class, 'list'):
+                continue
+            seen.add(view_class)
+
+            queryset = self.page_queryset(view_class, factory)
+            if queryset is None:
+                continue
+            accesses = plan_accesses(queryset)
+            scans = sorted({
+                table for table, index in accesses
+                if index is None and self.row_count(table) >= options['min_rows']
+            })
+            indexes = sorted({index for _, index in accesses if index and index != 'PRIMARY KEY'})
+            status = self.style.ERROR('SEQ SCAN ' + ', '.join(scans)) if scans else self.style.SUCCESS('ok')
+            used = f' (indexes: {", ".join(indexes)})' if indexes else ''
+            self.stdout.write(f'{view_class.__module__}.{view_class.__name__}: {status}{used}')
+            if options['verbosity'] > 1 or scans:
+                self.stdout.write(f'  {queryset.query}')
+                for line in queryset.explain().splitlines():
+                    self.stdout.write(f'    {line}')
+            if scans:
+                flagged.append(view_class.__name__)
+
+        if flagged and options['strict']:
+            raise CommandError(f'Sequential scans on large tables: {", ".join(flagged)}')
+
+    def page_queryset(self, view_class, factory):
+        view = view_class()
+        view.request = Request(factory.get('/'))
+        view.args, view.kwargs = (), {}
+        view.format_kwarg = None
+        view.action = 'list'
+        try:
+            queryset = view.get_queryset()
+        except Exception as exc:  # une vue qui dépend d'un utilisateur ou d'un kwarg
+            self.stderr.write(f'{view_class.__name__}: skipped ({exc})')
+            return None
+
+        paginator = getattr(view, 'paginator', None)
+        if isinstance(paginator, KeysetPagination):
+            return paginator.get_page_queryset(queryset, view.request, view)
+        return queryset[:50]
+
+    def row_count(self, table):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+                row = cursor.fetchone()
+                return row[0] if row else 0
+            cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+            return cursor.fetchone()[0]
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from shared.synthetic import PASSWORD, generate
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the configured database with a synthetic campus (users of every role, '
+        'club requests, skewed memberships, several years of events) using bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--clubs', type=int, default=200)
+        parser.add_argument('--events', type=int, default=50_000)
+        parser.add_argument('--years', type=int, default=4)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--prefix', default='synthetic',
+            help='Username prefix; run again with another prefix to add a second campus.',
+        )
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if CustomUser.objects.filter(username__startswith=f'{prefix}-').exists():
+            raise CommandError(f'Users prefixed "{prefix}-" already exist; choose another --prefix.')
+        started = time.perf_counter()
+        try:
+            counts = generate(
+                users=options['users'], clubs=options['clubs'], events=options['events'],
+                years=options['years'], seed=options['seed'],
+                batch_size=options['batch_size'], prefix=prefix,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+        summary = ', '.join(f'{count} {model}' for model, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Created {summary} in {elapsed:.1f}s.'))
+        self.stdout.write(f'Every account logs in with the password "{PASSWORD}".')
@@ -1,3 +1,19 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class CollectionVersion(models.Model):
+    """
+    Compteur de version d'une collection d'API (ex. 'clubs', 'events:club:3'),
+    incrémenté à chaque écriture. Sert aux ETag / Last-Modified (shared/conditional.py).
+    """
+    key = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Collection Version'
+        verbose_name_plural = 'Collection Versions'
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
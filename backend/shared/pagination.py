@@ -0,0 +1,157 @@
+# shared/pagination.py
+import json
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Pagination par curseur (keyset) sur l'ordering du modèle, départagé par `id`.
+
+    Le curseur encode les valeurs de *toutes* les colonnes d'ordering du dernier
+    élément vu, si bien que chaque page est un simple
+    `WHERE (a, id) > (:a, :id) ORDER BY a, id LIMIT n` : pas d'OFFSET ni de
+    COUNT(*), et le coût d'une page ne dépend pas de sa profondeur.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = None
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(
+            queryset.query.order_by
+            or queryset.model._meta.ordering
+            or self.ordering
+            or ('pk',)
+        )
+        for field in ordering:
+            assert '__' not in field.lstrip('-'), (
+                'Keyset pagination does not support related-field orderings.'
+            )
+        # Départage stable sur la clé primaire, dans le même sens que la clé principale.
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Applique l'ordering, le filtre keyset et la limite. Renvoie le queryset
+        de la page (page_size + 1 lignes, pour détecter la page suivante).
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                field[1:] if field.startswith('-') else '-' + field
+                for field in ordering
+            )
+        queryset = queryset.order_by(*ordering)
+
+        if self.cursor is not None and self.cursor.position is not None:
+            try:
+                queryset = queryset.filter(self._keyset_filter(ordering, self.cursor.position))
+            except (DjangoValidationError, TypeError, ValueError):
+                # Curseur falsifié : valeurs incompatibles avec le type des colonnes.
+                raise NotFound(self.invalid_cursor_message)
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        """
+        Reçoit les lignes issues de `get_page_queryset` et calcule l'état de la page.
+        """
+        self.page = list(results[:self.page_size])
+        has_more = len(results) > len(self.page)
+        has_cursor = self.cursor is not None and self.cursor.position is not None
+
+        if self.cursor is not None and self.cursor.reverse:
+            self.page.reverse()
+            self.has_next = has_cursor
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = has_cursor
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+        try:
+            values = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip('-')
+            if name == 'pk':
+                name = 'id'
+            if isinstance(instance, dict):
+                value = instance[name]
+            else:
+                value = getattr(instance, name)
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            elif value is not None:
+                value = str(value)
+            values.append(value)
+        return json.dumps(values, separators=(',', ':'))
+
+    def _keyset_filter(self, ordering, position):
+        """
+        Construit `(a > x) OR (a = x AND b > y) OR ...` pour la position donnée,
+        chaque comparaison suivant le sens de sa colonne.
+        """
+        values = json.loads(position)
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = '__lt' if field.startswith('-') else '__gt'
+            condition |= equal & Q(**{name + lookup: value})
+            equal &= Q(**{name: value})
+        return condition
@@ -1,7 +1,58 @@
 # shared/permissions.py
+from django.conf import settings
+from django.db import transaction
 from rest_framework import permissions
 from clubs.models import Club
 from memberships.models import Membership
+from .cache import TTLCache
+
+# club_id -> coordinator_id, partagé par les requêtes du processus.
+# Invalidé par shared/signals.py à chaque sauvegarde / suppression de Club.
+coordinator_cache = TTLCache(
+    maxsize=settings.CLUB_COORDINATOR_CACHE_SIZE,
+    ttl=settings.CLUB_COORDINATOR_CACHE_TTL,
+)
+
+# Valeur mise en cache pour un club inexistant.
+NO_CLUB = object()
+NOT_CACHED = object()
+
+
+def forget_coordinator(club_id):
+    """
+    Invalide l'entrée du club, tout de suite et de nouveau au commit : le cache
+    ne contient jamais une valeur non validée (annulée par un rollback), ni
+    l'ancienne valeur relue par une autre requête avant le commit.
+    """
+    coordinator_cache.delete(club_id)
+    transaction.on_commit(lambda: coordinator_cache.delete(club_id))
+
+
+def get_club_coordinator_id(request, club_id):
+    """
+    Renvoie le coordinator_id du club (None si pas de coordinateur, NO_CLUB si
+    le club n'existe pas). Mémoïsé sur la requête, puis dans coordinator_cache :
+    une requête qui vérifie plusieurs objets du même club fait au plus un accès base.
+    """
+    try:
+        club_id = int(club_id)
+    except (TypeError, ValueError):
+        return NO_CLUB
+
+    memo = getattr(request, '_club_coordinators', None)
+    if memo is None:
+        memo = request._club_coordinators = {}
+    if club_id in memo:
+        return memo[club_id]
+
+    coordinator_id = coordinator_cache.get(club_id, NOT_CACHED)
+    if coordinator_id is NOT_CACHED:
+        rows = list(Club.objects.filter(pk=club_id).values_list('coordinator_id', flat=True))
+        coordinator_id = rows[0] if rows else NO_CLUB
+        coordinator_cache.set(club_id, coordinator_id)
+    memo[club_id] = coordinator_id
+    return coordinator_id
+
 
 class IsRVA(permissions.BasePermission):
     """
@@ -23,23 +74,19 @@ class IsClubCoordinator(permissions.BasePermission):
         club_id = view.kwargs.get('club_pk') or request.data.get('club')
         if not club_id:
             return False
-        try:
-            club = Club.objects.get(pk=club_id)
-        except Club.DoesNotExist:
-            return False
         return (
             request.user 
             and request.user.is_authenticated 
-            and club.coordinator_id == request.user.id
+            and get_club_coordinator_id(request, club_id) == request.user.id
         )
 
     def has_object_permission(self, request, view, obj):
-        # obj peut être un Membership, un Event, etc., qui a obj.club
-        return (
-            request.user 
-            and request.user.is_authenticated 
-            and getattr(obj.club, 'coordinator_id', None) == request.user.id
-        )
+        # obj peut être un Membership, un Event, etc., qui a obj.club_id
+        if not (request.user and request.user.is_authenticated):
+            return False
+        if isinstance(obj, Club):
+            return obj.coordinator_id == request.user.id
+        return get_club_coordinator_id(request, obj.club_id) == request.user.id
 
 class IsMembershipOwner(permissions.BasePermission):
     """
@@ -0,0 +1,227 @@
+# shared/profiling.py
+import json
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('shared.profiling')
+
+# Profil de la requête en cours ; suit la requête jusque dans les threads de sync_to_async.
+_current = ContextVar('request_profile', default=None)
+
+_IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Forme normalisée d'une requête : listes IN, littéraux et espaces effacés."""
+    sql = _IN_LIST.sub('(...)', sql)
+    sql = _LITERAL.sub('?', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+class RequestProfile:
+    __slots__ = ('started', 'view_started', 'view_ended', 'render_started', 'render_ended',
+                 'serialize', 'serializing', 'queries')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = self.view_ended = None
+        self.render_started = self.render_ended = None
+        # None tant qu'aucun serializer chronométré n'a produit ses données (voir profiled).
+        self.serialize = None
+        self.serializing = False
+        # (sql, durée) ; empreintes calculées seulement pour les requêtes lentes
+        self.queries = []
+
+    def db_time(self):
+        return sum(duration for _, duration in self.queries)
+
+    def top_queries(self, limit):
+        totals = {}
+        for sql, duration in self.queries:
+            key = fingerprint(sql)
+            count, total = totals.get(key, (0, 0.0))
+            totals[key] = (count + 1, total + duration)
+        ranked = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {'fingerprint': key, 'count': count, 'total_ms': round(total * 1000, 3)}
+            for key, (count, total) in ranked
+        ]
+
+
+def record_query(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries.append((sql, time.perf_counter() - started))
+
+
+def _wrap_connection(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def serializing():
+    """Ajoute la durée du bloc au temps de sérialisation de la requête profilée en cours."""
+    profile = _current.get()
+    # Serializers imbriqués : seul le plus externe est chronométré.
+    if profile is None or profile.serializing:
+        yield
+        return
+    profile.serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.serializing = False
+        profile.serialize = (profile.serialize or 0.0) + time.perf_counter() - started
+
+
+class _TimedSerializer:
+    """Serializer d'une requête profilée : `.data` est chronométré, le reste délégué."""
+
+    def __init__(self, serializer):
+        object.__setattr__(self, '_serializer', serializer)
+
+    @property
+    def data(self):
+        with serializing():
+            return self._serializer.data
+
+    def __getattr__(self, name):
+        return getattr(self._serializer, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._serializer, name, value)
+
+
+def profiled(serializer):
+    """
+    `serializer`, chronométré quand la requête en cours est profilée (voir
+    CompiledListMixin.get_serializer) ; tel quel sinon.
+    """
+    return serializer if _current.get() is None else _TimedSerializer(serializer)
+
+
+_installed = False
+
+
+def install():
+    """Branche le chronométrage SQL (une seule fois par processus)."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    connection_created.connect(_wrap_connection)
+    for connection in connections.all(initialized_only=True):
+        _wrap_connection(connection)
+
+
+def _ms(start, end):
+    return (end - start) * 1000 if start is not None and end is not None else None
+
+
+class ProfilingMiddleware:
+    """
+    Mesure chaque requête quand REQUEST_PROFILING est activé : nombre et durée
+    des requêtes SQL, temps de sérialisation, de vue et de rendu, renvoyés dans
+    un en-tête Server-Timing. La sérialisation n'est mesurée que dans les vues
+    à CompiledListMixin (voir profiled) : ailleurs, elle est absente de
+    l'en-tête et du journal plutôt que comptée à zéro. Au-delà de
+    REQUEST_PROFILING_SLOW_MS ou de REQUEST_PROFILING_SLOW_QUERIES, un
+    enregistrement JSON est écrit sur le logger `shared.profiling` avec les
+    empreintes SQL les plus coûteuses.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        profile = request._profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = request._profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, profile)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._profile.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Réponses DRF : la vue a rendu la main, le rendu (JSON...) suit.
+        profile = request._profile
+        profile.view_ended = profile.render_started = time.perf_counter()
+
+        def rendered(response):
+            profile.render_ended = time.perf_counter()
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, profile):
+        ended = time.perf_counter()
+        if profile.view_started is not None and profile.view_ended is None:
+            profile.view_ended = ended
+        timings = {
+            'db': profile.db_time() * 1000,
+            'serialize': profile.serialize * 1000 if profile.serialize is not None else None,
+            'view': _ms(profile.view_started, profile.view_ended),
+            'render': _ms(profile.render_started, profile.render_ended),
+            'total': (ended - profile.started) * 1000,
+        }
+        metrics = [f'db;dur={timings["db"]:.2f};desc="{len(profile.queries)} queries"']
+        metrics += [f'{name};dur={value:.2f}' for name, value in list(timings.items())[1:] if value is not None]
+        if response.has_header('Server-Timing'):
+            metrics.insert(0, response['Server-Timing'])
+        response['Server-Timing'] = ', '.join(metrics)
+
+        if (timings['total'] >= settings.REQUEST_PROFILING_SLOW_MS
+                or len(profile.queries) >= settings.REQUEST_PROFILING_SLOW_QUERIES):
+            match = request.resolver_match
+            logger.warning(json.dumps({
+                'event': 'slow_request',
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'user': getattr(getattr(request, 'user', None), 'pk', None),
+                'queries': len(profile.queries),
+                **{f'{name}_ms': round(value, 3) for name, value in timings.items() if value is not None},
+                'top_queries': profile.top_queries(settings.REQUEST_PROFILING_TOP_QUERIES),
+            }))
+        return response
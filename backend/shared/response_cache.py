@@ -0,0 +1,101 @@
+# shared/response_cache.py
+import functools
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from .conditional import request_validators
+
+_stats = {'hits': 0, 'misses': 0, 'stampede_waits': 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def response_cache_stats():
+    """Compteurs du processus : hits, misses et attentes sur verrou anti-stampede."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def visibility_class(request):
+    """Catégorie d'appelant dont dépend la réponse (rôle, staff)."""
+    user = request.user
+    if not (user and user.is_authenticated):
+        return 'anonymous'
+    return f'{user.role}:staff' if user.is_staff else user.role
+
+
+def cached_response(keys_func, model=None, time_sensitive=False):
+    """
+    Décorateur de méthode de vue DRF : met en cache les données des réponses 200
+    dans le cache RESPONSE_CACHE_ALIAS.
+
+    La clé combine l'endpoint, les kwargs d'URL, la catégorie de l'appelant et
+    les validateurs de shared.conditional (versions des collections `keys_func`,
+    updated_at de l'objet, paramètres de requête). Toute écriture sur Club,
+    Membership, Event ou CustomUser incrémente une version : les clés concernées
+    changent, les autres restent valides.
+
+    Quand une clé manque, un seul processus la recalcule (verrou `cache.add`) ;
+    les autres attendent jusqu'à RESPONSE_CACHE_LOCK_WAIT secondes.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            etag, _ = request_validators(request, kwargs, keys_func, model, time_sensitive)
+            if etag is None:
+                return method(self, request, *args, **kwargs)
+
+            cache = caches[settings.RESPONSE_CACHE_ALIAS]
+            url_kwargs = ','.join(f'{name}={value}' for name, value in sorted(kwargs.items()))
+            key = (
+                f'response:{type(self).__name__}.{method.__name__}:{url_kwargs}:'
+                f'{request.get_host()}:{visibility_class(request)}:{etag}'
+            )
+
+            cached = cache.get(key)
+            if cached is None:
+                lock_key = key + ':lock'
+                if cache.add(lock_key, 1, settings.RESPONSE_CACHE_LOCK_WAIT * 2):
+                    try:
+                        return _store(cache, key, method(self, request, *args, **kwargs))
+                    finally:
+                        cache.delete(lock_key)
+                cached = _wait_for(cache, key)
+                if cached is None:
+                    return _store(cache, key, method(self, request, *args, **kwargs))
+
+            _count('hits')
+            status, data = cached
+            response = Response(data, status=status)
+            response['X-Response-Cache'] = 'hit'
+            return response
+        return wrapper
+    return decorator
+
+
+def _store(cache, key, response):
+    _count('misses')
+    if response.status_code == 200 and isinstance(response, Response):
+        cache.set(key, (response.status_code, response.data), settings.RESPONSE_CACHE_TIMEOUT)
+    response['X-Response-Cache'] = 'miss'
+    return response
+
+
+def _wait_for(cache, key):
+    """Attend qu'un autre processus remplisse `key`, au plus RESPONSE_CACHE_LOCK_WAIT s."""
+    _count('stampede_waits')
+    deadline = time.monotonic() + settings.RESPONSE_CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(0.01)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    return None
@@ -0,0 +1,76 @@
+# shared/signals.py
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from clubs.models import Club, ClubCreationRequest
+from events.models import Event
+from memberships.models import Membership
+from .authentication import invalidate_token
+from .conditional import bump_versions
+from .permissions import forget_coordinator
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def forget_user_tokens(sender, instance, update_fields=None, **kwargs):
+    # role / is_active (et le reste du profil) doivent être relus ; la mise à
+    # jour de last_login à la connexion ne change rien à l'autorisation.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    for key in Token.objects.filter(user_id=instance.pk).values_list('key', flat=True):
+        invalidate_token(key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def bump_user_versions(sender, instance, update_fields=None, **kwargs):
+    # Les clubs dont l'utilisateur est membre ou coordinateur exposent son profil ;
+    # 'users' couvre les utilisateurs imbriqués par ?expand=.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    club_ids = set(Membership.objects.filter(user_id=instance.pk).values_list('club_id', flat=True))
+    club_ids.update(Club.objects.filter(coordinator_id=instance.pk).values_list('pk', flat=True))
+    bump_versions('users', *(f'users:club:{club_id}' for club_id in club_ids))
+
+
+@receiver(post_save, sender=Club)
+@receiver(post_delete, sender=Club)
+def forget_cached_coordinator(sender, instance, **kwargs):
+    forget_coordinator(instance.pk)
+
+
+def club_ids(instance):
+    """Club actuel et, s'il a changé depuis le chargement, club d'origine."""
+    return {instance.club_id, getattr(instance, '_loaded_club_id', None)} - {None}
+
+
+@receiver(post_save, sender=Club)
+@receiver(post_delete, sender=Club)
+def bump_club_versions(sender, instance, **kwargs):
+    bump_versions('clubs')
+
+
+@receiver(post_save, sender=ClubCreationRequest)
+@receiver(post_delete, sender=ClubCreationRequest)
+def bump_club_request_versions(sender, instance, **kwargs):
+    bump_versions('clubrequests')
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def bump_event_versions(sender, instance, **kwargs):
+    bump_versions('events', *(f'events:club:{club_id}' for club_id in club_ids(instance)))
+    instance._loaded_club_id = instance.club_id
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def bump_membership_versions(sender, instance, **kwargs):
+    bump_versions('memberships', *(f'memberships:club:{club_id}' for club_id in club_ids(instance)))
+    instance._loaded_club_id = instance.club_id
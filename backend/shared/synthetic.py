@@ -0,0 +1,194 @@
+# shared/synthetic.py
+import random
+from datetime import timedelta
+from itertools import accumulate
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from clubs.models import Club, ClubCreationRequest
+from events.models import Event, location_key
+from memberships.models import Membership
+from search.index import index_objects
+from shared.conditional import bump_versions
+from shared.enums import (
+    ClubStatus, EventStatus, EventType, MembershipRole, MembershipStatus, RequestStatus, Role,
+)
+from users.models import CustomUser
+
+PASSWORD = 'synthetic'
+
+FIRST_NAMES = (
+    'Amine', 'Sarah', 'Youssef', 'Lina', 'Omar', 'Inès', 'Mehdi', 'Yasmine', 'Karim', 'Nour',
+    'Adam', 'Salma', 'Rayan', 'Meriem', 'Hamza', 'Aya', 'Ilyes', 'Maram', 'Walid', 'Rania',
+)
+LAST_NAMES = (
+    'Ben Ali', 'Trabelsi', 'Gharbi', 'Jaziri', 'Hammami', 'Bouazizi', 'Mansour', 'Chaabane',
+    'Khelifi', 'Sassi', 'Mejri', 'Ayari', 'Dridi', 'Baccouche', 'Haddad', 'Zouari',
+)
+THEMES = (
+    'Robotique', 'Théâtre', 'Photographie', 'Échecs', 'Musique', 'Débat', 'Cinéma', 'Danse',
+    'Informatique', 'Entrepreneuriat', 'Astronomie', 'Environnement', 'Lecture', 'Football',
+    'Basketball', 'Randonnée', 'Cuisine', 'Langues', 'Bénévolat', 'Jeux vidéo',
+)
+EVENT_KINDS = (
+    'Atelier', 'Conférence', 'Tournoi', 'Hackathon', 'Soirée', 'Formation', 'Projection',
+    'Concert', 'Sortie', 'Réunion', 'Exposition', 'Compétition',
+)
+WORDS = (
+    'initiation', 'avancé', 'découverte', 'pratique', 'projet', 'équipe', 'intervenant',
+    'inscription', 'gratuit', 'ouvert', 'étudiants', 'campus', 'partenaire', 'prix', 'session',
+    'matériel', 'fourni', 'débutants', 'bienvenue', 'programme', 'pause', 'café', 'échange',
+)
+ROOMS = (
+    [f'Amphi {letter}' for letter in 'ABCDE']
+    + [f'Salle {block}-{number}' for block in 'ABC' for number in range(1, 16)]
+    + ['Foyer', 'Gymnase', 'Bibliothèque', 'Cour centrale', 'Salle polyvalente']
+)
+
+
+def zipf_weights(count, exponent=1.1):
+    """Poids cumulés d'une loi de Zipf : quelques clubs très suivis, une longue traîne."""
+    return list(accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+
+def sentence(rng, words=12):
+    return ' '.join(rng.choices(WORDS, k=words)).capitalize() + '.'
+
+
+def generate(users=10_000, clubs=200, events=50_000, years=4, seed=0, batch_size=5000, prefix='synthetic'):
+    """
+    Remplit la base avec un campus fictif, reproductible pour une graine
+    donnée, avec bulk_create uniquement :
+
+    - `users` comptes : un RVA pour 2000, un coordinateur par club plus un
+      sur cinq en attente de réponse ou refusé, le reste en membres ;
+    - `clubs` clubs issus d'une demande approuvée, plus les demandes en
+      attente et refusées ;
+    - des adhésions réparties selon une loi de Zipf (peu de clubs très suivis) ;
+    - `events` événements sur `years` années, jusqu'à trois mois dans le futur,
+      eux aussi concentrés sur les clubs populaires.
+
+    Renvoie le nombre de lignes créées par modèle.
+    """
+    rng = random.Random(seed)
+    rvas = max(1, users // 2000)
+    applicants = max(1, clubs // 5)
+    members = users - rvas - clubs - applicants
+    if members < 0:
+        raise ValueError(f'{users} users cannot staff {clubs} clubs.')
+    password = make_password(PASSWORD)
+    now = timezone.now()
+
+    def user(i, role):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        return CustomUser(
+            username=f'{prefix}-{role}-{i}', password=password, role=role,
+            first_name=first, last_name=last, email=f'{prefix}.{role}.{i}@example.com',
+        )
+
+    with transaction.atomic():
+        rva = CustomUser.objects.bulk_create(
+            [user(i, Role.STUDENT_LIFE_OFFICER) for i in range(rvas)], batch_size=batch_size
+        )[0]
+        coordinators = CustomUser.objects.bulk_create(
+            [user(i, Role.COORDINATOR) for i in range(clubs + applicants)], batch_size=batch_size
+        )
+        member_users = CustomUser.objects.bulk_create(
+            [user(i, Role.MEMBER) for i in range(members)], batch_size=batch_size
+        )
+
+        names = [f'Club {THEMES[i % len(THEMES)]} {i // len(THEMES) + 1}' for i in range(clubs + applicants)]
+        requests = ClubCreationRequest.objects.bulk_create(
+            [
+                ClubCreationRequest(
+                    club_name=name, description=sentence(rng, 20), coordinator=coordinator,
+                    status=(
+                        RequestStatus.APPROVED if i < clubs
+                        else rng.choice((RequestStatus.PENDING, RequestStatus.REJECTED))
+                    ),
+                    reviewed_at=now if i < clubs else None,
+                    reviewed_by=rva if i < clubs else None,
+                )
+                for i, (name, coordinator) in enumerate(zip(names, coordinators))
+            ],
+            batch_size=batch_size,
+        )
+        club_rows = Club.objects.bulk_create(
+            [
+                Club(
+                    name=request.club_name, description=request.description,
+                    coordinator=request.coordinator, creation_request=request,
+                    status=ClubStatus.ARCHIVED if rng.random() < 0.05 else ClubStatus.ACTIVE,
+                )
+                for request in requests[:clubs]
+            ],
+            batch_size=batch_size,
+        )
+        # Popularité indépendante de l'ordre de création.
+        popular = club_rows[:]
+        rng.shuffle(popular)
+        weights = zipf_weights(len(popular))
+
+        memberships = []
+        for member in member_users:
+            joined = rng.choices((0, 1, 2, 3, 4, 5), (10, 35, 25, 15, 10, 5))[0]
+            picked = {club.pk: club for club in rng.choices(popular, cum_weights=weights, k=joined)}
+            for club in picked.values():
+                status = rng.choices(
+                    (MembershipStatus.ACTIVE, MembershipStatus.PENDING, MembershipStatus.REJECTED),
+                    (80, 15, 5),
+                )[0]
+                role = MembershipRole.MEMBER
+                if status == MembershipStatus.ACTIVE and rng.random() < 0.03:
+                    role = rng.choice(MembershipRole.values)
+                memberships.append(Membership(
+                    user=member, club=club, status=status, role=role,
+                    reviewed_at=None if status == MembershipStatus.PENDING else now,
+                ))
+        Membership.objects.bulk_create(memberships, batch_size=batch_size)
+
+        # Créneaux entre 8 h et 21 h, de `years` ans dans le passé à trois mois dans le futur.
+        first_day = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=365 * years - 90)
+        days = 365 * years
+        event_rows = []
+        for club in rng.choices(popular, cum_weights=weights, k=events):
+            start = first_day + timedelta(
+                days=rng.randrange(days), hours=rng.randint(8, 21), minutes=rng.choice((0, 15, 30, 45))
+            )
+            if rng.random() < 0.05:
+                status = EventStatus.CANCELLED
+            else:
+                status = EventStatus.COMPLETED if start < now else EventStatus.UPCOMING
+            room = rng.choice(ROOMS)
+            event_rows.append(Event(
+                club=club, created_by=club.coordinator,
+                title=f'{rng.choice(EVENT_KINDS)} {club.name.split()[1]} : {rng.choice(WORDS)}',
+                description=sentence(rng, rng.randint(10, 60)),
+                location=room, location_key=location_key(room),
+                start_time=start, end_time=start + timedelta(minutes=rng.choice((60, 90, 120, 180, 240))),
+                event_type=EventType.PRIVATE if rng.random() < 0.3 else EventType.PUBLIC,
+                status=status,
+            ))
+        # Ordre chronologique : les clés suivent les dates, comme en production.
+        event_rows.sort(key=lambda event: event.start_time)
+        event_rows = Event.objects.bulk_create(event_rows, batch_size=batch_size)
+
+        if settings.CLUB_COUNTERS_DENORMALIZED:
+            Club.objects.filter(pk__in=[club.pk for club in club_rows]).refresh_counters()
+        # bulk_create n'émet pas de signaux : index de recherche et versions à la main.
+        for start in range(0, len(club_rows), batch_size):
+            index_objects(club_rows[start:start + batch_size])
+        for start in range(0, len(event_rows), batch_size):
+            index_objects(event_rows[start:start + batch_size])
+        bump_versions('users', 'clubs', 'clubrequests', 'memberships', 'events', 'stats')
+
+    return {
+        'users': rvas + len(coordinators) + len(member_users),
+        'club_requests': len(requests),
+        'clubs': len(club_rows),
+        'memberships': len(memberships),
+        'events': len(event_rows),
+    }
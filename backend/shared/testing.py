@@ -0,0 +1,101 @@
+# shared/testing.py
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from clubs.models import Club
+from events.models import Event
+from memberships.models import Membership
+from shared.conditional import bump_versions
+from shared.enums import MembershipStatus, Role
+from users.models import CustomUser
+
+# Volumes auxquels chaque budget de requêtes est vérifié.
+BUDGET_SCALES = (10, 1_000, 10_000)
+
+
+class QueryBudgetTestCase(APITestCase):
+    """
+    Vérifie qu'un endpoint reste sous un nombre maximal de requêtes SQL,
+    quel que soit le volume de données (voir BUDGET_SCALES).
+
+    Les données sont ajoutées par incréments dans un seul club : à chaque palier
+    le club contient `rows` membres, adhésions et événements.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.coordinator = CustomUser.objects.create_user(
+            username='coordinator', password='secret', role=Role.COORDINATOR
+        )
+        cls.club = Club.objects.create(
+            name='Budget Club', description='Query budget fixtures', coordinator=cls.coordinator
+        )
+
+    def setUp(self):
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        self.client.force_authenticate(self.coordinator)
+        self._rows = 0
+
+    def grow_to(self, rows):
+        """Complète le jeu de données jusqu'à `rows` lignes par table."""
+        start, self._rows = self._rows, rows
+        if rows <= start:
+            return
+        now = timezone.now()
+        users = CustomUser.objects.bulk_create(
+            CustomUser(username=f'member{i:05d}', password='!', role=Role.MEMBER)
+            for i in range(start, rows)
+        )
+        Membership.objects.bulk_create(
+            Membership(user=user, club=self.club, status=MembershipStatus.ACTIVE)
+            for user in users
+        )
+        Event.objects.bulk_create(
+            Event(
+                club=self.club,
+                title=f'Event {i}',
+                description='',
+                start_time=now + timedelta(hours=i),
+                end_time=now + timedelta(hours=i + 1),
+                location='Room A',
+                created_by=self.coordinator,
+            )
+            for i in range(start, rows)
+        )
+        # bulk_create n'émet pas de signaux : invalider comme le ferait le code applicatif.
+        club_id = self.club.pk
+        bump_versions(
+            'users', 'memberships', 'events', f'memberships:club:{club_id}',
+            f'events:club:{club_id}', f'users:club:{club_id}',
+        )
+
+    @contextmanager
+    def assertQueryBudget(self, budget):
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        executed = len(context.captured_queries)
+        if executed > budget:
+            queries = '\n'.join(
+                f'{i}. {query["sql"]}' for i, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(f'{executed} queries executed, budget is {budget}:\n{queries}')
+
+    def assertEndpointBudgets(self, budgets):
+        """
+        `budgets` associe une URL à son nombre maximal de requêtes ; chaque URL
+        est appelée à chaque palier de BUDGET_SCALES.
+        """
+        for rows in BUDGET_SCALES:
+            self.grow_to(rows)
+            for url, budget in budgets.items():
+                with self.subTest(url=url, rows=rows):
+                    with self.assertQueryBudget(budget):
+                        response = self.client.get(url)
+                    self.assertEqual(response.status_code, 200)
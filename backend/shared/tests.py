@@ -1,3 +1,213 @@
-from django.test import TestCase
+import base64
+import json
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+from urllib.parse import urlencode
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import serializers
+
+from clubs.models import Club, ClubCreationRequest
+from events.models import Event
+from memberships.models import Membership
+from search.models import SearchDocument
+from shared.enums import Role
+from shared.management.commands.benchmark_endpoints import Command as BenchmarkEndpoints, route_names
+from shared.permissions import IsClubCoordinator, coordinator_cache
+from shared.profiling import fingerprint
+from shared.synthetic import generate
+from shared.testing import QueryBudgetTestCase
+from users.models import CustomUser
+
+
+class IsClubCoordinatorCacheTests(TestCase):
+    def setUp(self):
+        coordinator_cache.clear()
+        self.coordinator = CustomUser.objects.create_user(username='coord', role=Role.COORDINATOR)
+        self.other = CustomUser.objects.create_user(username='other', role=Role.COORDINATOR)
+        self.club = Club.objects.create(name='Chess', description='', coordinator=self.coordinator)
+        coordinator_cache.clear()
+
+    def request_for(self, user):
+        return SimpleNamespace(user=user, data={})
+
+    def test_objects_of_the_same_club_hit_the_database_once(self):
+        permission = IsClubCoordinator()
+        request = self.request_for(self.coordinator)
+        events = [Event(club_id=self.club.pk) for _ in range(5)]
+        with self.assertNumQueries(1):
+            self.assertTrue(all(
+                permission.has_object_permission(request, None, event) for event in events
+            ))
+        # Nouvelle requête : servie par le cache du processus.
+        with self.assertNumQueries(0):
+            self.assertTrue(permission.has_object_permission(
+                self.request_for(self.coordinator), None, events[0]
+            ))
+
+    def test_coordinator_change_invalidates_cache(self):
+        permission = IsClubCoordinator()
+        event = Event(club_id=self.club.pk)
+        self.assertTrue(permission.has_object_permission(self.request_for(self.coordinator), None, event))
+        self.club.coordinator = self.other
+        self.club.save()
+        self.assertFalse(permission.has_object_permission(self.request_for(self.coordinator), None, event))
+        self.assertTrue(permission.has_object_permission(self.request_for(self.other), None, event))
+
+    def test_rolled_back_save_leaves_no_cached_coordinator(self):
+        permission = IsClubCoordinator()
+        event = Event(club_id=self.club.pk)
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.club.coordinator = self.other
+                self.club.save()
+                raise RuntimeError('rollback')
+        self.assertFalse(permission.has_object_permission(self.request_for(self.other), None, event))
+        self.assertTrue(permission.has_object_permission(self.request_for(self.coordinator), None, event))
+
+
+class KeysetPaginationTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        # Ex aequo sur la clé d'ordering : seul l'id les départage.
+        Club.objects.bulk_create(
+            Club(name=name, description='') for name in ('Alpha', 'Same', 'Same', 'Same', 'Zulu')
+        )
+        start = timezone.now().replace(microsecond=0)
+        Event.objects.bulk_create(
+            Event(
+                club=self.club, title=f'Event {i}', description='', location='Room A',
+                start_time=start + timedelta(hours=i // 2), end_time=start + timedelta(hours=i // 2 + 1),
+                created_by=self.coordinator,
+            )
+            for i in range(7)
+        )
+
+    def walk(self, url, direction='next', **params):
+        pages = []
+        response = self.client.get(url, {'page_size': 2, **params})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            pages.append([row['id'] for row in response.data['results']])
+            if not response.data[direction]:
+                return pages, response
+            response = self.client.get(response.data[direction])
+
+    def test_pages_follow_the_ordering_with_ties(self):
+        expected = {
+            '/api/clubs/': list(Club.objects.order_by('name', 'id').values_list('id', flat=True)),
+            '/api/events/': list(Event.objects.order_by('-start_time', '-id').values_list('id', flat=True)),
+        }
+        for url, ids in expected.items():
+            with self.subTest(url=url):
+                pages, last = self.walk(url)
+                self.assertEqual(sum(pages, []), ids)
+                self.assertIsNone(last.data['next'])
+                # Retour en arrière depuis la dernière page : mêmes pages, dans l'ordre inverse.
+                back = [pages[-1]]
+                response = last
+                while response.data['previous']:
+                    response = self.client.get(response.data['previous'])
+                    back.append([row['id'] for row in response.data['results']])
+                self.assertEqual(back[::-1], pages)
+
+    def cursor(self, position):
+        return base64.b64encode(urlencode({'p': position}).encode()).decode()
+
+    def test_invalid_cursors_are_not_found(self):
+        for cursor in ('garbage', self.cursor('not json'), self.cursor('["2031-01-01T00:00:00+00:00"]'),
+                       self.cursor('["not a date","1"]'), self.cursor('["2031-01-01T00:00:00+00:00","x"]'),
+                       self.cursor('{"a":1}')):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get('/api/events/', {'cursor': cursor}).status_code, 404)
+
+
+class ExplainQuerysetsTests(QueryBudgetTestCase):
+    def test_reports_the_indexes_of_every_list_view(self):
+        self.grow_to(10)
+        out = StringIO()
+        call_command('explain_querysets', '--min-rows', '0', stdout=out, stderr=StringIO())
+        lines = dict(line.split(': ', 1) for line in out.getvalue().splitlines())
+        self.assertIn('club_name_id_idx', lines['clubs.views.ClubViewSet'])
+        self.assertIn('event_start_id_idx', lines['events.views.EventViewSet'])
+        self.assertIn('membership_joined_id_idx', lines['memberships.views.MembershipViewSet'])
+        self.assertIn('clubrequest_submitted_idx', lines['clubs.views.ClubCreationRequestViewSet'])
+        self.assertNotIn('SEQ SCAN', out.getvalue())
+
+
+class SyntheticDataTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.counts = generate(users=300, clubs=10, events=200, years=2, seed=1)
+
+    def test_generates_every_model_at_the_requested_scale(self):
+        self.assertEqual(self.counts['users'], CustomUser.objects.count())
+        self.assertEqual(CustomUser.objects.count(), 300)
+        self.assertEqual(Club.objects.count(), 10)
+        self.assertEqual(ClubCreationRequest.objects.count(), 12)
+        self.assertEqual(Event.objects.count(), 200)
+        self.assertEqual(set(CustomUser.objects.values_list('role', flat=True)), set(Role.values))
+        self.assertEqual(SearchDocument.objects.count(), 210)
+
+    def test_memberships_are_skewed_towards_a_few_clubs(self):
+        sizes = sorted(
+            (Membership.objects.filter(club=club).count() for club in Club.objects.all()), reverse=True
+        )
+        self.assertEqual(sum(sizes), self.counts['memberships'])
+        self.assertGreater(sizes[0], 4 * sizes[-1])
+
+    def test_endpoint_benchmark_covers_every_route(self):
+        endpoints = BenchmarkEndpoints().endpoints(calls=2)
+        self.assertEqual(route_names() - {endpoint.route for endpoint in endpoints}, set())
+
+
+class ProfilingMiddlewareTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.grow_to(10)
+
+    def test_disabled_by_default(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/events/'))
+
+    @override_settings(REQUEST_PROFILING=True, REQUEST_PROFILING_SLOW_MS=60_000)
+    def test_server_timing_header(self):
+        response = self.client.get('/api/events/')
+        metrics = dict(metric.split(';', 1)[0:2] for metric in response['Server-Timing'].split(', '))
+        self.assertEqual(set(metrics), {'db', 'serialize', 'view', 'render', 'total'})
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+        self.assertGreater(float(metrics['serialize'].removeprefix('dur=')), 0)
+        # Chronométrage porté par la vue : les classes de DRF restent intactes.
+        self.assertFalse(hasattr(serializers.Serializer.data.fget, '__wrapped__'))
+
+    @override_settings(REQUEST_PROFILING=True, REQUEST_PROFILING_SLOW_MS=60_000)
+    def test_unmeasured_serialization_is_left_out(self):
+        response = self.client.get('/auth/me/')
+        self.assertEqual(response.status_code, 200)
+        names = {metric.split(';', 1)[0] for metric in response['Server-Timing'].split(', ')}
+        self.assertEqual(names, {'db', 'view', 'render', 'total'})
+
+    @override_settings(REQUEST_PROFILING=True, REQUEST_PROFILING_SLOW_MS=60_000)
+    def test_profiled_writes_behave_as_usual(self):
+        response = self.client.patch(f'/api/clubs/{self.club.pk}/', {'description': 'Profiled'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['description'], 'Profiled')
+        self.assertIn('serialize;dur=', response['Server-Timing'])
+
+    @override_settings(REQUEST_PROFILING=True, REQUEST_PROFILING_SLOW_QUERIES=1)
+    def test_slow_request_record_lists_sql_fingerprints(self):
+        with self.assertLogs('shared.profiling', 'WARNING') as logs:
+            self.client.get(f'/api/clubs/{self.club.pk}/members/')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'club-members')
+        self.assertEqual(record['queries'], sum(query['count'] for query in record['top_queries']))
+        self.assertTrue(any('"memberships_membership"' in query['fingerprint'] for query in record['top_queries']))
+
+    def test_fingerprint_folds_literals_and_in_lists(self):
+        self.assertEqual(
+            fingerprint("SELECT *  FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"),
+            'SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?',
+        )
@@ -0,0 +1,75 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from clubs.models import ClubCreationRequest
+from events.models import Event
+from memberships.models import Membership
+from shared.benchmark import benchmark_database, measure
+from shared.enums import EventStatus, MembershipStatus, StatsMetric
+from shared.synthetic import generate
+from stats.models import StatsBucket
+from stats.refresh import refresh
+
+
+class Command(BaseCommand):
+    help = (
+        'Time a full and an incremental refresh_stats on a synthetic campus, then '
+        'the dashboard reads from the summary tables next to the same GROUP BY on the raw tables.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--clubs', type=int, default=200)
+        parser.add_argument('--events', type=int, default=50_000)
+        parser.add_argument('--changed', type=int, default=500, help='Rows touched before the incremental run.')
+        parser.add_argument('--iterations', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            scale = generate(users=options['users'], clubs=options['clubs'], events=options['events'])
+            self.stdout.write(f'scale: {scale}')
+            # Données « anciennes » : hors de la fenêtre de recouvrement du prochain passage.
+            yesterday = timezone.now() - timedelta(days=1)
+            for model in (Membership, Event, ClubCreationRequest):
+                model.objects.update(updated_at=yesterday)
+
+            self.timed('full refresh', lambda: refresh(full=True))
+            self.timed('no-op refresh', refresh)
+            events = list(Event.objects.order_by('?').values_list('pk', flat=True)[:options['changed']])
+            Event.objects.filter(pk__in=events).update(status=EventStatus.CANCELLED, updated_at=timezone.now())
+            self.timed(f'incremental refresh ({len(events)} events changed)', refresh)
+
+            raw = {
+                'events by month (raw)': lambda: list(
+                    Event.objects.exclude(status=EventStatus.CANCELLED)
+                    .annotate(month=TruncMonth('start_time')).values('month', 'event_type')
+                    .annotate(count=Count('id')).order_by('month')
+                ),
+                'members by club (raw)': lambda: list(
+                    Membership.objects.filter(status=MembershipStatus.ACTIVE)
+                    .annotate(month=TruncMonth('joined_at')).values('club_id', 'month')
+                    .annotate(count=Count('id')).order_by('club_id', 'month')
+                ),
+                'events by month (buckets)': lambda: list(
+                    StatsBucket.objects.filter(metric=StatsMetric.EVENTS)
+                    .values_list('month', 'key', 'count').order_by('month')
+                ),
+                'members by club (buckets)': lambda: list(
+                    StatsBucket.objects.filter(metric=StatsMetric.MEMBERS)
+                    .values_list('club_id', 'month', 'count').order_by('club_id', 'month')
+                ),
+            }
+            for name, query in raw.items():
+                summary = measure(query, options['iterations'], warmup=2)
+                self.stdout.write(f'{name:<28} p50 {summary["p50_ms"]:8.2f} ms  p95 {summary["p95_ms"]:8.2f} ms')
+
+    def timed(self, label, func):
+        started = time.perf_counter()
+        processed = func()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'{label:<40} {elapsed * 1000:9.1f} ms  {processed}')
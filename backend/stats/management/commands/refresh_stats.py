@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from stats.refresh import refresh
+
+
+class Command(BaseCommand):
+    help = (
+        'Update the RVA dashboard summary tables from the rows changed since the '
+        'previous run (schedule it, e.g. every few minutes).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every bucket from the source tables.')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        processed = refresh(full=options['full'], batch_size=options['batch_size'])
+        summary = ', '.join(f'{count} {name}' for name, count in processed.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Refreshed stats in {time.perf_counter() - started:.2f}s ({summary}).'
+        ))
@@ -0,0 +1,121 @@
+# Generated by Django 4.2.20 on 2026-10-18 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="StatsBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("members", "Members joined"),
+                            ("events", "Events"),
+                            ("membership_reviews", "Membership reviews"),
+                            ("club_requests", "Club creation requests"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("club_id", models.PositiveBigIntegerField(default=0)),
+                ("key", models.CharField(blank=True, default="", max_length=30)),
+                ("count", models.BigIntegerField(default=0)),
+                ("total_seconds", models.FloatField(default=0)),
+            ],
+            options={
+                "verbose_name": "Stats Bucket",
+                "verbose_name_plural": "Stats Buckets",
+            },
+        ),
+        migrations.CreateModel(
+            name="StatsFact",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=30)),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("data", models.JSONField(default=list)),
+            ],
+            options={
+                "verbose_name": "Stats Fact",
+                "verbose_name_plural": "Stats Facts",
+            },
+        ),
+        migrations.CreateModel(
+            name="StatsRefresh",
+            fields=[
+                (
+                    "source",
+                    models.CharField(max_length=30, primary_key=True, serialize=False),
+                ),
+                ("refreshed_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Stats Refresh",
+                "verbose_name_plural": "Stats Refreshes",
+            },
+        ),
+        migrations.CreateModel(
+            name="StatsTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=30)),
+                ("object_id", models.PositiveBigIntegerField()),
+            ],
+            options={
+                "verbose_name": "Stats Tombstone",
+                "verbose_name_plural": "Stats Tombstones",
+                "indexes": [
+                    models.Index(
+                        fields=["source", "object_id"], name="statstombstone_source_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="statsfact",
+            constraint=models.UniqueConstraint(
+                fields=("source", "object_id"), name="statsfact_source_object_uniq"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="statsbucket",
+            constraint=models.UniqueConstraint(
+                fields=("metric", "month", "club_id", "key"),
+                name="statsbucket_cell_uniq",
+            ),
+        ),
+    ]
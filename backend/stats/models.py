@@ -0,0 +1,81 @@
+from django.db import models
+
+from shared.enums import StatsMetric
+
+
+class StatsBucket(models.Model):
+    """
+    One aggregated cell of the RVA dashboard: `count` rows and the sum of a
+    duration (`total_seconds`) for a metric, a month and a `key` (event type,
+    review status...). `club_id` is 0 for campus-wide metrics.
+    """
+    metric = models.CharField(max_length=30, choices=StatsMetric.choices)
+    month = models.DateField()
+    # Pas de clé étrangère : les compteurs d'un club supprimé sont retirés par le rafraîchissement.
+    club_id = models.PositiveBigIntegerField(default=0)
+    key = models.CharField(max_length=30, blank=True, default='')
+    count = models.BigIntegerField(default=0)
+    total_seconds = models.FloatField(default=0)
+
+    class Meta:
+        verbose_name = 'Stats Bucket'
+        verbose_name_plural = 'Stats Buckets'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['metric', 'month', 'club_id', 'key'], name='statsbucket_cell_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.metric} {self.month:%Y-%m} club={self.club_id} {self.key}: {self.count}'
+
+
+class StatsFact(models.Model):
+    """
+    What one source row currently contributes to the buckets, as a list of
+    [metric, month, club_id, key, seconds]. The refresh subtracts the old
+    contribution and adds the new one, so a row that moved (rescheduled
+    event, reviewed membership) leaves its previous bucket.
+    """
+    source = models.CharField(max_length=30)
+    object_id = models.PositiveBigIntegerField()
+    data = models.JSONField(default=list)
+
+    class Meta:
+        verbose_name = 'Stats Fact'
+        verbose_name_plural = 'Stats Facts'
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'object_id'], name='statsfact_source_object_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.source} #{self.object_id}'
+
+
+class StatsTombstone(models.Model):
+    """A deleted source row whose contribution the next refresh removes."""
+    source = models.CharField(max_length=30)
+    object_id = models.PositiveBigIntegerField()
+
+    class Meta:
+        verbose_name = 'Stats Tombstone'
+        verbose_name_plural = 'Stats Tombstones'
+        indexes = [
+            models.Index(fields=['source', 'object_id'], name='statstombstone_source_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.source} #{self.object_id} (deleted)'
+
+
+class StatsRefresh(models.Model):
+    """Watermark of each source: rows updated since `refreshed_at` are processed next."""
+    source = models.CharField(max_length=30, primary_key=True)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Stats Refresh'
+        verbose_name_plural = 'Stats Refreshes'
+
+    def __str__(self):
+        return f'{self.source} @ {self.refreshed_at:%Y-%m-%d %H:%M}'
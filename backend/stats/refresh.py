@@ -0,0 +1,181 @@
+from collections import defaultdict
+from datetime import timedelta
+from itertools import islice
+from typing import Callable, NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from clubs.models import ClubCreationRequest
+from events.models import Event
+from memberships.models import Membership
+from shared.conditional import bump_versions
+from shared.enums import EventStatus, MembershipStatus, RequestStatus, StatsMetric
+from .models import StatsBucket, StatsFact, StatsRefresh, StatsTombstone
+
+
+def month_of(moment):
+    """First day of the month of `moment`, in the current timezone, as 'YYYY-MM-01'."""
+    return timezone.localtime(moment).date().replace(day=1).isoformat()
+
+
+def membership_contributions(row):
+    cells = []
+    if row.status == MembershipStatus.ACTIVE:
+        # Membres actifs par mois d'arrivée : leur somme cumulée donne l'effectif du club.
+        cells.append([StatsMetric.MEMBERS, month_of(row.reviewed_at or row.joined_at), row.club_id, '', 0.0])
+    if row.status != MembershipStatus.PENDING and row.reviewed_at is not None:
+        latency = max(0.0, (row.reviewed_at - row.joined_at).total_seconds())
+        cells.append([StatsMetric.MEMBERSHIP_REVIEWS, month_of(row.reviewed_at), 0, row.status, latency])
+    return cells
+
+
+def event_contributions(row):
+    if row.status == EventStatus.CANCELLED:
+        return []
+    return [[StatsMetric.EVENTS, month_of(row.start_time), 0, row.event_type, 0.0]]
+
+
+def club_request_contributions(row):
+    if row.status == RequestStatus.PENDING or row.reviewed_at is None:
+        return [[StatsMetric.CLUB_REQUESTS, month_of(row.submitted_at), 0, row.status, 0.0]]
+    turnaround = max(0.0, (row.reviewed_at - row.submitted_at).total_seconds())
+    return [[StatsMetric.CLUB_REQUESTS, month_of(row.reviewed_at), 0, row.status, turnaround]]
+
+
+class Source(NamedTuple):
+    name: str
+    model: type
+    fields: tuple
+    contributions: Callable
+
+
+SOURCES = (
+    Source('membership', Membership, ('id', 'club_id', 'status', 'joined_at', 'reviewed_at'),
+           membership_contributions),
+    Source('event', Event, ('id', 'start_time', 'event_type', 'status'), event_contributions),
+    Source('club_request', ClubCreationRequest, ('id', 'status', 'submitted_at', 'reviewed_at'),
+           club_request_contributions),
+)
+SOURCE_NAMES = {source.model: source.name for source in SOURCES}
+
+
+def _add(deltas, cells, sign):
+    for metric, month, club_id, key, seconds in cells:
+        delta = deltas[(metric, month, club_id, key)]
+        delta[0] += sign
+        delta[1] += sign * seconds
+
+
+def _apply_rows(source, rows, deltas):
+    facts = {
+        fact.object_id: fact
+        for fact in StatsFact.objects.filter(source=source.name, object_id__in=[row.id for row in rows])
+    }
+    created, updated, emptied = [], [], []
+    for row in rows:
+        cells = source.contributions(row)
+        fact = facts.get(row.id)
+        old = fact.data if fact is not None else []
+        if old == cells:
+            continue
+        _add(deltas, old, -1)
+        _add(deltas, cells, +1)
+        if fact is None:
+            created.append(StatsFact(source=source.name, object_id=row.id, data=cells))
+        elif cells:
+            fact.data = cells
+            updated.append(fact)
+        else:
+            emptied.append(fact.pk)
+    StatsFact.objects.bulk_create(created)
+    StatsFact.objects.bulk_update(updated, ['data'])
+    StatsFact.objects.filter(pk__in=emptied).delete()
+    return len(created) + len(updated) + len(emptied)
+
+
+def _apply_tombstones(source, deltas):
+    tombstones = dict(StatsTombstone.objects.filter(source=source.name).values_list('pk', 'object_id'))
+    if not tombstones:
+        return 0
+    deleted = set(tombstones.values())
+    facts = StatsFact.objects.filter(source=source.name, object_id__in=deleted)
+    for data in facts.values_list('data', flat=True):
+        _add(deltas, data, -1)
+    facts.delete()
+    # Seulement les marqueurs lus : ceux validés depuis par d'autres transactions attendent le prochain passage.
+    StatsTombstone.objects.filter(pk__in=tombstones).delete()
+    return len(deleted)
+
+
+def _apply_deltas(deltas):
+    """Add the deltas to their buckets; a bucket whose count drops to zero is removed."""
+    deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+    if not deltas:
+        return 0
+    existing = {}
+    for metric in {key[0] for key in deltas}:
+        months = {key[1] for key in deltas if key[0] == metric}
+        for bucket in StatsBucket.objects.filter(metric=metric, month__in=months):
+            existing[(bucket.metric, bucket.month.isoformat(), bucket.club_id, bucket.key)] = bucket
+    created, updated, emptied = [], [], []
+    for (metric, month, club_id, key), (count, seconds) in deltas.items():
+        bucket = existing.get((metric, month, club_id, key))
+        if bucket is None:
+            if count > 0:
+                created.append(StatsBucket(
+                    metric=metric, month=month, club_id=club_id, key=key, count=count, total_seconds=seconds
+                ))
+            continue
+        bucket.count += count
+        bucket.total_seconds += seconds
+        if bucket.count > 0:
+            updated.append(bucket)
+        else:
+            emptied.append(bucket.pk)
+    StatsBucket.objects.bulk_create(created)
+    StatsBucket.objects.bulk_update(updated, ['count', 'total_seconds'])
+    StatsBucket.objects.filter(pk__in=emptied).delete()
+    return len(deltas)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def refresh(full=False, batch_size=2000):
+    """
+    Bring the buckets up to date. Returns, per source, the number of rows
+    whose contribution changed, and under 'buckets' the number of cells changed.
+
+    Only rows whose updated_at is past the previous run's watermark are
+    read (minus STATS_REFRESH_OVERLAP seconds, for transactions that
+    committed late: re-reading a row is a no-op), plus the rows deleted
+    since. `full` rebuilds everything from the source tables.
+    """
+    started = timezone.now()
+    overlap = timedelta(seconds=settings.STATS_REFRESH_OVERLAP)
+    processed = {}
+    deltas = defaultdict(lambda: [0, 0.0])
+    with transaction.atomic():
+        # Un seul rafraîchissement à la fois (les autres attendent le verrou).
+        watermarks = dict(StatsRefresh.objects.select_for_update().values_list('source', 'refreshed_at'))
+        if full:
+            for model in (StatsBucket, StatsFact, StatsTombstone, StatsRefresh):
+                model.objects.all().delete()
+            watermarks = {}
+        for source in SOURCES:
+            rows = source.model.objects.order_by()
+            if source.name in watermarks:
+                rows = rows.filter(updated_at__gte=watermarks[source.name] - overlap)
+            rows = rows.values_list(*source.fields, named=True).iterator(chunk_size=batch_size)
+            processed[source.name] = sum(_apply_rows(source, chunk, deltas) for chunk in _chunks(rows, batch_size))
+            processed[source.name] += _apply_tombstones(source, deltas)
+            StatsRefresh.objects.update_or_create(source=source.name, defaults={'refreshed_at': started})
+        processed['buckets'] = _apply_deltas(deltas)
+        if processed['buckets']:
+            bump_versions('stats')
+    return processed
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from clubs.models import ClubCreationRequest
+from events.models import Event
+from memberships.models import Membership
+from .models import StatsTombstone
+from .refresh import SOURCE_NAMES
+
+
+@receiver(post_delete, sender=Membership)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=ClubCreationRequest)
+def record_deletion(sender, instance, **kwargs):
+    # Une ligne supprimée n'a plus d'updated_at : le prochain rafraîchissement la retire via ce marqueur.
+    StatsTombstone.objects.create(source=SOURCE_NAMES[sender], object_id=instance.pk)
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from events.models import Event
+from memberships.models import Membership
+from shared.enums import EventType, MembershipStatus, Role
+from shared.testing import QueryBudgetTestCase
+from users.models import CustomUser
+from . import refresh as refresh_module
+from .models import StatsTombstone
+from .refresh import month_of, refresh
+
+
+class StatsDashboardTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.grow_to(3)
+        self.rva = CustomUser.objects.create_user(
+            username='rva', password='secret', role=Role.STUDENT_LIFE_OFFICER
+        )
+
+    def events_per_month(self):
+        self.client.force_authenticate(self.rva)
+        months = self.client.get('/api/stats/events/').data['months']
+        return {month['month']: month['total'] for month in months}
+
+    def test_dashboard_is_for_the_rva_only(self):
+        refresh()
+        self.assertEqual(self.client.get('/api/stats/').status_code, 403)
+        self.client.force_authenticate(self.rva)
+        response = self.client.get('/api/stats/')
+        self.assertEqual(response.data['members'], 3)
+        self.assertEqual(response.data['events'][EventType.PUBLIC], 3)
+        members = self.client.get('/api/stats/members/', {'club': self.club.pk}).data['clubs']
+        self.assertEqual(members[0]['members'], 3)
+
+    def test_incremental_refresh_follows_updates_and_deletes(self):
+        event = Event.objects.first()
+        before = month_of(event.start_time)[:7]
+        refresh()
+        self.assertEqual(refresh()['buckets'], 0)
+
+        event.start_time += timedelta(days=40)
+        event.end_time += timedelta(days=40)
+        event.save()
+        processed = refresh()
+        self.assertEqual(processed['event'], 1)
+        months = self.events_per_month()
+        self.assertEqual(months[month_of(event.start_time)[:7]], 1)
+        self.assertEqual(months.get(before, 0), 2)
+
+        event.delete()
+        refresh()
+        self.assertEqual(sum(self.events_per_month().values()), 2)
+        self.assertEqual(self.events_per_month(), self.rebuilt_events_per_month())
+
+    def test_tombstones_written_during_a_refresh_are_kept(self):
+        refresh()
+        first, second = Event.objects.all()[:2]
+        first.delete()
+        second_id = second.pk
+        real_add = refresh_module._add
+
+        def add_then_delete(*args):
+            # Suppression validée par une autre transaction pendant le rafraîchissement.
+            if Event.objects.filter(pk=second_id).exists():
+                second.delete()
+            return real_add(*args)
+
+        with mock.patch.object(refresh_module, '_add', side_effect=add_then_delete):
+            refresh()
+        self.assertTrue(StatsTombstone.objects.filter(object_id=second_id).exists())
+        refresh()
+        self.assertEqual(self.events_per_month(), self.rebuilt_events_per_month())
+
+    def test_membership_review_latency(self):
+        joiner = CustomUser.objects.create_user(username='joiner', password='secret', role=Role.MEMBER)
+        membership = Membership.objects.create(user=joiner, club=self.club)
+        Membership.objects.filter(pk=membership.pk).update(joined_at=timezone.now() - timedelta(hours=6))
+        membership.refresh_from_db()
+        membership.status = MembershipStatus.ACTIVE
+        membership.save()
+        self.assertIsNotNone(membership.reviewed_at)
+        refresh()
+        self.client.force_authenticate(self.rva)
+        reviews = self.client.get('/api/stats/membership-reviews/').data['months']
+        accepted = [row for row in reviews if row['status'] == MembershipStatus.ACTIVE]
+        self.assertEqual(len(accepted), 1)
+        self.assertEqual(accepted[0]['count'], 1)
+        self.assertAlmostEqual(accepted[0]['average_hours'], 6, places=1)
+
+    def rebuilt_events_per_month(self):
+        refresh(full=True)
+        return self.events_per_month()
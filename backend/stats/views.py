@@ -0,0 +1,146 @@
+from collections import defaultdict
+from datetime import date
+
+from django.db.models import Min, Sum
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from clubs.models import Club
+from shared.conditional import conditional
+from shared.enums import EventType, RequestStatus, StatsMetric
+from shared.permissions import IsRVA
+from .models import StatsBucket, StatsRefresh
+
+
+def parse_month_param(params, name):
+    """?from= / ?to= as 'YYYY-MM' -> first day of that month (None when absent)."""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        year, month = (int(part) for part in value.split('-'))
+        return date(year, month, 1)
+    except ValueError:
+        raise ValidationError({name: 'Expected YYYY-MM.'})
+
+
+def average_hours(key, count, seconds):
+    # Demandes en attente : pas encore de délai.
+    if not count or key == RequestStatus.PENDING:
+        return None
+    return round(seconds / count / 3600, 2)
+
+
+def stats_versions(request, **kwargs):
+    return ['stats']
+
+
+class StatsViewSet(viewsets.ViewSet):
+    """
+    Campus metrics for the student life officer, read from the summary
+    tables filled by `manage.py refresh_stats`: each response reads one row
+    per (month, key) bucket, whatever the size of the source tables.
+    ?from= and ?to= (YYYY-MM, inclusive) narrow the months returned.
+    """
+    permission_classes = [IsRVA]
+
+    def buckets(self, metric):
+        params = self.request.query_params
+        start, end = parse_month_param(params, 'from'), parse_month_param(params, 'to')
+        buckets = StatsBucket.objects.filter(metric=metric)
+        if start:
+            buckets = buckets.filter(month__gte=start)
+        if end:
+            buckets = buckets.filter(month__lte=end)
+        return buckets.order_by('month', 'club_id', 'key')
+
+    @conditional(stats_versions)
+    def list(self, request):
+        """Campus totals per metric and the time of the last refresh."""
+        totals = defaultdict(dict)
+        rows = (
+            StatsBucket.objects.values('metric', 'key')
+            .annotate(count=Sum('count'), seconds=Sum('total_seconds'))
+            .order_by('metric', 'key')
+        )
+        for row in rows:
+            totals[row['metric']][row['key'] or 'total'] = {
+                'count': row['count'],
+                'average_hours': average_hours(row['key'], row['count'], row['seconds']),
+            }
+        return Response({
+            'refreshed_at': StatsRefresh.objects.aggregate(at=Min('refreshed_at'))['at'],
+            'members': totals[StatsMetric.MEMBERS].get('total', {}).get('count', 0),
+            'events': {key: value['count'] for key, value in totals[StatsMetric.EVENTS].items()},
+            'membership_reviews': totals[StatsMetric.MEMBERSHIP_REVIEWS],
+            'club_requests': totals[StatsMetric.CLUB_REQUESTS],
+        })
+
+    @action(detail=False, methods=['get'], url_path='members')
+    @conditional(stats_versions)
+    def members(self, request):
+        """
+        Active members per club over time: for each month, the members who
+        joined that month and the club's running total. ?club= for one club.
+        """
+        buckets = StatsBucket.objects.filter(metric=StatsMetric.MEMBERS).order_by('club_id', 'month')
+        club = request.query_params.get('club')
+        if club:
+            if not club.isdigit():
+                raise ValidationError({'club': 'Expected a club id.'})
+            buckets = buckets.filter(club_id=int(club))
+        start = parse_month_param(request.query_params, 'from')
+        end = parse_month_param(request.query_params, 'to')
+
+        series = defaultdict(list)
+        running = defaultdict(int)
+        # Le cumul part du premier mois, même hors de la fenêtre demandée.
+        for club_id, month, count in buckets.values_list('club_id', 'month', 'count'):
+            running[club_id] += count
+            if (start is None or month >= start) and (end is None or month <= end):
+                series[club_id].append({'month': month.strftime('%Y-%m'), 'joined': count, 'members': running[club_id]})
+        names = dict(Club.objects.filter(pk__in=running).values_list('pk', 'name'))
+        return Response({'clubs': [
+            {'club': club_id, 'name': names.get(club_id), 'members': running[club_id], 'series': series[club_id]}
+            for club_id in running
+        ]})
+
+    @action(detail=False, methods=['get'], url_path='events')
+    @conditional(stats_versions)
+    def events(self, request):
+        """Events per month by EventType (cancelled events excluded)."""
+        months = defaultdict(lambda: dict.fromkeys(EventType.values, 0))
+        for month, key, count in self.buckets(StatsMetric.EVENTS).values_list('month', 'key', 'count'):
+            months[month][key] = count
+        return Response({'months': [
+            {'month': month.strftime('%Y-%m'), **counts, 'total': sum(counts.values())}
+            for month, counts in months.items()
+        ]})
+
+    @action(detail=False, methods=['get'], url_path='membership-reviews')
+    @conditional(stats_versions)
+    def membership_reviews(self, request):
+        """Memberships accepted or rejected per month, with the average wait in hours."""
+        return Response({'months': self.durations(StatsMetric.MEMBERSHIP_REVIEWS)})
+
+    @action(detail=False, methods=['get'], url_path='club-requests')
+    @conditional(stats_versions)
+    def club_requests(self, request):
+        """
+        Club creation requests per month and RequestStatus: reviewed ones in
+        their review month with the average turnaround, pending ones in their
+        submission month.
+        """
+        return Response({'months': self.durations(StatsMetric.CLUB_REQUESTS)})
+
+    def durations(self, metric):
+        rows = self.buckets(metric).values_list('month', 'key', 'count', 'total_seconds')
+        return [
+            {
+                'month': month.strftime('%Y-%m'), 'status': key, 'count': count,
+                'average_hours': average_hours(key, count, seconds),
+            }
+            for month, key, count, seconds in rows
+        ]
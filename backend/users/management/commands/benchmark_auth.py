@@ -0,0 +1,49 @@
+from django.db import connection
+from django.core.management.base import BaseCommand
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from shared.authentication import CachedTokenAuthentication, token_cache
+from shared.benchmark import benchmark_database, measure
+from shared.enums import Role
+from users.models import CustomUser
+from users.views import MeView
+
+
+class Command(BaseCommand):
+    help = 'Compare GET /auth/me/ throughput with TokenAuthentication and CachedTokenAuthentication.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            user = CustomUser.objects.create_user(username='bench', password='bench', role=Role.MEMBER)
+            token = Token.objects.create(user=user)
+            client = APIClient(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+            original = MeView.authentication_classes
+            try:
+                for label, auth_class in (
+                    ('TokenAuthentication', TokenAuthentication),
+                    ('CachedTokenAuthentication', CachedTokenAuthentication),
+                ):
+                    MeView.authentication_classes = [auth_class, SessionAuthentication]
+                    token_cache.clear()
+
+                    def call():
+                        response = client.get('/auth/me/')
+                        assert response.status_code == 200, response.status_code
+
+                    stats = measure(call, options['requests'])
+                    with CaptureQueriesContext(connection) as queries:
+                        call()
+                    self.stdout.write(
+                        f"{label:<28} {stats['rps']:>9.1f} req/s  "
+                        f"p50 {stats['p50_ms']:.3f} ms  p99 {stats['p99_ms']:.3f} ms  "
+                        f"{len(queries)} queries/request"
+                    )
+            finally:
+                MeView.authentication_classes = original
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_alter_customuser_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                fields=["role", "username"], name="user_role_username_idx"
+            ),
+        ),
+    ]
@@ -18,6 +18,9 @@ class CustomUser(AbstractUser):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['username']
+        indexes = [
+            models.Index(fields=['role', 'username'], name='user_role_username_idx'),
+        ]
 
     def __str__(self):
         return self.get_full_name() or self.username
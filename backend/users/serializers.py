@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import CustomUser
 from shared.enums import Role
+from shared.fieldsets import SparseFieldsetMixin
 
 class RegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -19,8 +20,9 @@ class RegistrationSerializer(serializers.ModelSerializer):
             role=self.context['role']
         )
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = CustomUser
         fields = ['id', 'username', 'first_name', 'last_name', 'email', 'role']
         read_only_fields = ['id', 'role']
+        expansion_versions = ('users',)
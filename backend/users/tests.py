@@ -1,3 +1,47 @@
-from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from shared.authentication import token_cache
+from shared.enums import Role
+from shared.testing import QueryBudgetTestCase
+from users.models import CustomUser
+
+
+class UserQueryBudgetTests(QueryBudgetTestCase):
+    def test_user_endpoints_stay_within_query_budget(self):
+        self.assertEndpointBudgets({
+            '/auth/me/': 0,
+            '/users/coordinators/': 1,
+            '/users/members/': 1,
+            '/users/rvas/': 1,
+        })
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = CustomUser.objects.create_user(username='alice', password='secret')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_second_request_skips_token_lookup(self):
+        self.assertEqual(self.client.get('/auth/me/').status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/auth/me/').status_code, 200)
+
+    def test_role_change_is_visible_immediately(self):
+        self.client.get('/auth/me/')
+        self.user.role = Role.COORDINATOR
+        self.user.save()
+        self.assertEqual(self.client.get('/auth/me/').data['role'], Role.COORDINATOR)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get('/auth/me/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/auth/me/').status_code, 401)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get('/auth/me/')
+        self.token.delete()
+        self.assertEqual(self.client.get('/auth/me/').status_code, 401)
@@ -4,6 +4,9 @@ from rest_framework.response import Response
 from django.contrib.auth import authenticate
 from .models import CustomUser
 from .serializers import RegistrationSerializer, UserSerializer
+from shared.async_views import AsyncAPIView
+from shared.compiled import CompiledListMixin
+from shared.fieldsets import SparseFieldsetViewMixin
 from shared.enums import Role
 
 class MemberRegisterView(generics.CreateAPIView):
@@ -39,22 +42,29 @@ class LoginView(APIView):
 class MeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     def get(self, request):
-        return Response(UserSerializer(request.user).data)
+        return Response(UserSerializer(request.user, context={'request': request}).data)
 
-class CoordinatorsListView(generics.ListAPIView):
+class AsyncMeView(AsyncAPIView):
+    async def get(self, request):
+        return self.render(UserSerializer(request.user, context=self.serializer_context(request)).data)
+
+class CoordinatorsListView(SparseFieldsetViewMixin, CompiledListMixin, generics.ListAPIView):
     serializer_class = UserSerializer
+    compiled_actions = ('list',)
     permission_classes = [permissions.IsAuthenticated]
     def get_queryset(self):
         return CustomUser.objects.filter(role=Role.COORDINATOR)
 
-class MembersListView(generics.ListAPIView):
+class MembersListView(SparseFieldsetViewMixin, CompiledListMixin, generics.ListAPIView):
     serializer_class = UserSerializer
+    compiled_actions = ('list',)
     permission_classes = [permissions.IsAuthenticated]
     def get_queryset(self):
         return CustomUser.objects.filter(role=Role.MEMBER)
 
-class RVAsListView(generics.ListAPIView):
+class RVAsListView(SparseFieldsetViewMixin, CompiledListMixin, generics.ListAPIView):
     serializer_class = UserSerializer
+    compiled_actions = ('list',)
     permission_classes = [permissions.IsAuthenticated]
     def get_queryset(self):
         return CustomUser.objects.filter(role=Role.STUDENT_LIFE_OFFICER)